@@ -1,49 +1,174 @@
 const path = require('path')
 const { spawn } = require('child_process')
 const os = require('os')
+const fs = require('fs')
 
-function runPythonScanner(projectPath) {
-    return new Promise((resolve, reject) => {
-        const platform = os.platform(); // 'win32', 'darwin', 'linux'
-        let scannerPath;
-
-        if (platform === 'win32') {
-            scannerPath = path.join(__dirname, '..', 'scan', 'dist', 'scan-win.exe');
-        } else if (platform === 'darwin') {
-            scannerPath = path.join(__dirname, '..', 'scan', 'dist', 'scan-mac');
-        } else if (platform === 'linux') {
-            scannerPath = path.join(__dirname, '..', 'scan', 'dist', 'scan-linux');
-        } else {
-            return reject(new Error(`Unsupported platform: ${platform}`));
-        }
+// Keep only the tail of the scanner's stderr for error messages
+const MAX_STDERR_LENGTH = 16 * 1024
+
+// Seconds a scan may spend parsing before it returns partial results, so a
+// pathological project cannot hang /__apitest/routes
+const SCAN_TIME_BUDGET = 30
+
+let scanner = null
+
+function getScannerPath() {
+    const platform = os.platform(); // 'win32', 'darwin', 'linux'
+    const names = { win32: 'scan-win', darwin: 'scan-mac', linux: 'scan-linux' }
+    const name = names[platform]
+    if (!name) {
+        throw new Error(`Unsupported platform: ${platform}`);
+    }
+
+    const executable = platform === 'win32' ? `${name}.exe` : name
+    const distDir = path.join(__dirname, '..', 'scan', 'dist')
+
+    // Prefer the onedir build that ships (dist/scan-linux-onedir/scan-linux):
+    // it starts without unpacking itself to a temp directory first, unlike
+    // the onefile binary (dist/scan-linux, built with SCAN_ONEFILE=1)
+    const onedir = path.join(distDir, `${name}-onedir`, executable)
+    if (fs.existsSync(onedir)) {
+        return onedir
+    }
+    return path.join(distDir, executable);
+}
+
+// Long-lived `scan --serve` process speaking newline-delimited JSON-RPC.
+// One child is reused across requests so each UI reload costs an incremental
+// scan instead of a process start, onefile unpack and full rescan.
+class ScannerProcess {
+    constructor(scannerPath) {
+        this.nextId = 1
+        this.pending = new Map()
+        this.buffer = ''
+        this.errorOutput = ''
+        this.closed = false
 
-        const pythonProcess = spawn(scannerPath, [projectPath])
-        let output = ''
-        let errorOutput = ''
-        pythonProcess.stdout.on('data', (data) => {
-            output += data.toString()
+        this.child = spawn(scannerPath, ['--serve', '--time-budget', String(SCAN_TIME_BUDGET)], { stdio: ['pipe', 'pipe', 'pipe'] })
+        this.child.stdout.setEncoding('utf8')
+        this.child.stderr.setEncoding('utf8')
+
+        this.child.stdout.on('data', (data) => this.onData(data))
+        this.child.stderr.on('data', (data) => {
+            this.errorOutput = (this.errorOutput + data).slice(-MAX_STDERR_LENGTH)
+        })
+        this.child.on('error', (err) => {
+            this.close(new Error(`Failed to start Python process ${err.message}`))
+        })
+        this.child.on('close', (code) => {
+            this.close(new Error(`python scanner exited with code ${code}\n${this.errorOutput}`))
         })
-        pythonProcess.stderr.on('data', (data) => {
-            errorOutput += data.toString()
+        this.child.stdin.on('error', () => {
+            // Reported through the 'close' handler
         })
-        pythonProcess.on('close', (code) => {
-            if (code !== 0) {
-                return reject(new Error(`python scanner existed with code ${code}\n${errorOutput}`))
+
+        this.updateRef()
+    }
+
+    onData(data) {
+        this.buffer += data
+        let newline = this.buffer.indexOf('\n')
+
+        // Each response is one line, so parse as soon as a line is complete
+        while (newline !== -1) {
+            const line = this.buffer.slice(0, newline)
+            this.buffer = this.buffer.slice(newline + 1)
+            if (line.trim()) {
+                this.onResponse(line)
             }
+            newline = this.buffer.indexOf('\n')
+        }
+    }
+
+    onResponse(line) {
+        let response
+        try {
+            response = JSON.parse(line)
+        } catch (error) {
+            this.close(new Error(`Failed to parse JSON from scanner:\n${line}\nError: ${error.message}`))
+            return
+        }
 
-            try {
-                const parsed = JSON.parse(output)
-                resolve(parsed)
-            } catch (error) {
-                reject(new Error(`Failed to parse JSON from scanner:\n${output}\nError: ${error.message}`))
+        const request = this.pending.get(response.id)
+        if (!request) {
+            return
+        }
+        this.pending.delete(response.id)
+        this.updateRef()
+
+        if (response.error) {
+            request.reject(new Error(`python scanner error: ${response.error.message}`))
+        } else {
+            request.resolve(response.result)
+        }
+    }
+
+    request(method, params = {}) {
+        return new Promise((resolve, reject) => {
+            if (this.closed) {
+                return reject(new Error('python scanner is not running'))
             }
+
+            const id = this.nextId++
+            this.pending.set(id, { resolve, reject })
+            this.updateRef()
+            this.child.stdin.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n')
         })
+    }
 
-        pythonProcess.on('error', (err) => {
-            reject(new Error(`Failed to start Python process ${err.message}`))
+    // Keep the event loop alive only while requests are in flight, so an idle
+    // scanner never stops the host process from exiting
+    updateRef() {
+        const streams = [this.child, this.child.stdin, this.child.stdout, this.child.stderr]
+        const method = this.pending.size > 0 ? 'ref' : 'unref'
+        streams.forEach((stream) => {
+            if (stream && typeof stream[method] === 'function') {
+                stream[method]()
+            }
         })
+    }
+
+    close(error) {
+        if (this.closed) {
+            return
+        }
+        this.closed = true
+        if (scanner === this) {
+            scanner = null
+        }
+
+        this.pending.forEach((request) => request.reject(error))
+        this.pending.clear()
+        this.child.stdin.end()
+    }
+}
+
+function getScanner() {
+    if (!scanner) {
+        scanner = new ScannerProcess(getScannerPath())
+    }
+    return scanner
+}
+
+function runPythonScanner(projectPath, options = {}) {
+    try {
+        const method = options.rescan ? 'rescan' : 'scan'
+        return getScanner().request(method, {
+            project_path: path.resolve(projectPath),
+            stats: Boolean(options.stats)
+        })
+    } catch (error) {
+        return Promise.reject(error)
+    }
+}
 
-    })
+function stopPythonScanner() {
+    if (scanner) {
+        const current = scanner
+        current.close(new Error('python scanner stopped'))
+        current.child.kill()
+    }
 }
 
-module.exports = runPythonScanner
\ No newline at end of file
+module.exports = runPythonScanner
+module.exports.stopPythonScanner = stopPythonScanner
@@ -0,0 +1,34 @@
+"""Static scanner for Express-style API routes.
+
+    from scan import iter_routes
+
+    for route in iter_routes("path/to/project"):
+        print(route.method, route.path, route.expected_inputs)
+"""
+import importlib
+
+# Kept in step with package.json
+__version__ = "1.2.4"
+
+__all__ = ["iter_routes", "scan_file", "scan_source", "Route", "ScanLimits", "RouteCatalog"]
+
+# Resolved on first access, so importing one submodule (or running the CLI)
+# does not pay for the whole scanner
+_EXPORTS = {
+    "iter_routes": ".api",
+    "scan_file": ".api",
+    "scan_source": ".api",
+    "Route": ".parser.route_extractor",
+    "ScanLimits": ".scanner",
+    "RouteCatalog": ".route_catalog",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
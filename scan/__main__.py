@@ -0,0 +1,12 @@
+"""python -m scan /path/to/project"""
+import sys
+
+from .startup import install_if_requested
+
+if __name__ == "__main__":
+    install_if_requested(sys.argv[1:])
+
+from .cli import main
+
+if __name__ == "__main__":
+    main()
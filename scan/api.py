@@ -0,0 +1,92 @@
+import os
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Union
+
+from .parser.route_extractor import (extract_routes, load_matcher_specs, register_matcher_specs,
+                                     Route)
+from .scanner import (iter_scan, parse_file, ScanLimits, DEFAULT_MAX_FILE_BYTES,
+                      DEFAULT_FILE_TIMEOUT, DEFAULT_INPUT_MEMO_SIZE)
+from .profiling import ScanProfiler
+from .walker import WalkOptions
+
+MatcherOption = Union[str, List[Dict[str, Any]], None]
+
+
+def _matcher_specs(matchers: MatcherOption) -> Optional[List[Dict[str, Any]]]:
+    """Matcher specs from a config file path or a list of entries"""
+    if isinstance(matchers, str):
+        return load_matcher_specs(matchers)
+    return matchers or None
+
+
+def iter_routes(root: Union[str, List[str]], **options) -> Iterator[Route]:
+    """Yield the routes of a project as each file is parsed, in walk order.
+
+    Nothing is accumulated, so memory stays flat however large the tree is,
+    and a caller that stops iterating early stops the scan (queued worker
+    batches are cancelled; the cache is only written after a full scan).
+    Pass a dict as stats to receive the scan statistics; they are complete
+    once the generator is exhausted. A list passed as middleware receives
+    the app.use()/router.use() chains found in the same pass over each
+    file (see scan_project). matchers is a matcher config file or a
+    list of entries (see load_matcher_specs); they are registered globally.
+    root may be a list of project roots, scanned as one (see scan_project).
+    input_memo_size bounds the memo of handler inputs (0 disables it).
+    The other options mirror the command line flags of the same name (see
+    iter_file_routes for the full list).
+    """
+    for _, file_routes in iter_file_routes(root, **options):
+        yield from file_routes
+
+
+def iter_file_routes(root: Union[str, List[str]], *, cache_path: Union[str, List[str]] = None,
+                     jobs: int = 1,
+                     matchers: MatcherOption = None,
+                     extensions: List[str] = None,
+                     excludes: List[str] = None, includes: List[str] = None,
+                     use_gitignore: bool = True, prefilter: bool = True,
+                     entry_points: List[str] = None,
+                     max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES,
+                     file_timeout: Optional[float] = DEFAULT_FILE_TIMEOUT,
+                     time_budget: Optional[float] = None, skip_minified: bool = True,
+                     profile: bool = False, profile_top: int = 10,
+                     stats: Dict[str, Any] = None, middleware: List[Dict[str, Any]] = None,
+                     input_memo_size: int = DEFAULT_INPUT_MEMO_SIZE,
+                     verbose: bool = False) -> Iterator[Tuple[str, List[Route]]]:
+    """Yield (relative path, routes) for each file as it is parsed, in walk order.
+
+    A file's routes are complete when it is yielded, so a writer can flush
+    per file. Takes the same options as iter_routes.
+    """
+    walk_options = WalkOptions(extensions, excludes, includes, use_gitignore)
+    limits = ScanLimits(max_file_bytes, file_timeout, time_budget, skip_minified)
+    profiler = ScanProfiler(profile_top) if profile else None
+
+    yield from iter_scan(root, stats if stats is not None else {}, verbose,
+                         cache_path, jobs, _matcher_specs(matchers),
+                         profiler=profiler, prefilter=prefilter,
+                         walk_options=walk_options, entry_points=entry_points,
+                         limits=limits, middleware=middleware,
+                         input_memo_size=input_memo_size)
+
+
+def scan_file(path: str, *, relative_to: str = None, matchers: MatcherOption = None,
+              limits: ScanLimits = None) -> List[Route]:
+    """Routes declared in one file.
+
+    Route.file is the path as given, or relative to relative_to. Read errors
+    raise OSError; files skipped by limits yield no routes.
+    """
+    specs = _matcher_specs(matchers)
+    if specs:
+        register_matcher_specs(specs)
+    relative_path = os.path.relpath(path, relative_to) if relative_to else path
+    return parse_file(path, relative_path, limits=limits).routes or []
+
+
+def scan_source(text: str, file_path: str = None, *,
+                matchers: MatcherOption = None) -> List[Route]:
+    """Routes declared in a string of JavaScript/TypeScript source"""
+    specs = _matcher_specs(matchers)
+    if specs:
+        register_matcher_specs(specs)
+    return extract_routes(text.replace("\r\n", "\n").replace("\r", "\n"), file_path)
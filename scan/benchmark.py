@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Reproducible scanner benchmarks on generated Express projects.
+
+Generates a synthetic project (seeded, so runs are comparable), then times
+scan_project in serial, parallel and cached modes plus extract_routes and
+extract_expected_inputs_for_route on their own. Every measurement runs in a
+fresh process so its peak RSS is not inflated by earlier ones. Scanner start-up
+is timed separately, by launching the command line scanner on a one-file
+project: cold (no bytecode or scan cache yet) and warm. Results are printed
+as JSON.
+
+  python benchmark.py --files 2000 --routes-per-file 8 --repeat 3
+  python benchmark.py --files 500 --modes serial,cache-warm --output bench.json
+  python benchmark.py --files 0 --startup-runs 20 --scanner dist/scan-linux-onedir/scan-linux
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+import contextlib
+import multiprocessing
+from typing import List, Dict, Any, Callable
+
+if not __package__:
+    # Run as a script: import the scanner as the `scan` package (see scan.py)
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    if sys.path and os.path.abspath(sys.path[0] or os.curdir) == BASE_DIR:
+        sys.path[0] = os.path.dirname(BASE_DIR)
+    else:
+        sys.path.insert(0, os.path.dirname(BASE_DIR))
+
+from scan.parser.route_extractor import extract_routes, extract_expected_inputs_for_route
+from scan.scanner import scan_project, collect_files, read_file_bytes, default_jobs
+from scan.cache import decode_source, input_memo_path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METHODS = ["get", "post", "put", "delete", "patch"]
+FIELDS = ["id", "name", "email", "title", "page", "limit", "sort", "token", "role", "status"]
+IGNORED_DIRS = ["node_modules", "dist", "build", "coverage", ".git"]
+SCAN_MODES = ["serial", "parallel", "cache-cold", "cache-warm"]
+
+# Target for a warm start of the command line scanner on a tiny project
+STARTUP_BUDGET_MS = 100
+
+
+def generate_handler(rng: random.Random, lines: int, nesting: int) -> List[str]:
+    """Build a handler body of roughly `lines` statements nested `nesting` blocks deep"""
+    body = []
+    indent = "  "
+    for depth in range(nesting):
+        body.append(f"{indent}if (req.query.{rng.choice(FIELDS)}) {{")
+        indent += "  "
+
+    for _ in range(max(lines, 1)):
+        kind = rng.randrange(5)
+        field = rng.choice(FIELDS)
+        if kind == 0:
+            body.append(f"{indent}const {field}Value = req.body.{field};")
+        elif kind == 1:
+            body.append(f"{indent}const {{ {field}, {rng.choice(FIELDS)} }} = req.query;")
+        elif kind == 2:
+            body.append(f"{indent}const auth = req.headers['x-{field}'];")
+        elif kind == 3:
+            body.append(f"{indent}const label = `item ${{req.params.{field}}} {{}}`; // ) }}")
+        else:
+            body.append(f"{indent}await service.{field}({{ value: \"{{\", next: '}}' }});")
+
+    for depth in range(nesting):
+        indent = indent[:-2]
+        body.append(f"{indent}}}")
+
+    body.append(f"{indent}res.json({{ ok: true }});")
+    return body
+
+
+def generate_route_file(rng: random.Random, index: int, routes: int,
+                        handler_lines: int, nesting: int) -> str:
+    """Build one Express router module"""
+    lines = ["const express = require('express');", "const router = express.Router();", ""]
+    for route in range(routes):
+        method = rng.choice(METHODS)
+        path = f"/r{index}/item{route}"
+        if rng.random() < 0.5:
+            path += f"/:{rng.choice(FIELDS)}"
+        lines.append(f"router.{method}('{path}', async (req, res) => {{")
+        lines.extend(generate_handler(rng, handler_lines, nesting))
+        lines.append("});")
+        lines.append("")
+    lines.append("module.exports = router;")
+    return "\n".join(lines) + "\n"
+
+
+def generate_project(root: str, files: int = 1000, routes_per_file: int = 5,
+                     handler_lines: int = 10, nesting: int = 2, dir_depth: int = 3,
+                     noise_files: int = 500, seed: int = 1) -> Dict[str, int]:
+    """Write a synthetic Express project under root and return what was generated.
+
+    Route files are spread over a directory tree dir_depth levels deep; noise
+    files with routes go into ignored directories (node_modules, dist, ...)
+    and must not be picked up by the scanner.
+    """
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+
+    for index in range(files):
+        parts = [f"d{(index // (7 ** level)) % 7}" for level in range(dir_depth)]
+        directory = os.path.join(root, "src", *parts)
+        os.makedirs(directory, exist_ok=True)
+        content = generate_route_file(rng, index, routes_per_file, handler_lines, nesting)
+        with open(os.path.join(directory, f"routes{index}.js"), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    for index in range(noise_files):
+        ignored = IGNORED_DIRS[index % len(IGNORED_DIRS)]
+        directory = os.path.join(root, ignored, f"pkg{index % 50}", "lib")
+        os.makedirs(directory, exist_ok=True)
+        content = generate_route_file(rng, index, 2, 3, 1)
+        with open(os.path.join(directory, f"index{index}.js"), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    return {"route_files": files, "routes": files * routes_per_file, "noise_files": noise_files}
+
+
+def peak_rss_kb(children: bool = False) -> Any:
+    """Peak resident set size in KiB of this process, or of its largest child (None if unknown).
+
+    The two are reported apart: RUSAGE_CHILDREN gives the largest single
+    child (e.g. one pool worker), so adding it to our own peak overstates use.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _isolated_target(queue, func, args):
+    """Process entry point for run_isolated"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        result = func(*args)
+    result["peak_rss_kb"] = peak_rss_kb()
+    result["children_peak_rss_kb"] = peak_rss_kb(children=True)
+    queue.put(result)
+
+
+def run_isolated(func: Callable[..., Dict[str, Any]], *args) -> Dict[str, Any]:
+    """Run a measurement in a fresh process and return its result dict"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_isolated_target, args=(queue, func, args))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def rates(seconds: float, files: int, routes: int) -> Dict[str, Any]:
+    """Throughput figures for one measurement"""
+    return {
+        "seconds": round(seconds, 6),
+        "files_per_sec": round(files / seconds, 1) if seconds > 0 else None,
+        "routes_per_sec": round(routes / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def measure_scan(project: str, mode: str, jobs: int, cache_path: str) -> Dict[str, Any]:
+    """Time scan_project in one mode"""
+    for path in (cache_path, input_memo_path(cache_path)):
+        if os.path.exists(path):
+            os.unlink(path)
+    if mode == "cache-warm":
+        # Populate the cache first; only the warm run is timed
+        scan_project(project, cache_path=cache_path, jobs=jobs)
+
+    options = {
+        "serial": {"jobs": 1},
+        "parallel": {"jobs": jobs},
+        "cache-cold": {"jobs": jobs, "cache_path": cache_path},
+        "cache-warm": {"jobs": jobs, "cache_path": cache_path},
+    }[mode]
+
+    start = time.perf_counter()
+    routes, stats = scan_project(project, **options)
+    elapsed = time.perf_counter() - start
+
+    result = rates(elapsed, stats["scanned_files"], len(routes))
+    result.update({"mode": mode, "files": stats["scanned_files"], "routes": len(routes),
+                   "errors": len(stats["errors"])})
+    return result
+
+
+def load_sources(project: str) -> List[Any]:
+    """Read every scannable file of a project into memory"""
+    return [(relative_path, decode_source(read_file_bytes(file_path)))
+            for file_path, relative_path in collect_files(project)]
+
+
+def measure_extract_routes(project: str) -> Dict[str, Any]:
+    """Time extract_routes on pre-read sources (no disk I/O)"""
+    sources = load_sources(project)
+    total_bytes = sum(len(code) for _, code in sources)
+
+    start = time.perf_counter()
+    routes = 0
+    for relative_path, code in sources:
+        routes += len(extract_routes(code, relative_path))
+    elapsed = time.perf_counter() - start
+
+    result = rates(elapsed, len(sources), routes)
+    result.update({"files": len(sources), "routes": routes,
+                   "mb_per_sec": round(total_bytes / elapsed / 1e6, 2) if elapsed > 0 else None})
+    return result
+
+
+def measure_expected_inputs(project: str) -> Dict[str, Any]:
+    """Time standalone extract_expected_inputs_for_route calls (including handler lookup)"""
+    sources = load_sources(project)
+    routes_by_file = [(code, extract_routes(code, relative_path)) for relative_path, code in sources]
+
+    start = time.perf_counter()
+    calls = 0
+    for code, routes in routes_by_file:
+        for route in routes:
+            extract_expected_inputs_for_route(code, route.method, route.path)
+            calls += 1
+    elapsed = time.perf_counter() - start
+
+    result = rates(elapsed, len(sources), calls)
+    result.update({"files": len(sources), "routes": calls})
+    return result
+
+
+def run_scanner_ms(command: List[str], env: Dict[str, str]) -> float:
+    """Wall time of one scanner invocation in milliseconds"""
+    start = time.perf_counter()
+    subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_startup(scanner: List[str], work_dir: str, runs: int) -> Dict[str, Any]:
+    """Time the command line scanner end to end on a one-file project.
+
+    The cold run has neither compiled bytecode (a fresh PYTHONPYCACHEPREFIX;
+    frozen builds ignore it) nor a scan cache; the warm runs reuse both.
+    """
+    project = os.path.join(work_dir, "startup-project")
+    generate_project(project, files=1, routes_per_file=2, noise_files=0)
+    cache_path = os.path.join(work_dir, "startup-cache.json")
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=tempfile.mkdtemp(dir=work_dir, prefix="pycache-"))
+    # Warm runs must find the bytecode the cold run wrote
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = scanner + [project, "--cache-file", cache_path]
+
+    cold = run_scanner_ms(command, env)
+    warm = [run_scanner_ms(command, env) for _ in range(max(runs - 1, 1))]
+    warm_ms = statistics.median(warm)
+    return {
+        "command": " ".join(scanner),
+        "cold_ms": round(cold, 1),
+        "warm_ms": round(warm_ms, 1),
+        "warm_min_ms": round(min(warm), 1),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "within_budget": warm_ms <= STARTUP_BUDGET_MS,
+    }
+
+
+def best_of(repeat: int, func: Callable[..., Dict[str, Any]], *args) -> Dict[str, Any]:
+    """Run a measurement `repeat` times and keep the fastest run"""
+    runs = [run_isolated(func, *args) for _ in range(max(repeat, 1))]
+    best = min(runs, key=lambda run: run["seconds"])
+    best["runs_seconds"] = [run["seconds"] for run in runs]
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the route scanner on a synthetic project")
+    parser.add_argument('--files', type=int, default=1000, help='Route files to generate (default: 1000)')
+    parser.add_argument('--routes-per-file', type=int, default=5, help='Routes per file (default: 5)')
+    parser.add_argument('--handler-lines', type=int, default=10, help='Statements per handler (default: 10)')
+    parser.add_argument('--nesting', type=int, default=2, help='Block nesting depth inside handlers (default: 2)')
+    parser.add_argument('--dir-depth', type=int, default=3, help='Directory nesting depth (default: 3)')
+    parser.add_argument('--noise-files', type=int, default=500,
+                        help='Files generated inside ignored directories (default: 500)')
+    parser.add_argument('--seed', type=int, default=1, help='Generator seed (default: 1)')
+    parser.add_argument('--modes', default=",".join(SCAN_MODES),
+                        help=f'scan_project modes to time (default: {",".join(SCAN_MODES)})')
+    parser.add_argument('-j', '--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for parallel modes (default: CPU count)')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per measurement, best is kept (default: 1)')
+    parser.add_argument('--startup-runs', type=int, default=10,
+                        help='Scanner launches for the start-up benchmark, 0 to skip (default: 10)')
+    parser.add_argument('--scanner',
+                        help='Scanner command to time for start-up, e.g. a built executable '
+                             '(default: this Python running scan.py)')
+    parser.add_argument('--project-dir', help='Generate into this directory instead of a temp dir')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated temp project')
+    parser.add_argument('-o', '--output', help='Write the JSON report to a file (default: stdout)')
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in SCAN_MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    work_dir = tempfile.mkdtemp(prefix="apidev-bench-")
+    project = args.project_dir or os.path.join(work_dir, "project")
+    cache_path = os.path.join(work_dir, "scan-cache.json")
+
+    try:
+        generated = generate_project(project, args.files, args.routes_per_file, args.handler_lines,
+                                     args.nesting, args.dir_depth, args.noise_files, args.seed)
+
+        scan_results = {}
+        for mode in modes:
+            scan_results[mode] = best_of(args.repeat, measure_scan, project, mode, args.jobs, cache_path)
+
+        report = {
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "keep")},
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+            },
+            "generated": generated,
+            "scan_project": scan_results,
+            "extract_routes": best_of(args.repeat, measure_extract_routes, project),
+            "extract_expected_inputs_for_route": best_of(args.repeat, measure_expected_inputs, project),
+        }
+        if args.startup_runs > 0:
+            scanner = (args.scanner.split() if args.scanner else
+                       [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scan.py")])
+            report["startup"] = measure_startup(scanner, work_dir, args.startup_runs)
+    finally:
+        # A --project-dir belongs to the caller and is never removed
+        if args.keep:
+            print(f"Generated project kept at: {project}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"Results written to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+import gc
+import os
+import json
+import hashlib
+import tempfile
+import contextlib
+from typing import List, Dict, Any, Optional, Tuple
+
+from .parser import route_extractor
+from .parser.route_extractor import Route
+
+CACHE_FORMAT = 3
+
+
+def extractor_stamp() -> str:
+    """Build a version stamp that changes whenever route_extractor changes"""
+    digest = hashlib.sha1(f"{CACHE_FORMAT}:{route_extractor.EXTRACTOR_VERSION}".encode("utf-8"))
+    # Matchers registered from config change the output as much as code edits do
+    digest.update(route_extractor.matchers_signature().encode("utf-8"))
+    try:
+        # Hash the extractor source too, so edited patterns invalidate old entries
+        # even when nobody remembered to bump EXTRACTOR_VERSION.
+        with open(route_extractor.__file__, "rb") as f:
+            digest.update(f.read())
+    except (OSError, TypeError):
+        pass
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """Suspend the cyclic GC while bulk-allocating (it would rescan every new object)"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def default_cache_path(project_path: str) -> str:
+    """Get the default cache file location for a project (outside the project tree)"""
+    project_key = hashlib.sha1(os.path.abspath(project_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), "apidev-cache", f"{project_key}.json")
+
+
+def content_hash(raw: bytes) -> str:
+    """Hash file contents for change detection"""
+    return hashlib.sha1(raw).hexdigest()
+
+
+def decode_source(raw: bytes) -> str:
+    """Decode file bytes the same way text-mode open() with errors='ignore' would"""
+    text = raw.decode("utf-8", errors="ignore")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class ScanCache:
+    """On-disk cache of extract_routes output per file.
+
+    Entries are keyed by relative path and validated by mtime/size; when those
+    differ but the size matches, the content hash decides whether the file
+    really changed. Routes are stored in their compact list form (see
+    Route.to_list and encode) next to the file's middleware chains, if it
+    has any; subclasses caching other per-file data override encode/decode.
+    """
+
+    def __init__(self, cache_path: Optional[str]):
+        self.cache_path = cache_path
+        self.stamp = extractor_stamp()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+
+    def load(self) -> "ScanCache":
+        """Load cache entries from disk, dropping them if the stamp is stale"""
+        if not self.cache_path:
+            return self
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f, gc_paused():
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+
+        if isinstance(data, dict) and data.get("stamp") == self.stamp:
+            self.entries = data.get("files", {})
+        else:
+            self.dirty = True
+        return self
+
+    def encode(self, routes: List[Route]) -> Any:
+        """JSON-ready form of a file's cached payload.
+
+        Routes are kept as one JSON string per file: a loaded cache then holds
+        a single str per entry instead of thousands of small lists and strings,
+        and only the entries that are hit get decoded.
+        """
+        return json.dumps([route.to_list() for route in routes], ensure_ascii=False,
+                          separators=(",", ":"))
+
+    def decode(self, relative_path: str, payload: Any) -> List[Route]:
+        """Inverse of encode"""
+        return [Route.from_list(relative_path, route) for route in json.loads(payload)]
+
+    def lookup(self, relative_path: str, st: os.stat_result,
+               read_bytes=None) -> Tuple[Optional[List[Route]], Optional[bytes]]:
+        """Return (cached routes, raw bytes read while validating) for a file.
+
+        Cached routes are None on a miss. read_bytes is only called when the
+        mtime changed but the size did not, so the content hash can be compared.
+        """
+        self.seen.add(relative_path)
+        entry = self.entries.get(relative_path)
+        if entry is None or entry.get("size") != st.st_size:
+            self.misses += 1
+            return None, None
+
+        if entry.get("mtime_ns") == st.st_mtime_ns:
+            self.hits += 1
+            return self.decode(relative_path, entry["routes"]), None
+
+        if read_bytes is None:
+            self.misses += 1
+            return None, None
+
+        raw = read_bytes()
+        if content_hash(raw) == entry.get("sha1"):
+            # Touched but unchanged: refresh the mtime so the next run is a fast hit
+            entry["mtime_ns"] = st.st_mtime_ns
+            self.dirty = True
+            self.hits += 1
+            return self.decode(relative_path, entry["routes"]), raw
+
+        self.misses += 1
+        return None, raw
+
+    def middleware(self, relative_path: str) -> List[Dict[str, Any]]:
+        """Middleware chains stored for a file (call after a lookup hit)"""
+        entry = self.entries.get(relative_path)
+        return entry.get("middleware", []) if entry is not None else []
+
+    def store(self, relative_path: str, st: os.stat_result, digest: str,
+              routes: List[Route], middleware: List[Dict[str, Any]] = None):
+        """Record the routes (and middleware chains) extracted from a file"""
+        self.seen.add(relative_path)
+        entry = self.entries[relative_path] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha1": digest,
+            "routes": self.encode(routes),
+        }
+        if middleware:
+            entry["middleware"] = middleware
+        self.dirty = True
+
+    def begin_scan(self):
+        """Reset per-scan bookkeeping so one cache can serve repeated scans"""
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def discard(self, relative_path: str):
+        """Drop a file's entry (deleted, or no longer scanned)"""
+        if self.entries.pop(relative_path, None) is not None:
+            self.dirty = True
+
+    def prune(self):
+        """Drop entries for files that were not seen during the last scan"""
+        stale = [path for path in self.entries if path not in self.seen]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self.dirty = True
+
+    def save(self, prune: bool = True):
+        """Write the cache back to disk, pruning files that no longer exist.
+
+        A cache without a path lives in memory only and is just pruned. A
+        caller that only visited some files (an incremental scan) passes
+        prune=False.
+        """
+        if prune:
+            self.prune()
+
+        if not self.dirty or not self.cache_path:
+            return
+
+        write_json_atomic(self.cache_path, {"stamp": self.stamp, "files": self.entries})
+        self.dirty = False
+
+
+def write_json_atomic(path: str, data: Any):
+    """Write JSON through a temporary file, so readers never see a partial file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=".scan-cache-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def input_memo_path(cache_path: str) -> str:
+    """Input memo stored next to a scan cache"""
+    return os.path.splitext(cache_path)[0] + ".inputs.json"
+
+
+def load_input_memo(memo: route_extractor.InputMemo, path: str) -> int:
+    """Fill a memo with the entries saved at path, oldest first; returns how many were read.
+
+    Entries written by another extractor version are ignored.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f, gc_paused():
+            data = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if not isinstance(data, dict) or data.get("stamp") != extractor_stamp():
+        return 0
+
+    entries = data.get("entries", [])
+    for key, inputs in entries:
+        memo.put(key, route_extractor.Route.pack_inputs(dict(inputs)))
+    return len(entries)
+
+
+def save_input_memo(memo: route_extractor.InputMemo, path: str):
+    """Write a memo's entries to path in LRU order, so loading keeps the recency"""
+    entries = [[key, [[source, list(names)] for source, names in inputs]]
+               for key, inputs in memo.entries.items()]
+    write_json_atomic(path, {"stamp": extractor_stamp(), "entries": entries})
@@ -0,0 +1,587 @@
+import os
+import sys
+import json
+import argparse
+from typing import List, Dict, Any, Iterable, Tuple
+
+from . import startup, __version__
+from .api import iter_routes, iter_file_routes
+from .parser.route_extractor import (load_matcher_specs, register_matcher_specs, get_route_statistics,
+                                     json_default, Route)
+from .cache import default_cache_path
+from .scanner import (default_jobs, print_scan_summary, ScanLimits,
+                      DEFAULT_MAX_FILE_BYTES, DEFAULT_FILE_TIMEOUT, DEFAULT_INPUT_MEMO_SIZE)
+from .walker import WalkOptions, DEFAULT_EXTENSIONS
+
+
+def get_resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller"""
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+def format_inputs(expected_inputs: Dict[str, List[str]]) -> str:
+    """Render expected inputs compactly, e.g. 'body: name, email; params: id'"""
+    return "; ".join(f"{source.split('.')[-1]}: {', '.join(names)}"
+                     for source, names in expected_inputs.items())
+
+
+def format_scan_stats(stats: Dict[str, Any]) -> List[str]:
+    """Render scan statistics as text lines"""
+    lines = []
+    if "changed_files" in stats:
+        lines.append(f"Changed files: {stats['changed_files']} "
+                     f"(baseline: {stats['baseline_files']} file(s))")
+    lines += [f"Files scanned: {stats.get('scanned_files', 0)}",
+             f"Skipped by prefilter: {stats.get('prefilter_skipped', 0)}",
+             f"Duplicates reused: {stats.get('deduplicated_files', 0)}",
+             f"Errors: {len(stats.get('errors', []))}"]
+    if "cache_hits" in stats:
+        lines.append(f"Cache hits: {stats['cache_hits']}, misses: {stats['cache_misses']}")
+    if "input_memo" in stats:
+        memo = stats["input_memo"]
+        lines.append(f"Input memo hits: {memo['hits']}, misses: {memo['misses']}, "
+                     f"evictions: {memo['evictions']}")
+    lines.extend(f"  {error}" for error in stats.get("errors", []))
+    if stats.get("skipped_files"):
+        lines.append(f"Skipped by limits: {len(stats['skipped_files'])}")
+        lines.extend(f"  {entry['file']}: {entry['reason']}" for entry in stats["skipped_files"])
+    if stats.get("timed_out_files"):
+        lines.append(f"Timed out (partial routes): {len(stats['timed_out_files'])}")
+        lines.extend(f"  {path}" for path in stats["timed_out_files"])
+    return lines
+
+
+def format_middleware(middleware: List[Dict[str, Any]]) -> List[str]:
+    """Middleware chains as text lines, one per app.use()/router.use() call and path"""
+    lines = [f"Middleware chains: {len(middleware)}"]
+    lines.extend(f"  {entry['file']}: {entry['object']}.use {entry['path']} -> "
+                 f"{' -> '.join(entry['chain'])}" for entry in middleware)
+    return lines
+
+
+def format_table(routes: List[Route], include_stats: bool = False,
+                 stats: Dict[str, Any] = None,
+                 middleware: List[Dict[str, Any]] = None) -> str:
+    """Render routes as an aligned text table"""
+    header = ("METHOD", "PATH", "FILE", "INPUTS")
+    rows = [(route.method, route.path, route.file or "", format_inputs(route.expected_inputs))
+            for route in routes]
+    if any(route.package is not None for route in routes):
+        # Multi-root scan: say which package each route belongs to
+        header = ("PACKAGE",) + header
+        rows = [(route.package or "",) + row for route, row in zip(routes, rows)]
+
+    fixed = len(header) - 1
+    widths = [max([len(header[i])] + [len(row[i]) for row in rows]) for i in range(fixed)]
+    lines = []
+    for row in [header] + rows:
+        cells = [row[i].ljust(widths[i]) for i in range(fixed)] + [row[fixed]]
+        lines.append("  ".join(cells).rstrip())
+
+    lines.append("")
+    lines.append(f"{len(routes)} route(s)")
+    if middleware is not None:
+        lines.extend(format_middleware(middleware))
+    if include_stats and stats:
+        lines.extend(format_scan_stats(stats))
+    return "\n".join(lines)
+
+
+def format_summary(routes: List[Route], include_stats: bool = False,
+                   stats: Dict[str, Any] = None,
+                   middleware: List[Dict[str, Any]] = None) -> str:
+    """Render route statistics (see get_route_statistics) as text"""
+    # Aggregated during the scan; only recounted for callers without scan stats
+    route_stats = (stats or {}).get("route_statistics") or get_route_statistics(routes)
+    lines = [f"Routes: {route_stats.get('total_routes', 0)} "
+             f"in {route_stats.get('files_with_routes', 0)} file(s)"]
+
+    for title, key in (("Methods", "methods"), ("Frameworks", "frameworks")):
+        counts = route_stats.get(key, {})
+        if counts:
+            ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            lines.append(f"{title}: " + ", ".join(f"{name} {count}" for name, count in ordered))
+
+    lines.append(f"Routes with params: {route_stats.get('routes_with_params', 0)}")
+    lines.append(f"Routes with body inputs: {route_stats.get('routes_with_body_inputs', 0)}")
+    lines.append(f"Routes with query inputs: {route_stats.get('routes_with_query_inputs', 0)}")
+    if middleware is not None:
+        lines.append(f"Middleware chains: {len(middleware)}")
+
+    if include_stats and stats:
+        lines.append("")
+        lines.extend(format_scan_stats(stats))
+    return "\n".join(lines)
+
+
+_encode_string = json.encoder.encode_basestring
+
+
+def render_route_json(route: Route, indent: str, level: int) -> str:
+    """A route exactly as json.dumps(route.to_dict(), indent=...) renders it `level` deep.
+
+    json.dumps falls back to its pure-Python encoder when indenting; building
+    the text here with the C string encoder is several times faster.
+    """
+    pad = "\n" + indent * (level + 1)
+    parts = [
+        "{", pad, '"method": ', _encode_string(route.method),
+        ",", pad, '"path": ', _encode_string(route.path),
+        ",", pad, '"file": ', "null" if route.file is None else _encode_string(route.file),
+    ]
+    if route.package is not None:
+        parts += [",", pad, '"package": ', _encode_string(route.package)]
+    parts += [
+        ",", pad, '"framework": ', _encode_string(route.framework),
+        ",", pad, '"expected_inputs": ',
+    ]
+    if route.inputs:
+        source_pad = pad + indent
+        name_pad = source_pad + indent
+        parts.append("{")
+        for position, (source, names) in enumerate(route.inputs):
+            parts.append(("," if position else "") + source_pad + _encode_string(source) + ": [")
+            parts.append(",".join(name_pad + _encode_string(name) for name in names))
+            parts.append(source_pad + "]")
+        parts.append(pad + "}")
+    else:
+        parts.append("{}")
+    parts.append("\n" + indent * level + "}")
+    return "".join(parts)
+
+
+def format_json(routes: List[Route], include_stats: bool = False,
+                stats: Dict[str, Any] = None,
+                middleware: List[Dict[str, Any]] = None) -> str:
+    """Render {"routes": [...], "middleware": [...], "stats": {...}} the way json.dumps(indent=2) would"""
+    if routes:
+        separator = ",\n    "
+        rendered = "[\n    " + separator.join(render_route_json(route, "  ", 2)
+                                               for route in routes) + "\n  ]"
+    else:
+        rendered = "[]"
+
+    output = '{\n  "routes": ' + rendered
+    if middleware is not None:
+        output += ',\n  "middleware": ' + json.dumps(middleware, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+    if include_stats and stats:
+        # JSON text never contains raw newlines inside strings, so re-indenting is safe
+        output += ',\n  "stats": ' + json.dumps(stats, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+    return output + "\n}"
+
+
+def output_results(routes: List[Route], output_format: str = "json", 
+                  output_file: str = None, include_stats: bool = False, 
+                  stats: Dict[str, Any] = None,
+                  middleware: List[Dict[str, Any]] = None):
+        """Output results in specified format"""
+        if output_format == "json":
+            output = format_json(routes, include_stats, stats, middleware)
+        elif output_format == "table":
+            output = format_table(routes, include_stats, stats, middleware)
+        elif output_format == "summary":
+            output = format_summary(routes, include_stats, stats, middleware)
+        else:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        if output_file:
+                try:
+                    with open(output_file, 'w', encoding='utf-8') as f:
+                        f.write(output)
+                    print(f"Results written to: {output_file}", file=sys.stderr)
+                except Exception as e:
+                    print(f"Error writing to file {output_file}: {e}", file=sys.stderr)
+                    print(output)
+        else:
+                print(output)
+
+
+def stream_ndjson(files: Iterable[Tuple[str, List[Route]]],
+                  output_file: str = None, include_stats: bool = False,
+                  stats: Dict[str, Any] = None,
+                  middleware: List[Dict[str, Any]] = None):
+    """Write one route per line as files are scanned, flushing after each file.
+
+    files yields (relative path, routes) pairs, as iter_file_routes does.
+
+    With a middleware list (filled by the scan) one {"middleware": {...}}
+    record per chain follows the routes; with include_stats a final
+    {"stats": {...}} record is appended once the scan has finished.
+    """
+    out = sys.stdout
+    if output_file:
+        try:
+            out = open(output_file, 'w', encoding='utf-8')
+        except OSError as e:
+            print(f"Error writing to file {output_file}: {e}", file=sys.stderr)
+
+    try:
+        for _, file_routes in files:
+            for route in file_routes:
+                out.write(json.dumps(route.to_dict(), ensure_ascii=False, separators=(",", ":")))
+                out.write("\n")
+            out.flush()
+
+        for entry in middleware or ():
+            out.write(json.dumps({"middleware": entry}, ensure_ascii=False, separators=(",", ":")))
+            out.write("\n")
+        if include_stats and stats is not None:
+            out.write(json.dumps({"stats": stats}, ensure_ascii=False, separators=(",", ":")))
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+            print(f"Results written to: {output_file}", file=sys.stderr)
+
+
+def write_sqlite(routes: Iterable[Route], output_file: str,
+                 stats: Dict[str, Any] = None,
+                 middleware: List[Dict[str, Any]] = None) -> int:
+    """Sync a route catalog database with the scan, consuming routes as they are produced.
+
+    The scan stats are always stored (see RouteCatalog). Returns the number
+    of routes.
+    """
+    # sqlite3 is only imported for this format
+    from .route_catalog import RouteCatalog
+
+    with RouteCatalog(output_file) as catalog:
+        count = catalog.write(routes, stats, middleware)
+    print(f"Results written to: {output_file}", file=sys.stderr)
+    return count
+
+
+def catalog_main(argv: List[str]):
+    """`scan.py catalog`: page through a route catalog written with --format sqlite"""
+    parser = argparse.ArgumentParser(
+        prog="scan.py catalog",
+        description="List routes from a catalog written with --format sqlite, filtered and paged",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scan.py catalog routes.db --limit 50
+  python scan.py catalog routes.db --method POST --path-prefix /api --offset 100
+  python scan.py catalog routes.db --input email --stats
+        """
+    )
+    parser.add_argument('catalog', help='Route catalog database')
+    parser.add_argument('--method', help='Only routes declared for this method')
+    parser.add_argument('--path-prefix', help='Only routes whose path starts with this')
+    parser.add_argument('--file', help='Only routes declared in this project-relative file')
+    parser.add_argument('--package', help='Only routes of this package (multi-root scans)')
+    parser.add_argument('--input', metavar='NAME', help='Only routes expecting an input of this name')
+    parser.add_argument('--limit', type=int, default=100,
+                       help='Routes per page, 0 for all (default: 100)')
+    parser.add_argument('--offset', type=int, default=0, help='Routes to skip (default: 0)')
+    parser.add_argument('--stats', action='store_true', help='Include the stored scan statistics')
+    parser.add_argument('--middleware', action='store_true', help='Include the stored middleware chains')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    from .route_catalog import RouteCatalog
+
+    filters = {"method": args.method, "path_prefix": args.path_prefix, "file": args.file,
+               "input_name": args.input, "package": args.package}
+    try:
+        if not os.path.isfile(args.catalog):
+            raise FileNotFoundError(f"Catalog does not exist: {args.catalog}")
+        with RouteCatalog(args.catalog, readonly=True) as catalog:
+            result: Dict[str, Any] = {
+                "routes": catalog.routes(limit=args.limit or None, offset=args.offset, **filters),
+                "total": catalog.count(**filters),
+                "offset": args.offset,
+                "limit": args.limit,
+            }
+            if args.middleware:
+                result["middleware"] = catalog.middleware()
+            if args.stats:
+                result["stats"] = catalog.stats()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    output = json.dumps(result, indent=2, ensure_ascii=False, default=json_default)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Results written to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+def query_main(argv: List[str]):
+    """`scan.py query`: resolve URLs and report route conflicts from an index"""
+    parser = argparse.ArgumentParser(
+        prog="scan.py query",
+        description="Match requests against scanned routes and report conflicting routes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scan.py query routes.json "GET /users/42"
+  python scan.py query routes.ndjson /users/42 "POST /login" --all
+  python scan.py query /path/to/project --conflicts
+        """
+    )
+    parser.add_argument('source',
+                       help='Scan output (JSON, NDJSON or SQLite catalog) or a project directory to scan')
+    parser.add_argument('requests', nargs='*', metavar='REQUEST',
+                       help='Request to resolve, e.g. "GET /users/42" or "/users/42" (any method)')
+    parser.add_argument('--all', action='store_true',
+                       help='List every matching route, most specific first, not just the best one')
+    parser.add_argument('--conflicts', action='store_true',
+                       help='Report duplicate and overlapping routes')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    args = parser.parse_args(argv)
+    if not args.requests and not args.conflicts:
+        parser.error('give at least one REQUEST or --conflicts')
+
+    from .route_index import RouteIndex, load_routes, parse_request
+
+    try:
+        if os.path.isdir(args.source):
+            routes = list(iter_routes(args.source, cache_path=default_cache_path(args.source),
+                                      jobs=default_jobs()))
+        else:
+            routes = load_routes(args.source)
+        index = RouteIndex(routes)
+
+        result: Dict[str, Any] = {}
+        if args.requests:
+            result["matches"] = []
+            for request in args.requests:
+                method, url = parse_request(request)
+                matches = index.match(method, url)
+                entry = {"request": request}
+                if args.all:
+                    entry["matches"] = matches
+                else:
+                    entry.update(matches[0] if matches else {"route": None, "params": {}})
+                result["matches"].append(entry)
+        if args.conflicts:
+            result["conflicts"] = index.conflicts()
+    except (FileNotFoundError, NotADirectoryError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    output = json.dumps(result, indent=2, ensure_ascii=False, default=json_default)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Results written to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'query':
+        query_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'catalog':
+        catalog_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Scan JavaScript/TypeScript projects for API routes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scan.py /path/to/project
+  python scan.py /path/to/project --format table
+  python scan.py /path/to/project --output routes.json --stats
+  python scan.py /path/to/project --verbose --format summary
+  python scan.py /path/to/project --format ndjson --stats
+  python scan.py /path/to/project --middleware --format table
+  python scan.py --serve [/path/to/project]
+  python scan.py /path/to/project --watch --interval 0.5
+  python scan.py /path/to/project --entry app.js
+  python scan.py services/users services/orders --format table
+  python scan.py /path/to/project --format sqlite --output routes.db
+  python scan.py query routes.json "GET /users/42" --conflicts
+  python scan.py catalog routes.db --method GET --path-prefix /api --limit 50
+        """
+    )
+    
+    parser.add_argument('project_path', nargs='*',
+                       help='Path to the project directory (optional with --serve); give several '
+                            'to scan a monorepo\'s packages together, each route tagged with its package')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    parser.add_argument('-v', '--verbose', action='store_true', 
+                       help='Enable verbose output')
+    parser.add_argument('-f', '--format', choices=['json', 'ndjson', 'table', 'summary', 'sqlite'], 
+                       default='json',
+                       help='Output format (default: json; ndjson streams one route per line; sqlite '
+                            'writes an indexed route catalog to --output, rewriting only the files '
+                            'whose routes changed)')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('-s', '--stats', action='store_true', 
+                       help='Include scan statistics in output')
+    parser.add_argument('--cache-file',
+                       help='Scan cache location (default: per-project file in the temp dir)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-parse every file and do not read or write the scan cache')
+    parser.add_argument('-m', '--matchers',
+                       help='JSON file with extra route matchers (see matchers.example.json)')
+    parser.add_argument('-j', '--jobs', type=int, default=default_jobs(),
+                       help='Worker processes for parsing files (default: CPU count)')
+    
+    parser.add_argument('--ext', default=",".join(DEFAULT_EXTENSIONS),
+                       help='Comma-separated file extensions to scan, e.g. .js,.mjs,.cjs,.ts (default: .js)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                       help='Skip paths matching a gitignore-style glob (repeatable)')
+    parser.add_argument('--include', action='append', default=[], metavar='GLOB',
+                       help='Only scan files matching a gitignore-style glob (repeatable)')
+    parser.add_argument('--no-gitignore', action='store_true',
+                       help='Do not honour .gitignore files in the project')
+    parser.add_argument('--entry', action='append', default=[], metavar='FILE',
+                       help='Scan only modules reachable from this entry file (repeatable), '
+                            'applying app.use() mount prefixes to route paths')
+    parser.add_argument('--since', metavar='REV',
+                       help='Only re-parse files changed since this git revision (git diff --name-only, '
+                            'plus untracked files) and merge them into the baseline')
+    parser.add_argument('--files-from', metavar='FILE',
+                       help='Only re-parse the files listed in FILE, one per line ("-" for stdin), '
+                            'and merge them into the baseline')
+    parser.add_argument('--baseline', metavar='FILE',
+                       help='Earlier scan output (JSON, NDJSON or SQLite catalog) to merge --since/--files-from '
+                            'changes into (default: the scan cache)')
+    parser.add_argument('--middleware', action='store_true',
+                       help='Also report app.use()/router.use() middleware chains, found in the '
+                            'same pass over each file as its routes')
+    parser.add_argument('--input-memo-size', type=int, default=DEFAULT_INPUT_MEMO_SIZE, metavar='N',
+                       help='Remember the expected inputs of up to N handlers, so identical handlers '
+                            'are analyzed once; saved next to the scan cache, 0 to disable '
+                            f'(default: {DEFAULT_INPUT_MEMO_SIZE})')
+    parser.add_argument('--no-prefilter', action='store_true',
+                       help='Parse every file, even those containing no route markers')
+    parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_BYTES, metavar='BYTES',
+                       help=f'Skip files larger than this, 0 for no limit (default: {DEFAULT_MAX_FILE_BYTES})')
+    parser.add_argument('--file-timeout', type=float, default=DEFAULT_FILE_TIMEOUT, metavar='SECONDS',
+                       help='Stop extracting routes from a file after this long and keep the partial '
+                            f'result, 0 for no limit (default: {DEFAULT_FILE_TIMEOUT:g})')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                       help='Stop parsing new files once the scan has run this long and return '
+                            'partial results (default: no budget)')
+    parser.add_argument('--include-minified', action='store_true',
+                       help='Also parse files that look minified or generated')
+    parser.add_argument('--profile', action='store_true',
+                       help='Record per-file and per-pattern timings in the stats (implies --stats)')
+    parser.add_argument('--profile-top', type=int, default=10,
+                       help='Number of slowest files listed with --profile (default: 10)')
+    parser.add_argument('--startup-profile', action='store_true',
+                       help='Report interpreter start-up and import times on stderr')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run as a long-lived server speaking newline-delimited JSON-RPC on stdin/stdout')
+    parser.add_argument('-w', '--watch', action='store_true',
+                       help='Keep running and emit added/removed/changed route events as NDJSON')
+    parser.add_argument('--interval', type=float, default=1.0,
+                       help='Seconds between polls in --watch mode (default: 1.0)')
+    
+    args = parser.parse_args()
+    if not args.project_path and not args.serve:
+        parser.error('project_path is required unless --serve is given')
+    if len(args.project_path) > 1 and (args.serve or args.watch):
+        parser.error('--serve and --watch take a single project_path')
+    incremental = bool(args.since or args.files_from)
+    if incremental and (len(args.project_path) != 1 or args.entry or args.serve or args.watch):
+        parser.error('--since and --files-from take a single project_path and no --entry, '
+                     '--serve or --watch')
+    if args.baseline and not incremental:
+        parser.error('--baseline is only used with --since or --files-from')
+    if args.format == 'sqlite' and not args.output:
+        parser.error('--format sqlite needs --output')
+    project_path = args.project_path[0] if len(args.project_path) == 1 else args.project_path
+    
+    profiler = None
+    if args.startup_profile:
+        profiler = startup.active() or startup.StartupProfiler()
+        profiler.mark("Ready to scan")
+
+    try:
+        if args.serve or args.watch or incremental:
+            matcher_specs = load_matcher_specs(args.matchers) if args.matchers else None
+            walk_options = WalkOptions(args.ext.split(","), args.exclude, args.include,
+                                       not args.no_gitignore)
+            limits = ScanLimits(args.max_file_size, args.file_timeout, args.time_budget,
+                                not args.include_minified)
+
+        if args.serve:
+            # Serve/watch-only modules are imported on demand to keep one-shot scans fast
+            from .server import ScannerServer
+            if matcher_specs:
+                register_matcher_specs(matcher_specs)
+            server = ScannerServer(project_path or None, not args.no_cache, args.jobs,
+                                   args.verbose, matcher_specs, walk_options, limits)
+            server.serve()
+            return
+
+        if args.watch:
+            from .watcher import watch_project
+            watch_project(project_path, args.interval, args.verbose, matcher_specs,
+                          walk_options, limits)
+            return
+
+        cache_path = None
+        if not args.no_cache:
+            cache_path = args.cache_file or [default_cache_path(path) for path in args.project_path]
+
+        include_stats = args.stats or args.profile
+        stats: Dict[str, Any] = {}
+        middleware = [] if args.middleware else None
+        if incremental:
+            from .incremental import git_changed_files, read_file_list, scan_changed
+            changed = git_changed_files(project_path, args.since) if args.since else []
+            if args.files_from:
+                changed += read_file_list(args.files_from)
+            routes = scan_changed(project_path, changed, stats, args.baseline,
+                                  cache_path[0] if isinstance(cache_path, list) else cache_path,
+                                  matcher_specs, walk_options, limits, not args.no_prefilter,
+                                  args.verbose, middleware, args.input_memo_size)
+            # Already merged in memory: written in one go
+            files = [(None, routes)]
+        else:
+            files = iter_file_routes(project_path, cache_path=cache_path, jobs=args.jobs,
+                                      matchers=args.matchers, extensions=args.ext.split(","),
+                                      excludes=args.exclude, includes=args.include,
+                                      use_gitignore=not args.no_gitignore,
+                                      prefilter=not args.no_prefilter, entry_points=args.entry,
+                                      max_file_bytes=args.max_file_size, file_timeout=args.file_timeout,
+                                      time_budget=args.time_budget,
+                                      skip_minified=not args.include_minified,
+                                      profile=args.profile, profile_top=args.profile_top,
+                                      stats=stats, middleware=middleware,
+                                      input_memo_size=args.input_memo_size, verbose=args.verbose)
+            routes = (route for _, file_routes in files for route in file_routes)
+
+        if args.format == 'ndjson':
+            stream_ndjson(files, args.output, include_stats, stats, middleware)
+            return
+        if args.format == 'sqlite':
+            count = write_sqlite(routes, args.output, stats, middleware)
+            if args.verbose:
+                print_scan_summary(stats, count)
+            return
+
+        routes = list(routes)
+        if args.verbose:
+            print_scan_summary(stats, len(routes))
+        output_results(routes, args.format, args.output, include_stats, stats, middleware)
+    
+    except (FileNotFoundError, NotADirectoryError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nScan interrupted by user", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Unexpected error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if profiler is not None:
+            profiler.mark("Finished")
+            print(profiler.report(), file=sys.stderr)
+
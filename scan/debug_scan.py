@@ -140,7 +140,9 @@ def main():
         
         # Output results
         result = {"routes": routes}
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        # extract_routes returns Route objects, the fallback extractor plain dicts
+        print(json.dumps(result, indent=2, ensure_ascii=False,
+                         default=lambda route: route.to_dict()))
         
     except Exception as error:
         print(f"Unexpected error: {error}", file=sys.stderr)
@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+import subprocess
+from typing import List, Dict, Any, Optional
+
+from .parser.route_extractor import (register_matcher_specs, Route, RouteStatistics,
+                                     DEFAULT_INPUT_MEMO_SIZE)
+from .cache import ScanCache, save_input_memo
+from .scanner import (parse_candidate, ScanLimits, open_input_memo, record_memo_use,
+                      input_memo_stats, INPUT_MEMO)
+from .walker import ProjectWalker, WalkOptions
+from .route_index import load_routes
+
+
+def _git(root: str, *args: str) -> List[str]:
+    """NUL-separated paths printed by a git command run in root"""
+    try:
+        completed = subprocess.run(["git", "-C", root, *args], stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, check=True)
+    except FileNotFoundError:
+        raise ValueError("git is not installed or not on PATH") from None
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode("utf-8", errors="replace").strip()
+        raise ValueError(f"git {args[0]} failed: {message}") from None
+    return [path for path in completed.stdout.decode("utf-8", errors="surrogateescape").split("\0")
+            if path]
+
+
+def git_changed_files(root: str, rev: str) -> List[str]:
+    """Files under root that differ from rev, relative to root.
+
+    Covers committed, staged and unstaged changes (the working tree against
+    rev) plus untracked files. Renames are listed as their old and new paths.
+    """
+    # Outside a work tree `git diff` would silently compare paths instead
+    _git(root, "rev-parse", "--show-toplevel")
+    changed = _git(root, "diff", "--name-only", "--relative", "--no-renames", "-z", rev, "--")
+    changed += _git(root, "ls-files", "--others", "--exclude-standard", "-z")
+    return [path.replace("/", os.sep) for path in changed]
+
+
+def read_file_list(list_path: str) -> List[str]:
+    """Paths listed one per line in a file ('-' reads stdin)"""
+    if list_path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(list_path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def scan_changed(project_path: str, changed: List[str], stats: Dict[str, Any],
+                 baseline_path: str = None, cache_path: str = None,
+                 matcher_specs: List[Dict[str, Any]] = None,
+                 walk_options: WalkOptions = None, limits: ScanLimits = None,
+                 prefilter: bool = True, verbose: bool = False,
+                 middleware: List[Dict[str, Any]] = None,
+                 input_memo_size: int = DEFAULT_INPUT_MEMO_SIZE) -> List[Route]:
+    """Complete route set of a project from a baseline plus the files that changed.
+
+    The baseline is earlier scan output (baseline_path, JSON or NDJSON) or,
+    without one, the scan cache. Only the changed paths (relative to the
+    project or absolute) are read: deleted or no longer scanned files lose
+    their routes, the others are parsed again. Routes keep the baseline's
+    file order; files new to it come last. With the cache as baseline, it
+    is updated with the parsed files. stats gets the scan_project counters
+    for the parsed files plus changed_files, baseline_files and the
+    route_statistics of the merged set. A middleware list receives the
+    middleware chains of the merged set; scan output does not record them,
+    so that needs the cache as baseline. The input memo works as in
+    scan_project, saved next to cache_path when there is one.
+    """
+    stats["scanned_files"] = 0
+    stats["prefilter_skipped"] = 0
+    stats["skipped_files"] = skipped_files = []
+    stats["timed_out_files"] = timed_out_files = []
+    stats["errors"] = errors = []
+
+    root = os.path.realpath(project_path)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(f"Path is not a directory: {root}")
+    if limits is None:
+        limits = ScanLimits()
+    budget_deadline = time.time() + limits.time_budget if limits.time_budget else None
+
+    if matcher_specs:
+        register_matcher_specs(matcher_specs)
+
+    cache = None
+    by_file: Dict[Optional[str], List[Route]] = {}
+    middleware_by_file: Dict[str, List[Dict[str, Any]]] = {}
+    if baseline_path:
+        if middleware is not None:
+            raise ValueError("Middleware chains need the scan cache as baseline, not a baseline file")
+        for route in load_routes(baseline_path):
+            by_file.setdefault(route.file, []).append(route)
+    elif cache_path:
+        cache = ScanCache(cache_path).load()
+        if not cache.entries:
+            raise ValueError("No baseline: pass a baseline file, or run a full scan first "
+                             "so the scan cache can serve as one")
+        by_file = {relative_path: cache.decode(relative_path, entry["routes"])
+                   for relative_path, entry in cache.entries.items()}
+        middleware_by_file = {relative_path: entry["middleware"]
+                              for relative_path, entry in cache.entries.items() if "middleware" in entry}
+    else:
+        raise ValueError("An incremental scan needs a baseline file or the scan cache")
+    stats["baseline_files"] = len(by_file)
+    memo_path = open_input_memo(cache_path, input_memo_size)
+    memo_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    relative_paths = []
+    for path in changed:
+        relative_path = os.path.normpath(os.path.relpath(os.path.realpath(os.path.join(root, path)), root))
+        if not relative_path.startswith(os.pardir + os.sep) and relative_path != os.pardir:
+            relative_paths.append(relative_path)
+    relative_paths = list(dict.fromkeys(relative_paths))
+    stats["changed_files"] = len(relative_paths)
+
+    walker = ProjectWalker(root, walk_options)
+    for relative_path in relative_paths:
+        if not walker.accepts(relative_path):
+            # Deleted, or not a file the scan covers (any more)
+            if verbose and relative_path in by_file:
+                print(f"Removed: {relative_path}", file=sys.stderr)
+            by_file.pop(relative_path, None)
+            middleware_by_file.pop(relative_path, None)
+            if cache is not None:
+                cache.discard(relative_path)
+            continue
+
+        file_path = os.path.join(root, relative_path)
+        if verbose:
+            print(f"Reading file: {file_path}", file=sys.stderr)
+        result = parse_candidate(file_path, relative_path, prefilter=prefilter, limits=limits,
+                                 budget_deadline=budget_deadline)
+        record_memo_use(memo_stats, result)
+        if result.skip_reason is not None:
+            skipped_files.append({"file": relative_path, "reason": result.skip_reason})
+            by_file.pop(relative_path, None)
+            middleware_by_file.pop(relative_path, None)
+            continue
+        if result.error is not None:
+            errors.append(result.error)
+            by_file.pop(relative_path, None)
+            middleware_by_file.pop(relative_path, None)
+            continue
+
+        stats["scanned_files"] += 1
+        if result.skipped:
+            stats["prefilter_skipped"] += 1
+        if result.timed_out:
+            timed_out_files.append(relative_path)
+        elif cache is not None:
+            try:
+                cache.store(relative_path, os.stat(file_path), result.digest, result.routes,
+                            result.middleware)
+            except OSError:
+                cache.discard(relative_path)
+        by_file[relative_path] = result.routes
+        middleware_by_file[relative_path] = result.middleware
+
+    if cache is not None:
+        try:
+            cache.save(prune=False)
+        except OSError as e:
+            errors.append(f"Error writing cache {cache.cache_path}: {str(e)}")
+    if input_memo_size > 0:
+        stats["input_memo"] = input_memo_stats(memo_stats)
+        if memo_path is not None and memo_stats["misses"]:
+            try:
+                save_input_memo(INPUT_MEMO, memo_path)
+            except OSError as e:
+                errors.append(f"Error writing input memo {memo_path}: {str(e)}")
+
+    route_statistics = RouteStatistics()
+    for relative_path, file_routes in by_file.items():
+        route_statistics.add(file_routes)
+        if middleware is not None:
+            middleware.extend(dict({"file": relative_path}, **entry)
+                              for entry in middleware_by_file.get(relative_path, ()))
+    stats["route_statistics"] = route_statistics.to_dict()
+
+    return [route for file_routes in by_file.values() for route in file_routes]
@@ -0,0 +1,261 @@
+import os
+import re
+import sys
+import hashlib
+from typing import List, Dict, Any, Optional, Tuple
+
+from .parser.route_extractor import (build_bracket_map, call_extent, split_arguments,
+                                     mount_prefixes, Route)
+from .cache import ScanCache, CACHE_FORMAT, content_hash, decode_source
+from .walker import IGNORE_DIRS
+
+GRAPH_VERSION = "1"
+
+# Tried in order when an import specifier has no extension (Node resolution order first)
+RESOLVE_EXTENSIONS = (".js", ".cjs", ".mjs", ".jsx", ".ts", ".tsx")
+
+# require('x'), import('x')
+_CALL_IMPORT_RE = re.compile(r'\b(?:require|import)\s*\(\s*([\'"`])([^\'"`\n]+)\1\s*\)')
+# import a from 'x', import { a } from 'x', export * from 'x'
+_FROM_IMPORT_RE = re.compile(r'^[ \t]*(?:import|export)\b([^;\'"`]*?)\bfrom\s*([\'"])([^\'"\n]+)\2',
+                             re.MULTILINE)
+# import 'x'
+_BARE_IMPORT_RE = re.compile(r'^[ \t]*import\s*([\'"])([^\'"\n]+)\1', re.MULTILINE)
+# const routes = require('x')
+_REQUIRE_BINDING_RE = re.compile(
+    r'\b(?:const|let|var)\s+([\w$]+)\s*=\s*require\s*\(\s*([\'"`])([^\'"`\n]+)\2\s*\)')
+# app.use( / router.use(
+_USE_CALL_RE = re.compile(r'\b[\w$]+\s*\.\s*use\s*(\()')
+_REQUIRE_ARG_RE = re.compile(r'^require\s*\(\s*([\'"`])([^\'"`\n]+)\1\s*\)$')
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+
+def graph_stamp() -> str:
+    """Version stamp for cached module edges (changes with this module's source)"""
+    digest = hashlib.sha1(f"{CACHE_FORMAT}:graph:{GRAPH_VERSION}".encode("utf-8"))
+    try:
+        with open(__file__, "rb") as f:
+            digest.update(f.read())
+    except (OSError, TypeError):
+        pass
+    return digest.hexdigest()
+
+
+def graph_cache_path(cache_path: str) -> str:
+    """Module graph cache stored next to a scan cache"""
+    return os.path.splitext(cache_path)[0] + ".graph.json"
+
+
+def extract_module_edges(js_code: str) -> Dict[str, List[Any]]:
+    """Find a module's imports and the modules it mounts with .use().
+
+    Returns {"imports": [specifier, ...], "mounts": [[prefix, specifier], ...]}
+    in source order. Mounts are recognised for use() arguments written as
+    require('x') or as an identifier bound by `const x = require('x')` or
+    `import x from 'x'`; the first argument is the prefix when it is a
+    string literal (or an array of them, giving one mount per prefix).
+    """
+    found = []
+    for regex, group in ((_CALL_IMPORT_RE, 2), (_FROM_IMPORT_RE, 3), (_BARE_IMPORT_RE, 2)):
+        for match in regex.finditer(js_code):
+            found.append((match.start(), match.group(group)))
+    imports = list(dict.fromkeys(specifier for _, specifier in sorted(found)))
+
+    mounts = []
+    if ".use" in js_code:
+        bindings = {match.group(1): match.group(3) for match in _REQUIRE_BINDING_RE.finditer(js_code)}
+        for match in _FROM_IMPORT_RE.finditer(js_code):
+            default_name = match.group(1).strip().split(",")[0].strip()
+            if _IDENTIFIER_RE.match(default_name) and default_name != "type":
+                bindings[default_name] = match.group(3)
+
+        brackets = build_bracket_map(js_code)
+        for match in _USE_CALL_RE.finditer(js_code):
+            open_paren = match.start(1)
+            args = split_arguments(js_code[open_paren + 1:call_extent(js_code, open_paren, brackets)])
+            prefixes = [""]
+            if args:
+                literal_prefixes = mount_prefixes(args[0])
+                if literal_prefixes is not None:
+                    prefixes = literal_prefixes
+                    args = args[1:]
+            for arg in args:
+                required = _REQUIRE_ARG_RE.match(arg)
+                specifier = required.group(2) if required else bindings.get(arg)
+                if specifier is not None:
+                    mounts.extend([prefix, specifier] for prefix in prefixes)
+
+    return {"imports": imports, "mounts": mounts}
+
+
+def join_route_path(prefix: str, path: str) -> str:
+    """Compose a mount prefix with a route path ('/api' + '/' -> '/api')"""
+    prefix = prefix.rstrip("/")
+    if not prefix:
+        return path
+    if path in ("", "/"):
+        return prefix
+    return prefix + "/" + path.lstrip("/")
+
+
+def mount_routes(routes: List[Route], prefixes: List[str]) -> List[Route]:
+    """Routes of a module once for every prefix it is mounted at"""
+    if prefixes == [""]:
+        return routes
+    return [route.with_path(join_route_path(prefix, route.path))
+            for prefix in prefixes for route in routes]
+
+
+def mount_middleware(middleware: List[Dict[str, Any]], prefixes: List[str]) -> List[Dict[str, Any]]:
+    """Middleware chains of a module once for every prefix it is mounted at"""
+    if prefixes == [""]:
+        return middleware
+    return [dict(entry, path=join_route_path(prefix, "" if entry["path"] == "*" else entry["path"]) or "*")
+            for prefix in prefixes for entry in middleware]
+
+
+class GraphCache(ScanCache):
+    """ScanCache holding each module's import/mount edges instead of routes"""
+
+    def __init__(self, cache_path: Optional[str]):
+        super().__init__(cache_path)
+        self.stamp = graph_stamp()
+
+    def encode(self, edges: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        return edges
+
+    def decode(self, relative_path: str, edges: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        return edges
+
+
+class ModuleGraph:
+    """Modules reachable from entry points through require/import edges.
+
+    Edges are cached per file (validated like the scan cache), so a rescan
+    only re-reads modules that changed. Bare specifiers (packages) and files
+    outside the project root are not followed.
+    """
+
+    def __init__(self, project_path: str, cache_path: str = None, verbose: bool = False):
+        self.root = os.path.abspath(project_path)
+        self.cache = GraphCache(cache_path).load()
+        self.verbose = verbose
+        self.errors: List[str] = []
+        self._resolved: Dict[Tuple[str, str], Optional[str]] = {}
+        self._edges: Dict[str, Optional[Dict[str, List[Any]]]] = {}
+
+    def relative(self, file_path: str) -> str:
+        """Project-relative path, as produced by the project walker"""
+        return os.path.relpath(file_path, self.root)
+
+    def edges(self, file_path: str) -> Optional[Dict[str, List[Any]]]:
+        """Import/mount edges of one module, from the cache when it is unchanged"""
+        if file_path not in self._edges:
+            self._edges[file_path] = self._load_edges(file_path)
+        return self._edges[file_path]
+
+    def _load_edges(self, file_path: str) -> Optional[Dict[str, List[Any]]]:
+        relative_path = self.relative(file_path)
+        try:
+            st = os.stat(file_path)
+            edges, raw = self.cache.lookup(relative_path, st, lambda: _read(file_path))
+            if edges is not None:
+                return edges
+            if raw is None:
+                raw = _read(file_path)
+        except OSError as e:
+            self.errors.append(f"Error reading {relative_path}: {str(e)}")
+            return None
+
+        edges = extract_module_edges(decode_source(raw))
+        self.cache.store(relative_path, st, content_hash(raw), edges)
+        return edges
+
+    def resolve(self, importer: str, specifier: str) -> Optional[str]:
+        """Absolute path of a relative import, or None if it is not a project file"""
+        if not specifier.startswith((".", "/")):
+            return None
+        key = (os.path.dirname(importer), specifier)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        base = os.path.normpath(os.path.join(key[0], specifier))
+        resolved = None
+        candidates = [base] + [base + ext for ext in RESOLVE_EXTENSIONS]
+        candidates += [os.path.join(base, "index" + ext) for ext in RESOLVE_EXTENSIONS]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                resolved = candidate
+                break
+
+        if resolved is not None:
+            relative_path = self.relative(resolved)
+            parts = relative_path.split(os.sep)
+            if relative_path.startswith("..") or any(part in IGNORE_DIRS for part in parts[:-1]):
+                resolved = None
+
+        self._resolved[key] = resolved
+        return resolved
+
+    def walk(self, entry_points: List[str]) -> Tuple[List[Tuple[str, str]], Dict[str, List[str]]]:
+        """Reachable modules and their mount prefixes.
+
+        Returns ([(absolute path, relative path), ...] in first-visit order,
+        {relative path: [prefix, ...]}). A mounted module gets the importer's
+        prefixes joined with the mount path; a module that is only imported
+        inherits the importer's prefixes. Import cycles are cut at the first
+        module repeated on the current path.
+        """
+        self.cache.begin_scan()
+        self._edges = {}
+        order: List[Tuple[str, str]] = []
+        prefixes: Dict[str, List[str]] = {}
+
+        # Depth-first, children in source order: (file, prefix, ancestors)
+        stack = [(entry, "", frozenset()) for entry in reversed(entry_points)]
+        while stack:
+            file_path, prefix, ancestors = stack.pop()
+            relative_path = self.relative(file_path)
+            module_prefixes = prefixes.get(relative_path)
+            if module_prefixes is None:
+                module_prefixes = prefixes[relative_path] = []
+                order.append((file_path, relative_path))
+            elif prefix in module_prefixes:
+                continue
+            module_prefixes.append(prefix)
+
+            edges = self.edges(file_path)
+            if not edges:
+                continue
+
+            ancestors = ancestors | {file_path}
+            children = []
+            mounted = set()
+            for mount_path, specifier in edges["mounts"]:
+                child = self.resolve(file_path, specifier)
+                if child is not None:
+                    mounted.add(child)
+                    children.append((child, join_route_path(prefix, mount_path).rstrip("/")))
+            for specifier in edges["imports"]:
+                child = self.resolve(file_path, specifier)
+                if child is not None and child not in mounted:
+                    children.append((child, prefix))
+
+            for child, child_prefix in reversed(children):
+                if child not in ancestors:
+                    stack.append((child, child_prefix, ancestors))
+
+        if self.verbose:
+            print(f"Module graph: {len(order)} reachable module(s), "
+                  f"edge cache hits: {self.cache.hits}, misses: {self.cache.misses}", file=sys.stderr)
+
+        try:
+            self.cache.save()
+        except OSError as e:
+            self.errors.append(f"Error writing cache {self.cache.cache_path}: {str(e)}")
+        return order, prefixes
+
+
+def _read(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
@@ -1,156 +1,883 @@
 import re
 import sys
-from typing import List, Dict, Any, Set
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Optional, Tuple
 
-def extract_routes(js_code: str, file_path: str = None) -> List[Dict[str, Any]]:
-    """Extract routes from JavaScript code with enhanced pattern matching"""
+# Bump when extraction output changes; scan caches are invalidated by it
+EXTRACTOR_VERSION = "8"
+
+# Tokens that matter when matching brackets: comments and string literals are
+# consumed whole so brackets inside them are ignored. A lone '/' is division
+# or the start of a regex literal (see regex_literal_end)
+_LITERAL_PATTERN = r"""/\*.*?(?:\*/|\Z)|'(?:\\.|[^'\\\n])*'?|"(?:\\.|[^"\\\n])*"?"""
+_BRACKET_TOKEN_RE = re.compile(r"//[^\n]*|" + _LITERAL_PATTERN + r"|[`(){}\[\]/]", re.DOTALL)
+_TEMPLATE_TOKEN_RE = re.compile(r"\\.|`|\$\{", re.DOTALL)
+# The literals alone; a line comment takes its newline along
+_LITERAL_TOKEN_RE = re.compile(r"//[^\n]*\n?|" + _LITERAL_PATTERN + "|/", re.DOTALL)
+_REGEX_BODY_RE = re.compile(r"/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[`])+/[A-Za-z]*")
+# Characters after which a '/' starts an operand, hence a regex literal
+_REGEX_PRECEDERS = frozenset('(,=:[!&|?{};>')
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def regex_literal_end(js_code: str, slash: int) -> int:
+    """End of the regex literal starting at js_code[slash] ('/'), or -1 for a division.
+
+    Like a JS lexer, the preceding code decides: a regex literal can only
+    start after an operator or punctuator such as ( , = : or after return.
+    """
+    i = slash - 1
+    while i >= 0 and js_code[i] in ' \t\r\n':
+        i -= 1
+    if i >= 0 and js_code[i] not in _REGEX_PRECEDERS:
+        if not (js_code.endswith('return', 0, i + 1)
+                and (i < 6 or not (js_code[i - 6].isalnum() or js_code[i - 6] in '_$'))):
+            return -1
+    match = _REGEX_BODY_RE.match(js_code, slash)
+    return match.end() if match else -1
+
+def build_bracket_map(js_code: str) -> Dict[int, int]:
+    """Map the index of every opening bracket to its closing bracket in one pass.
+
+    Brackets inside strings, comments, regex literals and template literal
+    text are skipped; ${...} expressions inside template literals are
+    treated as code.
+    """
+    brackets = {}
+    stack = []
+    in_template = False
+    pos = 0
+    length = len(js_code)
+
+    while pos < length:
+        if in_template:
+            match = _TEMPLATE_TOKEN_RE.search(js_code, pos)
+            if not match:
+                break
+            pos = match.end()
+            token = match.group()
+            if token == '`':
+                in_template = False
+            elif token == '${':
+                stack.append(('${', match.start() + 1))
+                in_template = False
+            continue
+
+        match = _BRACKET_TOKEN_RE.search(js_code, pos)
+        if not match:
+            break
+        pos = match.end()
+        char = match.group()[0]
+
+        if char in '([{':
+            stack.append((char, match.start()))
+        elif char in ')]}':
+            if stack:
+                opener, start = stack.pop()
+                brackets[start] = match.start()
+                if opener == '${':
+                    in_template = True
+        elif char == '/':
+            end = regex_literal_end(js_code, match.start())
+            if end > 0:
+                pos = end
+        elif char == '`':
+            in_template = True
+
+    return brackets
+
+def call_extent(js_code: str, open_paren: int, brackets: Dict[int, int]) -> int:
+    """Get the index of the parenthesis closing a call (end of code if unbalanced)"""
+    return brackets.get(open_paren, len(js_code))
+
+class RouteMatcher:
+    """A precompiled route declaration pattern.
+
+    captures maps route fields ('method', 'path', 'framework', 'call') to regex
+    group numbers or names; defaults fills fields a pattern does not capture.
+    The 'call' group marks the opening parenthesis whose arguments hold the
+    handler. handler selects how the handler is sliced:
+      'call'     - from the end of the match to the call's closing parenthesis
+      'function' - as 'call', then through the following { ... } body
+      'none'     - no handler; only path parameters are reported
+    With path_from_file the route path is derived from the file name
+    (Next.js style pages/api/users/[id].js -> /api/users/:id).
+    markers are literal strings, at least one of which (case-insensitively)
+    appears in any file the pattern can match; the scanner uses them to skip
+    files cheaply. A matcher without markers disables that prefilter.
+    """
+
+    HANDLER_MODES = ('call', 'function', 'none')
+
+    def __init__(self, name: str, pattern: str, captures: Dict[str, Any],
+                 defaults: Dict[str, str] = None, handler: str = 'call',
+                 flags: int = re.IGNORECASE | re.MULTILINE, path_from_file: bool = False,
+                 markers: List[str] = None):
+        if handler not in self.HANDLER_MODES:
+            raise ValueError(f"Unknown handler mode for matcher {name}: {handler}")
+        self.name = name
+        self.pattern = pattern
+        self.regex = re.compile(pattern, flags)
+        self.captures = captures
+        self.defaults = defaults or {}
+        self.handler = handler
+        self.flags = flags
+        self.path_from_file = path_from_file
+        self.markers = list(markers or [])
+
+    def field(self, match: re.Match, name: str) -> Any:
+        """Read a route field from a match, falling back to the matcher default"""
+        group = self.captures.get(name)
+        if group is not None:
+            value = match.group(group)
+            if value is not None:
+                return value
+        return self.defaults.get(name)
+
+    def signature(self) -> str:
+        """Stable description of everything that affects this matcher's output"""
+        return repr((self.name, self.pattern, sorted(self.captures.items()),
+                     sorted(self.defaults.items()), self.handler, self.flags,
+                     self.path_from_file, self.markers))
+
+# Built-in matchers, compiled once at import; extended via register_matcher
+ROUTE_MATCHERS: List[RouteMatcher] = [
+    # Express.js style: app.get('/path', handler). The path must start with '/'
+    # or '*', which leaves out app.get('env') and named routes like
+    # router.get('name', '/path', handler) that custom matchers handle
+    RouteMatcher(
+        'express',
+        r'\b(app|router)\.(get|post|put|delete|patch|head|options|all)\s*(\()\s*[\'"`]([/*][^\'"`]*)[\'"`]',
+        captures={'framework': 1, 'method': 2, 'call': 3, 'path': 4},
+        markers=['app.', 'router.'],
+    ),
+    # Method chaining: .route('/path').get(handler).post(handler)
+    RouteMatcher(
+        'express-route-chain',
+        r'\.route\s*\(\s*[\'"`]([/*][^\'"`]*)[\'"`]\s*\)\s*\.(get|post|put|delete|patch|head|options|all)\s*(\()',
+        captures={'path': 1, 'method': 2, 'call': 3},
+        defaults={'framework': 'router'},
+        markers=['.route'],
+    ),
+]
+
+# Literal text every app.use()/router.use() call contains (see analyze_middleware)
+MIDDLEWARE_MARKERS = ['app.use', 'router.use']
+
+_FLAG_NAMES = {
+    'IGNORECASE': re.IGNORECASE,
+    'MULTILINE': re.MULTILINE,
+    'DOTALL': re.DOTALL,
+    'VERBOSE': re.VERBOSE,
+}
+
+_marker_regex_cache: Dict[str, Any] = {}
+
+def register_matcher(matcher: RouteMatcher):
+    """Add a matcher to the registry, replacing any matcher with the same name"""
+    _marker_regex_cache.clear()
+    for index, existing in enumerate(ROUTE_MATCHERS):
+        if existing.name == matcher.name:
+            ROUTE_MATCHERS[index] = matcher
+            return
+    ROUTE_MATCHERS.append(matcher)
+
+def route_marker_regex() -> Optional[re.Pattern]:
+    """Bytes regex finding any registered matcher's markers.
+
+    Returns None when some matcher declares no markers, since then any file
+    could contain routes. Compiled once per registry state.
+    """
+    if 'regex' not in _marker_regex_cache:
+        regex = None
+        if all(matcher.markers for matcher in ROUTE_MATCHERS):
+            # Middleware is analyzed in the same pass, so its files must get through too
+            markers = sorted({marker.lower().encode('utf-8')
+                              for matcher in ROUTE_MATCHERS for marker in matcher.markers} |
+                             {marker.encode('utf-8') for marker in MIDDLEWARE_MARKERS})
+            regex = re.compile(b'|'.join(re.escape(marker) for marker in markers), re.IGNORECASE)
+        _marker_regex_cache['regex'] = regex
+    return _marker_regex_cache['regex']
+
+def matcher_from_spec(spec: Dict[str, Any]) -> RouteMatcher:
+    """Build a RouteMatcher from a config entry"""
+    try:
+        name = spec['name']
+        pattern = spec['pattern']
+    except KeyError as e:
+        raise ValueError(f"Route matcher config entry is missing {e}") from None
+
+    captures = spec.get('captures')
+    if captures is None:
+        # Default layout: named groups with the field names
+        captures = {field: field for field in ('method', 'path', 'framework', 'call')
+                    if f'(?P<{field}>' in pattern}
+
+    flags = 0
+    for flag in spec.get('flags', ['IGNORECASE', 'MULTILINE']):
+        if flag not in _FLAG_NAMES:
+            raise ValueError(f"Unknown regex flag for matcher {name}: {flag}")
+        flags |= _FLAG_NAMES[flag]
+
+    try:
+        return RouteMatcher(name, pattern, captures, spec.get('defaults'),
+                            spec.get('handler', 'call'), flags,
+                            spec.get('path_from_file', False), spec.get('markers'))
+    except re.error as e:
+        raise ValueError(f"Invalid pattern for matcher {name}: {e}") from None
+
+def register_matcher_specs(specs: List[Dict[str, Any]]) -> List[RouteMatcher]:
+    """Build and register matchers from config entries"""
+    matchers = [matcher_from_spec(spec) for spec in specs]
+    for matcher in matchers:
+        register_matcher(matcher)
+    return matchers
+
+def load_matcher_specs(config_path: str) -> List[Dict[str, Any]]:
+    """Read matcher entries from a JSON config file ({"matchers": [...]})"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    specs = config.get('matchers', []) if isinstance(config, dict) else config
+    if not isinstance(specs, list):
+        raise ValueError(f"'matchers' in {config_path} must be a list")
+    return specs
+
+def matchers_signature() -> str:
+    """Describe the active registry (used to stamp caches)"""
+    return "\n".join(matcher.signature() for matcher in ROUTE_MATCHERS)
+
+def path_from_file_name(file_path: str) -> str:
+    """Derive a Next.js style API route path from a file path"""
+    route = file_path.replace('\\', '/')
+    route = re.sub(r'\.(?:[cm]?js|jsx|tsx?)$', '', route)
+    api_index = route.find('api/')
+    route = '/' + (route[api_index:] if api_index >= 0 else route.split('/')[-1])
+    route = re.sub(r'/(?:index|route)$', '', route)
+    route = re.sub(r'\[\.\.\.(\w+)\]', '*', route)
+    return re.sub(r'\[(\w+)\]', r':\1', route) or '/'
+
+def handler_extent(js_code: str, matcher: RouteMatcher, match: re.Match,
+                   brackets: Dict[int, int]) -> str:
+    """Slice the handler code for a matched route declaration"""
+    if matcher.handler == 'none':
+        return ""
+
+    call_group = matcher.captures.get('call')
+    if call_group is None or match.start(call_group) < 0:
+        return ""
+
+    end = call_extent(js_code, match.start(call_group), brackets)
+    if matcher.handler == 'function':
+        body_start = js_code.find('{', end)
+        if body_start >= 0:
+            end = brackets.get(body_start, len(js_code))
+
+    return js_code[match.end():end]
+
+def _lap(timings: Dict[str, float], family: str, start: float) -> float:
+    """Charge the time since start to a pattern family and return the new start"""
+    now = time.perf_counter()
+    timings[family] = timings.get(family, 0.0) + now - start
+    return now
+
+class Route:
+    """One extracted route.
+
+    Slotted and compact: method, file and framework strings are interned so
+    the thousands of routes sharing them hold one copy, and the expected
+    inputs are a tuple of (source, (name, ...)) pairs for the non-empty
+    sources. to_dict() gives the JSON schema ({"method", "path", "file",
+    "framework", "expected_inputs"}, plus "package" for routes tagged by a
+    multi-root scan); pass json_default to json.dumps to serialize routes
+    directly.
+    """
+
+    __slots__ = ('method', 'path', 'file', 'framework', 'inputs', 'package')
+
+    def __init__(self, method: str, path: str, file: Optional[str], framework: str,
+                 inputs: Tuple[Tuple[str, Tuple[str, ...]], ...] = (),
+                 package: Optional[str] = None):
+        self.method = sys.intern(method)
+        self.path = path
+        self.file = sys.intern(file) if file is not None else None
+        self.framework = sys.intern(framework)
+        self.inputs = inputs
+        self.package = sys.intern(package) if package is not None else None
+
+    @staticmethod
+    def pack_inputs(expected_inputs: Dict[str, List[str]]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+        """Tuple form of an expected_inputs dict, interning sources and names"""
+        intern = sys.intern
+        return tuple([(intern(source), tuple(map(intern, names)))
+                      for source, names in expected_inputs.items() if names])
+
+    @property
+    def expected_inputs(self) -> Dict[str, List[str]]:
+        """Expected inputs in the JSON layout: {"req.body": [...], ...}"""
+        return {source: list(names) for source, names in self.inputs}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The route in the scanner's JSON schema"""
+        data = {
+            "method": self.method,
+            "path": self.path,
+            "file": self.file,
+        }
+        if self.package is not None:
+            data["package"] = self.package
+        data["framework"] = self.framework
+        data["expected_inputs"] = {source: list(names) for source, names in self.inputs}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Route":
+        """Rebuild a route from its JSON form"""
+        inputs = data.get("expected_inputs")
+        return cls(data["method"], data["path"], data.get("file"), data.get("framework", "unknown"),
+                   cls.pack_inputs(inputs) if inputs else (), data.get("package"))
+
+    def to_list(self) -> List[Any]:
+        """Compact form without the file and package, used by the scan cache"""
+        return [self.method, self.path, self.framework,
+                [[source, list(names)] for source, names in self.inputs]]
+
+    @classmethod
+    def from_list(cls, file: Optional[str], data: List[Any]) -> "Route":
+        """Inverse of to_list for a route of the given file"""
+        method, path, framework, inputs = data
+        if inputs:
+            intern = sys.intern
+            inputs = tuple([(intern(source), tuple(map(intern, names))) for source, names in inputs])
+        return cls(method, path, file, framework, inputs or ())
+
+    def with_path(self, path: str) -> "Route":
+        """Copy of the route with another path (e.g. a mount prefix applied)"""
+        return Route(self.method, path, self.file, self.framework, self.inputs, self.package)
+
+    def with_file(self, file: Optional[str]) -> "Route":
+        """Copy of the route declared in another file with the same contents"""
+        return Route(self.method, self.path, file, self.framework, self.inputs, self.package)
+
+    def __reduce__(self):
+        # Through __init__, so routes coming back from worker processes are interned
+        return Route, (self.method, self.path, self.file, self.framework, self.inputs, self.package)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Route):
+            return NotImplemented
+        return (self.method, self.path, self.file, self.framework, self.inputs, self.package) == \
+               (other.method, other.path, other.file, other.framework, other.inputs, other.package)
+
+    def __repr__(self) -> str:
+        return f"Route({self.method} {self.path} {self.file} {self.framework})"
+
+def json_default(obj: Any) -> Any:
+    """json.dumps default hook serializing Route objects"""
+    if isinstance(obj, Route):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ExtractionTimeout(Exception):
+    """Raised by extract_routes when its deadline passes; routes holds what was found so far"""
+
+    def __init__(self, routes: List[Route]):
+        super().__init__(f"Route extraction timed out after {len(routes)} route(s)")
+        self.routes = routes
+        # Set by analyze_source
+        self.middleware: List[Dict[str, Any]] = []
+
+# Handlers whose expected inputs INPUT_MEMO remembers by default
+DEFAULT_INPUT_MEMO_SIZE = 4096
+
+def path_params(path: str) -> List[str]:
+    """Names of the :params in a route path"""
+    return re.findall(r':(\w+)', path)
+
+def normalize_handler(handler_code: str) -> str:
+    """Handler source with every run of whitespace in code collapsed to one space.
+
+    Input extraction does not depend on layout, so handlers that differ only
+    in indentation or line breaks normalize (and are memoized) alike.
+    Strings, template literal text and comments are found as in
+    build_bracket_map and kept as written; a line comment keeps its newline.
+    """
+    if '`' in handler_code:
+        return _normalize_template_handler(handler_code)
+    parts = []
+    copied = pos = 0
+    while True:
+        match = _LITERAL_TOKEN_RE.search(handler_code, pos)
+        if not match:
+            break
+        start, pos = match.span()
+        if pos == start + 1 and handler_code[start] == '/':
+            pos = regex_literal_end(handler_code, start)
+            if pos < 0:
+                # Division
+                pos = start + 1
+                continue
+        parts.append(_WHITESPACE_RE.sub(' ', handler_code[copied:start]))
+        parts.append(handler_code[start:pos])
+        copied = pos
+    parts.append(_WHITESPACE_RE.sub(' ', handler_code[copied:]))
+    return ''.join(parts).strip()
+
+def _normalize_template_handler(handler_code: str) -> str:
+    """normalize_handler for code with template literals, tracking ${...} nesting"""
+    parts = []
+    stack = []
+    in_template = False
+    copied = pos = 0
+    length = len(handler_code)
+
+    while pos < length:
+        if in_template:
+            match = _TEMPLATE_TOKEN_RE.search(handler_code, pos)
+            if not match:
+                break
+            pos = match.end()
+            token = match.group()
+            if token != '`' and token != '${':
+                continue
+            parts.append(handler_code[copied:pos])
+            copied = pos
+            in_template = False
+            if token == '${':
+                stack.append('${')
+            continue
+
+        match = _BRACKET_TOKEN_RE.search(handler_code, pos)
+        if not match:
+            break
+        pos = match.end()
+        token = match.group()
+        char = token[0]
+
+        if char in '([{':
+            stack.append(char)
+        elif char in ')]}':
+            if stack and stack.pop() == '${':
+                parts.append(_WHITESPACE_RE.sub(' ', handler_code[copied:pos]))
+                copied = pos
+                in_template = True
+        elif char == '/' and len(token) == 1:
+            end = regex_literal_end(handler_code, match.start())
+            if end > 0:
+                pos = end
+                parts.append(_WHITESPACE_RE.sub(' ', handler_code[copied:match.start()]))
+                parts.append(handler_code[match.start():pos])
+                copied = pos
+        else:
+            # A string, a comment or a template literal's opening backtick
+            parts.append(_WHITESPACE_RE.sub(' ', handler_code[copied:match.start()]))
+            if char == '`':
+                in_template = True
+            elif token.startswith('//') and handler_code.startswith('\n', pos):
+                pos += 1
+            parts.append(handler_code[match.start():pos])
+            copied = pos
+
+    tail = handler_code[copied:]
+    if in_template:
+        parts.append(tail)
+        return ''.join(parts).lstrip()
+    parts.append(_WHITESPACE_RE.sub(' ', tail))
+    return ''.join(parts).strip()
+
+class InputMemo:
+    """Bounded LRU of the packed expected inputs of handlers seen before.
+
+    Keys hash the normalized handler source together with the route's path
+    params (see key), so generated CRUD controllers, copy-pasted validators
+    and vendored files cost one lookup per route after the first. Values are
+    Route.pack_inputs tuples, shared by every route that hits them. hits,
+    misses and evictions count since the memo was created. While log is a
+    list, hits and stores are also recorded there (see take_log). A loader,
+    if set, is called once on the first miss to fill the memo (see
+    load_pending), so a memo saved on disk is only read when it is needed.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_INPUT_MEMO_SIZE):
+        self.capacity = capacity
+        self.entries: "OrderedDict[str, Tuple[Tuple[str, Tuple[str, ...]], ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.log: Optional[List[Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...]]]] = None
+        self.loader: Optional[Callable[[], Any]] = None
+
+    @staticmethod
+    def key(normalized_handler: str, params: List[str]) -> str:
+        """Memo key of a normalized handler (see normalize_handler) and its path params"""
+        digest = hashlib.blake2b(normalized_handler.encode('utf-8', 'surrogatepass'),
+                                 digest_size=16).hexdigest()
+        return f"{digest}:{','.join(params)}" if params else digest
+
+    def get(self, key: str) -> Optional[Tuple[Tuple[str, Tuple[str, ...]], ...]]:
+        """Memoized inputs for a key, or None (counted as a miss)"""
+        inputs = self.entries.get(key)
+        if inputs is None and self.loader is not None:
+            self.load_pending()
+            inputs = self.entries.get(key)
+        if inputs is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        if self.log is not None:
+            self.log.append((key, inputs))
+        return inputs
+
+    def put(self, key: str, inputs: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+        """Remember inputs, evicting the least recently used entries over capacity"""
+        if self.capacity <= 0:
+            return
+        self.entries[key] = inputs
+        self.entries.move_to_end(key)
+        if self.log is not None:
+            self.log.append((key, inputs))
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def load_pending(self):
+        """Call the loader now if it has not run yet"""
+        loader, self.loader = self.loader, None
+        if loader is not None:
+            loader()
+
+    def take_log(self) -> List[Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...]]]:
+        """(key, inputs) of every hit and store since the last call, in order"""
+        log = self.log or []
+        self.log = []
+        return log
+
+    def replay(self, log: List[Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...]]]):
+        """Apply another memo's take_log() here, counting as if the lookups had been made here.
+
+        Replayed in file order, the logs of worker processes leave this memo
+        and its counters as a serial scan would have.
+        """
+        for key, inputs in log:
+            if self.get(key) is None:
+                self.put(key, inputs)
+
+    def counters(self) -> Tuple[int, int, int]:
+        """(hits, misses, evictions) so far"""
+        return self.hits, self.misses, self.evictions
+
+    def resize(self, capacity: int):
+        """Change the capacity, evicting entries over it (0 disables the memo)"""
+        self.capacity = capacity
+        while len(self.entries) > max(capacity, 0):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, the pending loader and reset the counters"""
+        self.entries.clear()
+        self.loader = None
+        self.hits = self.misses = self.evictions = 0
+        if self.log is not None:
+            self.log = []
+
+# Used by extract_routes; worker processes each have their own
+INPUT_MEMO = InputMemo()
+
+def extract_routes(js_code: str, file_path: str = None,
+                   matchers: List[RouteMatcher] = None,
+                   timings: Dict[str, float] = None,
+                   deadline: float = None,
+                   brackets: Dict[int, int] = None) -> List[Route]:
+    """Extract routes from JavaScript code using the route matcher registry.
+
+    When a timings dict is passed, seconds spent per pattern family
+    (route_match, handler_localization, inputs) are added to it. deadline
+    is a time.time() value; it is checked before each route and
+    ExtractionTimeout is raised once it has passed. brackets is the file's
+    bracket map when the caller already built it. Expected inputs of
+    handlers seen before come from INPUT_MEMO, unless its capacity is 0.
+    """
     routes = []
+    if timings is not None:
+        started = time.perf_counter()
+        nested = {}
     
-    # Enhanced patterns for different route declaration styles
-    patterns = [
-        # Express.js style: app.get('/path', handler)
-        r'\b(app|router)\.(get|post|put|delete|patch|head|options|all)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]',
-        
-        # Method chaining: .route('/path').get(handler).post(handler)
-        r'\.route\s*\(\s*[\'"`]([^\'"`]+)[\'"`]\s*\)\s*\.(get|post|put|delete|patch|head|options|all)',
-    ]
-    
-    total_matches = 0
-    
-    for i, pattern in enumerate(patterns):
-        regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-        matches = regex.findall(js_code)
-        
-        for match in matches:
-            if i == 3:  # Route chaining pattern
-                path, method = match
-                obj = 'router'
-            elif i == 4:  # Next.js pattern
-                method = match
-                path = '/api/' + (file_path.split('/')[-1].replace('.js', '').replace('.ts', '') if file_path else 'unknown')
-                obj = 'nextjs'
-            else:
-                obj, method, path = match
-            
-            # Extract expected inputs for this route
-            expected_inputs = extract_expected_inputs_for_route(js_code, method.upper(), path)
-            
-            route_info = {
-                "method": method.upper(),
-                "path": path,
-                "file": file_path,
-                "framework": obj,
-                "expected_inputs": expected_inputs
-            }
+    for matcher in (ROUTE_MATCHERS if matchers is None else matchers):
+        for match in matcher.regex.finditer(js_code):
+            if deadline is not None and time.time() > deadline:
+                raise ExtractionTimeout(routes)
+            if timings is not None:
+                localize_start = time.perf_counter()
+            if brackets is None:
+                # Built lazily and shared by every route in the file
+                brackets = build_bracket_map(js_code)
+
+            method = (matcher.field(match, 'method') or 'ALL').upper()
+            path = matcher.field(match, 'path')
+            if path is None and matcher.path_from_file:
+                path = path_from_file_name(file_path or 'unknown')
+            if path is None:
+                continue
+
+            # Extract expected inputs for this route from its own handler only
+            handler_code = normalize_handler(handler_extent(js_code, matcher, match, brackets))
+            if timings is not None:
+                memo_start = _lap(nested, 'handler_localization', localize_start)
+            inputs = key = None
+            if INPUT_MEMO.capacity > 0:
+                key = InputMemo.key(handler_code, path_params(path))
+                inputs = INPUT_MEMO.get(key)
+                if timings is not None:
+                    _lap(nested, 'inputs', memo_start)
+            if inputs is None:
+                inputs = Route.pack_inputs(extract_expected_inputs_for_route(
+                    js_code, method, path, handler_code, nested if timings is not None else None))
+                if key is not None:
+                    INPUT_MEMO.put(key, inputs)
             
-            routes.append(route_info)
-            total_matches += 1
+            routes.append(Route(method, path, file_path,
+                                matcher.field(match, 'framework') or matcher.name, inputs))
     
-    if file_path and total_matches > 0:
-        print(f"[{file_path}] Found {total_matches} routes", file=sys.stderr)
-        for route in routes[-total_matches:]:  # Show only the routes just added
-            print(f"  -> {route['method']} {route['path']} ({route['framework']})", file=sys.stderr)
+    if timings is not None:
+        # Whatever was not spent localizing handlers or extracting inputs
+        # went into matching route declarations
+        elapsed = time.perf_counter() - started
+        timings['route_match'] = timings.get('route_match', 0.0) + elapsed - sum(nested.values())
+        for family, seconds in nested.items():
+            timings[family] = timings.get(family, 0.0) + seconds
     
     return routes
 
-def extract_expected_inputs_for_route(js_code: str, method: str, path: str) -> Dict[str, List[str]]:
-    """Extract expected inputs for a specific route by analyzing the handler function"""
-    expected_inputs = {
-        'req.body': [],
-        'req.params': [],
-        'req.query': [],
-        'req.headers': []
-    }
-    
-    # Try to find the handler function for this specific route
-    # This is a simplified approach - in practice, you'd need more sophisticated parsing
-    route_handler_patterns = [
-        rf'{re.escape(path)}[\'"`]\s*,\s*(?:async\s+)?\(?(?:req|request|ctx)[^{{]*{{([^}}]+)}}',
-        rf'{method.lower()}\s*\(\s*[\'"`]{re.escape(path)}[\'"`]\s*,\s*(?:async\s+)?\(?(?:req|request|ctx)[^{{]*{{([^}}]+)}}'
-    ]
-    
-    handler_code = ""
-    for pattern in route_handler_patterns:
-        matches = re.search(pattern, js_code, re.IGNORECASE | re.DOTALL)
-        if matches:
-            handler_code = matches.group(1)
-            break
-    
-    if not handler_code:
-        # Fallback: analyze the entire file for common patterns
-        handler_code = js_code
-    
-    # Extract req.body usage
-    body_patterns = [
-        r'req\.body\.(\w+)',
-        r'request\.body\.(\w+)',
-        r'ctx\.request\.body\.(\w+)',
-        r'body\.(\w+)',
-        r'const\s*{\s*([^}]+)\s*}\s*=\s*req\.body',
-        r'const\s*{\s*([^}]+)\s*}\s*=\s*request\.body'
-    ]
-    
-    for pattern in body_patterns:
-        matches = re.findall(pattern, handler_code)
-        for match in matches:
-            if isinstance(match, tuple):
-                match = match[0]
-            if ',' in match:
-                # Destructuring: {title, description} = req.body
-                fields = [field.strip() for field in match.split(',')]
-                expected_inputs['req.body'].extend(fields)
-            else:
-                expected_inputs['req.body'].append(match)
-    
-    # Extract req.params usage
-    param_patterns = [
-        r'req\.params\.(\w+)',
-        r'request\.params\.(\w+)',
-        r'ctx\.params\.(\w+)',
-        r'params\.(\w+)'
-    ]
-    
-    for pattern in param_patterns:
-        matches = re.findall(pattern, handler_code)
-        expected_inputs['req.params'].extend(matches)
-    
-    # Extract path parameters from the route path itself
-    path_params = re.findall(r':(\w+)', path)
-    expected_inputs['req.params'].extend(path_params)
-    
-    # Extract req.query usage
-    query_patterns = [
-        r'req\.query\.(\w+)',
-        r'request\.query\.(\w+)',
-        r'ctx\.query\.(\w+)',
-        r'query\.(\w+)'
-    ]
-    
-    for pattern in query_patterns:
-        matches = re.findall(pattern, handler_code)
-        expected_inputs['req.query'].extend(matches)
-    
-    # Extract req.headers usage
-    header_patterns = [
-        r'req\.headers\.(\w+)',
-        r'req\.headers\[[\'"`]([^\'"`]+)[\'"`]\]',
-        r'request\.headers\.(\w+)',
-        r'ctx\.headers\.(\w+)'
-    ]
-    
-    for pattern in header_patterns:
-        matches = re.findall(pattern, handler_code)
-        expected_inputs['req.headers'].extend(matches)
-    
-    # Remove duplicates and clean up
-    for key in expected_inputs:
-        expected_inputs[key] = list(set(expected_inputs[key]))
-        expected_inputs[key] = [item.strip() for item in expected_inputs[key] if item.strip()]
-    
+def find_route_handler(js_code: str, method: str, path: str) -> str:
+    """Locate the handler arguments of the route call declaring method/path.
+
+    Returns the code between the path literal and the call's closing
+    parenthesis, or an empty string when the route call is not found.
+    """
+    call_regex = re.compile(
+        rf'\.{re.escape(method.lower())}\s*(\()\s*[\'"`]{re.escape(path)}[\'"`]',
+        re.IGNORECASE
+    )
+    match = call_regex.search(js_code)
+    if not match:
+        return ""
+
+    brackets = build_bracket_map(js_code)
+    return js_code[match.end():call_extent(js_code, match.start(1), brackets)]
+
+# Expected input sources, in the order they are reported
+INPUT_SOURCES = ('req.body', 'req.params', 'req.query', 'req.headers')
+
+_REQUEST_ROOTS = ('req', 'request', 'ctx')
+_DECLARATION_KEYWORDS = ('const', 'let', 'var')
+
+# Bare identifiers read as input objects without a declaration in the handler
+# (e.g. bound by the handler's parameters)
+_DEFAULT_INPUT_ALIASES = {'body': 'req.body', 'params': 'req.params', 'query': 'req.query'}
+
+# What must follow a keyword of _input_token_regex: a declaration binding the
+# request or an input object, or a member access. Keywords followed by
+# anything else fail inside the regex engine rather than in Python.
+_INPUT_TOKEN_TAIL = r'''
+    (?:\s*(?:\{([^{}()\[\]'"`=:.]*)\}                          # const { a, b }
+           |(\{(?:(?!\b(?:const|let|var)\b)[^;])*?\})          # const { a: { b }, c = 1 }
+           |([A-Za-z_$][\w$]*))                                # const b
+       \s*=(?![=>])\s*(req|request|ctx)(?:\??(\.request))?(?:\??\.(body|params|query|headers))?
+       (?![\w$.\[(]|\?\.)
+     |(?:\??(\.request))?(?:\??\.(body|params|query|headers)\b)?  # req.body, ctx.request.query
+       (?:\??\.([\w$]+)|(?:\?\.)?\[\s*(['"`])([^'"`\n]+)\11\s*\])  # .name, ?.name, ['name']
+    )
+'''
+_input_regex_cache: Dict[Tuple[str, ...], re.Pattern] = {}
+
+def _input_token_regex(aliases: Tuple[str, ...] = ()) -> re.Pattern:
+    """Regex finding every request input access, for scan_expected_inputs.
+
+    It starts with a group of literal keywords (request roots, declaration
+    keywords, input aliases), so the engine only tries positions holding
+    one of their first letters; each keyword carries its own boundary check.
+    Compiled once per set of extra aliases.
+    """
+    regex = _input_regex_cache.get(aliases)
+    if regex is None:
+        keywords = [keyword for keyword in _DECLARATION_KEYWORDS]
+        keywords += [rf'{re.escape(root)}(?<![\w$]{re.escape(root)})'
+                     for root in ('request', 'req', 'ctx')]
+        keywords += [rf'{re.escape(alias)}(?<![\w$.]{re.escape(alias)})'
+                     for alias in sorted(set(_DEFAULT_INPUT_ALIASES) | set(aliases), key=len, reverse=True)]
+        # A comma continues a declaration: const { a } = req.body, { b } = req.query
+        regex = re.compile(r'((?:' + '|'.join(keywords) + r')\b|,)' + _INPUT_TOKEN_TAIL, re.VERBOSE)
+        _input_regex_cache[aliases] = regex
+    return regex
+
+def _input_object(root: str, sub: str, source: str) -> Optional[str]:
+    """What a request expression refers to: an input source, 'req', 'ctx' or None"""
+    if not source:
+        return 'ctx' if root == 'ctx' and not sub else 'req'
+    if root == 'ctx' and not sub and source == 'body':
+        # ctx.body is Koa's response body
+        return None
+    return 'req.' + source
+
+def _top_level_index(text: str, chars: str, pos: int = 0) -> int:
+    """Index of the first of chars from pos on, outside brackets and strings, or -1.
+
+    A closing bracket that ends the enclosing one is found too.
+    """
+    depth = 0
+    quote = None
+    length = len(text)
+    while pos < length:
+        char = text[pos]
+        if quote:
+            if char == '\\':
+                pos += 1
+            elif char == quote:
+                quote = None
+        elif char in '\'"`':
+            quote = char
+        elif char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+            if depth < 0:
+                return pos if char in chars else -1
+        elif depth == 0 and char in chars:
+            return pos
+        pos += 1
+    return -1
+
+_PROPERTY_KEY_RE = re.compile(r'''^(?:([A-Za-z_$][\w$]*)|(['"`])([^'"`]*)\2)$''')
+
+def _destructure(props: List[str], bound_to: str, found: Dict[str, Dict[str, None]],
+                 aliases: Dict[str, str]):
+    """Record what the properties of an object pattern take from bound_to.
+
+    From an input source the keys are input names (renamed or with defaults
+    alike; a nested pattern reads the field's members). From the request,
+    keys naming an input source recurse into a nested pattern or bind an
+    alias, which is added to aliases.
+    """
+    for prop in props:
+        prop = prop.strip()
+        if not prop or prop.startswith('...'):
+            continue
+        key = value = prop
+        if ':' in prop or '=' in prop:
+            separator = _top_level_index(prop, ':=')
+            if separator >= 0 and prop[separator] == ':':
+                key, value = prop[:separator].strip(), prop[separator + 1:].strip()
+                default = _top_level_index(value, '=')
+                if default >= 0:
+                    value = value[:default].strip()
+            elif separator >= 0:
+                key = value = prop[:separator].strip()
+
+        key_match = _PROPERTY_KEY_RE.match(key)
+        if not key_match:
+            # Computed key
+            continue
+        key = key_match.group(1) or key_match.group(3)
+
+        if bound_to in found:
+            found[bound_to][key] = None
+            continue
+        if bound_to == 'ctx' and key == 'request':
+            target = 'req'
+        elif key in ('body', 'params', 'query', 'headers') and not (bound_to == 'ctx' and key == 'body'):
+            target = 'req.' + key
+        else:
+            continue
+        if value.startswith('{') and value.endswith('}'):
+            _destructure(split_arguments(value[1:-1]), target, found, aliases)
+        elif target != 'req' and _IDENTIFIER_RE.match(value):
+            aliases[value] = target
+
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+def _scan_inputs(code: str, regex: re.Pattern) -> Tuple[Dict[str, Dict[str, None]], Dict[str, str]]:
+    """One pass of scan_expected_inputs: the names found and the aliases in effect at the end"""
+    found: Dict[str, Dict[str, None]] = {source: {} for source in INPUT_SOURCES}
+    aliases = dict(_DEFAULT_INPUT_ALIASES)
+
+    for (keyword, flat, pattern, alias, root, root_sub, root_source,
+         sub, source, name, _, key) in regex.findall(code):
+        if root:
+            target = _input_object(root, root_sub, root_source)
+            if target is None:
+                continue
+            if alias:
+                if target in found:
+                    aliases[alias] = target
+            elif flat:
+                _destructure(flat.split(','), target, found, aliases)
+            elif _top_level_index(pattern, '}', 1) == len(pattern) - 1:
+                _destructure(split_arguments(pattern[1:-1]), target, found, aliases)
+        elif keyword in _REQUEST_ROOTS:
+            if source and (name or key) and (keyword != 'ctx' or sub or source != 'body'):
+                found['req.' + source][name or key] = None
+        elif keyword in aliases:
+            # body.query: the first member is the input name
+            member = sub[1:] if sub else source or name or key
+            if member:
+                found[aliases[keyword]][member] = None
+
+    return found, aliases
+
+def scan_expected_inputs(code: str) -> Dict[str, Dict[str, None]]:
+    """Input names a handler reads, per source, in order of first use.
+
+    A single pass of one regex (see _input_token_regex) picks up direct
+    accesses on req, request and ctx, destructuring (nested, renamed, with
+    defaults) and identifiers bound to an input object. Names the handler
+    binds itself (const b = req.body) are only known once seen, so handlers
+    declaring any get a second pass that also looks for them. Returns an
+    insertion-ordered dict of names for each of INPUT_SOURCES.
+    """
+    if not any(keyword in code for keyword in ('req', 'ctx', 'body', 'params', 'query')):
+        # Substring searches are much cheaper than the regex on unrelated code
+        return {source: {} for source in INPUT_SOURCES}
+    found, aliases = _scan_inputs(code, _input_token_regex())
+    bound_here = tuple(sorted(alias for alias in aliases if alias not in _DEFAULT_INPUT_ALIASES))
+    if bound_here:
+        found, _ = _scan_inputs(code, _input_token_regex(bound_here))
+    return found
+
+def extract_expected_inputs_for_route(js_code: str, method: str, path: str,
+                                      handler_code: str = None,
+                                      timings: Dict[str, float] = None) -> Dict[str, List[str]]:
+    """Extract expected inputs for a specific route by analyzing the handler function.
+
+    extract_routes passes the already localized handler_code; when it is omitted
+    the route call is located in js_code first. timings works as in extract_routes.
+    """
+    if timings is not None:
+        start = time.perf_counter()
+
+    if handler_code is None:
+        handler_code = find_route_handler(js_code, method, path)
+
+        if not handler_code:
+            # Fallback: analyze the entire file for common patterns
+            handler_code = js_code
+
+        if timings is not None:
+            start = _lap(timings, 'handler_localization', start)
+
+    found = scan_expected_inputs(handler_code)
+
+    # Path parameters of the route itself come after the ones the handler reads
+    for name in path_params(path):
+        found['req.params'][name] = None
+
+    if timings is not None:
+        _lap(timings, 'inputs', start)
+
     # Remove empty categories
-    expected_inputs = {k: v for k, v in expected_inputs.items() if v}
-    
-    return expected_inputs
+    return {source: list(names) for source, names in found.items() if names}
 
 def extract_expected_inputs(js_code_block: str) -> Dict[str, List[str]]:
     """
@@ -159,121 +886,187 @@ def extract_expected_inputs(js_code_block: str) -> Dict[str, List[str]]:
     
     Returns:
         Dictionary with expected inputs categorized by source:
-        {'req.body': ['title', 'description'], 'req.params': ['id'], etc.}
+        {'req.body': ['description', 'title'], 'req.params': ['id'], etc.}
     """
-    expected_inputs = {
-        'req.body': set(),
-        'req.params': set(),
-        'req.query': set(),
-        'req.headers': set()
-    }
-    
-    # Patterns for different input sources
-    patterns = {
-        'req.body': [
-            r'req\.body\.(\w+)',
-            r'request\.body\.(\w+)',
-            r'ctx\.request\.body\.(\w+)',
-            r'const\s*{\s*([^}]+)\s*}\s*=\s*req\.body',
-            r'const\s*{\s*([^}]+)\s*}\s*=\s*request\.body'
-        ],
-        'req.params': [
-            r'req\.params\.(\w+)',
-            r'request\.params\.(\w+)',
-            r'ctx\.params\.(\w+)',
-            r':(\w+)(?=\s*[,\)])'  # Route parameters like :id
-        ],
-        'req.query': [
-            r'req\.query\.(\w+)',
-            r'request\.query\.(\w+)',
-            r'ctx\.query\.(\w+)'
-        ],
-        'req.headers': [
-            r'req\.headers\.(\w+)',
-            r'req\.headers\[[\'"`]([^\'"`]+)[\'"`]\]',
-            r'request\.headers\.(\w+)'
-        ]
-    }
-    
-    for input_type, pattern_list in patterns.items():
-        for pattern in pattern_list:
-            matches = re.findall(pattern, js_code_block, re.IGNORECASE)
-            for match in matches:
-                if ',' in str(match):
-                    # Handle destructuring: {title, description}
-                    fields = [field.strip() for field in str(match).replace('{', '').replace('}', '').split(',')]
-                    expected_inputs[input_type].update(fields)
-                else:
-                    expected_inputs[input_type].add(str(match).strip())
-    
-    # Convert sets to sorted lists and filter empty values
-    result = {}
-    for key, values in expected_inputs.items():
-        cleaned_values = [v for v in values if v and not v.isspace()]
-        if cleaned_values:
-            result[key] = sorted(list(set(cleaned_values)))
-    
-    return result
+    found = scan_expected_inputs(js_code_block)
+
+    # Route parameters like :id in path literals
+    for name in re.findall(r':(\w+)(?=\s*[,\)])', js_code_block):
+        found['req.params'][name] = None
+
+    return {source: sorted(names) for source, names in found.items() if names}
+
+# app.use( / router.use( and the shapes of their arguments
+_MIDDLEWARE_CALL_RE = re.compile(r'\b(app|router)\.use\s*(\()')
+_STRING_ARG_RE = re.compile(r'^([\'"`])([^\'"`]*)\1$')
+_MEMBER_NAME_RE = re.compile(r'^[A-Za-z_$][\w$]*(?:\s*\.\s*[A-Za-z_$][\w$]*)*$')
+_CALLEE_RE = re.compile(r'^([A-Za-z_$][\w$]*(?:\s*\.\s*[A-Za-z_$][\w$]*)*)\s*\(')
+_INLINE_FUNCTION_RE = re.compile(r'^(?:async\b\s*)?(?:function\b|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)')
+
+def split_arguments(args_code: str) -> List[str]:
+    """Split call arguments on top-level commas, respecting brackets and strings"""
+    args = []
+    depth = 0
+    quote = None
+    start = 0
+    pos = 0
+    while pos < len(args_code):
+        char = args_code[pos]
+        if quote:
+            if char == "\\":
+                pos += 1
+            elif char == quote:
+                quote = None
+        elif char in "'\"`":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            args.append(args_code[start:pos].strip())
+            start = pos + 1
+        pos += 1
+    tail = args_code[start:].strip()
+    if tail:
+        args.append(tail)
+    return args
+
+def mount_prefixes(arg: str) -> Optional[List[str]]:
+    """Prefixes of a use() path argument: a string literal or an array of them"""
+    if arg.startswith("[") and arg.endswith("]"):
+        items = split_arguments(arg[1:-1])
+        prefixes = [mount_prefixes(item) for item in items]
+        if items and all(prefix is not None and len(prefix) == 1 for prefix in prefixes):
+            return [prefix[0] for prefix in prefixes]
+        return None
+    literal = _STRING_ARG_RE.match(arg)
+    if literal and "${" not in literal.group(2):
+        return [literal.group(2)]
+    return None
+
+def middleware_names(arg: str) -> List[str]:
+    """Names for a use() handler argument.
 
-def analyze_middleware(js_code: str) -> List[Dict[str, Any]]:
-    """Analyze middleware usage in the code"""
+    Identifiers and member expressions are kept as written, calls become
+    their callee plus '()' (require('x') is kept whole), inline functions
+    are '<inline>' and arrays are flattened.
+    """
+    if arg.startswith("[") and arg.endswith("]"):
+        return [name for item in split_arguments(arg[1:-1]) for name in middleware_names(item)]
+    if _MEMBER_NAME_RE.match(arg):
+        return [_WHITESPACE_RE.sub('', arg)]
+    if _INLINE_FUNCTION_RE.match(arg):
+        return ['<inline>']
+    callee = _CALLEE_RE.match(arg)
+    if callee:
+        name = _WHITESPACE_RE.sub('', callee.group(1))
+        return [_WHITESPACE_RE.sub('', arg) if name == 'require' else name + '()']
+    return ['<expression>']
+
+def analyze_middleware(js_code: str, brackets: Dict[int, int] = None) -> List[Dict[str, Any]]:
+    """Middleware chains registered with app.use() / router.use(), in source order.
+
+    Each entry is {"path", "object", "chain"}: the mount path ("*" when the
+    chain applies to every path; one entry per path of an array), "app" or
+    "router", and the handler names in call order (see middleware_names).
+    brackets is the file's bracket map when the caller already built it.
+    """
     middleware = []
-    
-    middleware_patterns = [
-        r'app\.use\(\s*[\'"`]([^\'"`]*)[\'"`]\s*,\s*(\w+)',  # app.use('/path', middleware)
-        r'router\.use\(\s*[\'"`]([^\'"`]*)[\'"`]\s*,\s*(\w+)',  # router.use('/path', middleware)
-        r'app\.use\(\s*(\w+)\s*\)',  # app.use(middleware)
-        r'\.use\(\s*(\w+)\s*\)'  # .use(middleware)
-    ]
-    
-    for pattern in middleware_patterns:
-        matches = re.findall(pattern, js_code, re.IGNORECASE)
-        for match in matches:
-            if isinstance(match, tuple) and len(match) == 2:
-                path, name = match
-                middleware.append({"path": path, "name": name})
-            else:
-                middleware.append({"path": "*", "name": match})
-    
+    if '.use' not in js_code:
+        return middleware
+    if brackets is None:
+        brackets = build_bracket_map(js_code)
+
+    for match in _MIDDLEWARE_CALL_RE.finditer(js_code):
+        open_paren = match.start(2)
+        args = split_arguments(js_code[open_paren + 1:call_extent(js_code, open_paren, brackets)])
+        paths = ['*']
+        if args:
+            literal_paths = mount_prefixes(args[0])
+            if literal_paths is not None:
+                paths = literal_paths
+                args = args[1:]
+        chain = [name for arg in args for name in middleware_names(arg)]
+        if chain:
+            middleware.extend({"path": path, "object": match.group(1), "chain": chain}
+                              for path in paths)
+
     return middleware
 
-def get_route_statistics(routes: List[Dict[str, Any]]) -> Dict[str, Any]:
+def analyze_source(js_code: str, file_path: str = None,
+                   matchers: List[RouteMatcher] = None,
+                   timings: Dict[str, float] = None,
+                   deadline: float = None) -> Tuple[List[Route], List[Dict[str, Any]]]:
+    """Routes and middleware chains of a file in one pass over its source.
+
+    The bracket map is built once and shared by both. Arguments work as in
+    extract_routes, with middleware timed as its own family; on timeout the
+    ExtractionTimeout also carries the middleware.
+    """
+    brackets = None
+    middleware = []
+    if '.use' in js_code:
+        if timings is not None:
+            start = time.perf_counter()
+        brackets = build_bracket_map(js_code)
+        middleware = analyze_middleware(js_code, brackets)
+        if timings is not None:
+            _lap(timings, 'middleware', start)
+
+    try:
+        routes = extract_routes(js_code, file_path, matchers, timings, deadline, brackets)
+    except ExtractionTimeout as e:
+        e.middleware = middleware
+        raise
+    return routes, middleware
+
+class RouteStatistics:
+    """Route statistics aggregated as routes come in, file by file"""
+
+    def __init__(self):
+        self.total_routes = 0
+        self.methods: Dict[str, int] = {}
+        self.frameworks: Dict[str, int] = {}
+        self.files_with_routes = 0
+        self.routes_with_params = 0
+        self.routes_with_body_inputs = 0
+        self.routes_with_query_inputs = 0
+
+    def add(self, routes: List[Route]) -> "RouteStatistics":
+        """Count a batch of routes (typically one file's)"""
+        if not routes:
+            return self
+        self.total_routes += len(routes)
+        self.files_with_routes += len({route.file for route in routes if route.file})
+        methods = self.methods
+        frameworks = self.frameworks
+        for route in routes:
+            methods[route.method] = methods.get(route.method, 0) + 1
+            frameworks[route.framework] = frameworks.get(route.framework, 0) + 1
+            for source, _ in route.inputs:
+                if source == 'req.params':
+                    self.routes_with_params += 1
+                elif source == 'req.body':
+                    self.routes_with_body_inputs += 1
+                elif source == 'req.query':
+                    self.routes_with_query_inputs += 1
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The statistics in the layout of get_route_statistics"""
+        return {
+            'total_routes': self.total_routes,
+            'methods': dict(self.methods),
+            'frameworks': dict(self.frameworks),
+            'files_with_routes': self.files_with_routes,
+            'routes_with_params': self.routes_with_params,
+            'routes_with_body_inputs': self.routes_with_body_inputs,
+            'routes_with_query_inputs': self.routes_with_query_inputs,
+        }
+
+def get_route_statistics(routes: List[Route]) -> Dict[str, Any]:
     """Generate statistics about the extracted routes"""
     if not routes:
         return {}
-    
-    stats = {
-        'total_routes': len(routes),
-        'methods': {},
-        'frameworks': {},
-        'files_with_routes': set(),
-        'routes_with_params': 0,
-        'routes_with_body_inputs': 0,
-        'routes_with_query_inputs': 0
-    }
-    
-    for route in routes:
-        # Count methods
-        method = route.get('method', 'UNKNOWN')
-        stats['methods'][method] = stats['methods'].get(method, 0) + 1
-        
-        # Count frameworks
-        framework = route.get('framework', 'unknown')
-        stats['frameworks'][framework] = stats['frameworks'].get(framework, 0) + 1
-        
-        # Track files
-        if route.get('file'):
-            stats['files_with_routes'].add(route['file'])
-        
-        # Analyze expected inputs
-        expected_inputs = route.get('expected_inputs', {})
-        if expected_inputs.get('req.params'):
-            stats['routes_with_params'] += 1
-        if expected_inputs.get('req.body'):
-            stats['routes_with_body_inputs'] += 1
-        if expected_inputs.get('req.query'):
-            stats['routes_with_query_inputs'] += 1
-    
-    stats['files_with_routes'] = len(stats['files_with_routes'])
-    
-    return stats
\ No newline at end of file
+    return RouteStatistics().add(routes).to_dict()
@@ -0,0 +1,81 @@
+import heapq
+from typing import List, Dict, Any, Tuple
+
+# Upper bounds (exclusive) of the histogram buckets; the last bucket is open-ended
+TIME_BUCKETS: List[Tuple[float, str]] = [
+    (0.001, "<1ms"),
+    (0.01, "1-10ms"),
+    (0.1, "10-100ms"),
+    (1.0, "100ms-1s"),
+]
+SIZE_BUCKETS: List[Tuple[int, str]] = [
+    (1024, "<1KB"),
+    (10 * 1024, "1-10KB"),
+    (100 * 1024, "10-100KB"),
+    (1024 * 1024, "100KB-1MB"),
+]
+
+
+def bucket(value: float, buckets: List[Tuple[float, str]], overflow: str) -> str:
+    """Name of the histogram bucket a value falls into"""
+    for bound, label in buckets:
+        if value < bound:
+            return label
+    return overflow
+
+
+class ScanProfiler:
+    """Aggregate per-file and per-pattern-family timings during a scan.
+
+    Everything is accumulated incrementally: histograms are counters and the
+    slowest files are kept in a bounded heap, so memory does not grow with the
+    number of files scanned.
+    """
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.files = 0
+        self.total_seconds = 0.0
+        self.total_bytes = 0
+        self.families: Dict[str, float] = {}
+        self.time_histogram = {label: 0 for _, label in TIME_BUCKETS}
+        self.time_histogram[">=1s"] = 0
+        self.size_histogram = {label: 0 for _, label in SIZE_BUCKETS}
+        self.size_histogram[">=1MB"] = 0
+        self.slowest: List[Tuple[float, str, int, int]] = []
+
+    def record(self, relative_path: str, file_profile: Dict[str, Any], routes: int):
+        """Add one parsed file (see scanner.parse_file for file_profile)"""
+        seconds = file_profile["seconds"]
+        size = file_profile["bytes"]
+
+        self.files += 1
+        self.total_seconds += seconds
+        self.total_bytes += size
+        for family, family_seconds in file_profile["families"].items():
+            self.families[family] = self.families.get(family, 0.0) + family_seconds
+
+        self.time_histogram[bucket(seconds, TIME_BUCKETS, ">=1s")] += 1
+        self.size_histogram[bucket(size, SIZE_BUCKETS, ">=1MB")] += 1
+
+        entry = (seconds, relative_path, size, routes)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, entry)
+        elif self.top and entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def to_stats(self) -> Dict[str, Any]:
+        """Profile section for the scan stats"""
+        return {
+            "files_profiled": self.files,
+            "total_seconds": round(self.total_seconds, 6),
+            "total_bytes": self.total_bytes,
+            "pattern_families": {family: round(seconds, 6)
+                                 for family, seconds in sorted(self.families.items())},
+            "file_time_histogram": self.time_histogram,
+            "file_size_histogram": self.size_histogram,
+            "slowest_files": [
+                {"file": path, "seconds": round(seconds, 6), "bytes": size, "routes": routes}
+                for seconds, path, size, routes in sorted(self.slowest, reverse=True)
+            ],
+        }
@@ -0,0 +1,341 @@
+import os
+import json
+import sqlite3
+import hashlib
+from itertools import groupby
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from .parser.route_extractor import Route
+
+# Bump when the table layout changes; older catalogs are rebuilt
+CATALOG_VERSION = 1
+
+# Routes written per transaction
+CATALOG_BATCH_ROUTES = 5000
+
+# routes.seq is the file's position times this plus the route's index in the file
+FILE_ROUTE_SLOTS = 1 << 20
+
+_TABLES = ("files", "routes", "inputs", "middleware", "scan_stats")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    package TEXT NOT NULL DEFAULT '',
+    position INTEGER NOT NULL,
+    route_count INTEGER NOT NULL,
+    signature TEXT NOT NULL,
+    UNIQUE (path, package)
+);
+CREATE INDEX IF NOT EXISTS files_position ON files (position);
+
+CREATE TABLE IF NOT EXISTS routes (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    seq INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    framework TEXT NOT NULL,
+    inputs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS routes_file ON routes (file_id);
+CREATE INDEX IF NOT EXISTS routes_seq ON routes (seq);
+CREATE INDEX IF NOT EXISTS routes_method ON routes (method, seq);
+CREATE INDEX IF NOT EXISTS routes_path ON routes (path);
+
+CREATE TABLE IF NOT EXISTS inputs (
+    route_id INTEGER NOT NULL REFERENCES routes (id),
+    source TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS inputs_name ON inputs (name, route_id);
+CREATE INDEX IF NOT EXISTS inputs_route ON inputs (route_id);
+
+CREATE TABLE IF NOT EXISTS middleware (
+    position INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    package TEXT NOT NULL DEFAULT '',
+    path TEXT NOT NULL,
+    object TEXT NOT NULL,
+    chain TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS scan_stats (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def route_row(route: Route) -> Tuple[str, str, str, str]:
+    """(method, path, framework, inputs as JSON): the routes columns taken from a Route"""
+    return (route.method, route.path, route.framework,
+            json.dumps([[source, list(names)] for source, names in route.inputs],
+                       ensure_ascii=False, separators=(",", ":")))
+
+
+def file_signature(rows: List[Tuple[str, str, str, str]]) -> str:
+    """Hash of the route_row()s of a file"""
+    data = "\n".join("\0".join(row) for row in rows)
+    return hashlib.sha1(data.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _prefix_end(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class RouteCatalog:
+    """Scan results in an indexed SQLite database.
+
+    Tables: files (one row per file declaring routes, with its walk order
+    position and a signature of its routes), routes, inputs (one row per
+    expected input name, for filtering), middleware and scan_stats (one JSON
+    value per stats key). write() syncs the catalog with a scan: files whose
+    routes are unchanged are left alone, so rewriting a catalog after a scan
+    that changed a few files only touches their rows. routes() pages through
+    the catalog with indexed filters, in scan order.
+    """
+
+    def __init__(self, db_path: str, readonly: bool = False):
+        self.db_path = db_path
+        try:
+            if readonly:
+                from urllib.request import pathname2url
+                uri = f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro"
+                self.connection = sqlite3.connect(uri, uri=True)
+            else:
+                self.connection = sqlite3.connect(db_path)
+            self._prepare(readonly)
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Cannot open route catalog {db_path}: {e}") from None
+
+    def _prepare(self, readonly: bool):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if readonly:
+            if version != CATALOG_VERSION:
+                raise sqlite3.DatabaseError(f"not a route catalog (version {version})")
+            return
+
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        if version not in (0, CATALOG_VERSION):
+            with self.connection:
+                for table in _TABLES:
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "RouteCatalog":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, routes: Iterable[Route], stats: Dict[str, Any] = None,
+              middleware: List[Dict[str, Any]] = None) -> int:
+        """Make the catalog hold exactly these routes; returns how many there are.
+
+        routes are consumed as they come (a file's routes must be adjacent,
+        as scans produce them) and written CATALOG_BATCH_ROUTES at a time,
+        one transaction per batch. Files missing from routes are removed.
+        stats and middleware replace the stored ones once routes are
+        exhausted, so a streaming scan's final stats are recorded.
+        """
+        db = self.connection
+        existing = {(path, package): (file_id, position, signature)
+                    for file_id, path, package, position, signature
+                    in db.execute("SELECT id, path, package, position, signature FROM files")}
+        next_file_id = db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM files").fetchone()[0]
+        next_route_id = db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM routes").fetchone()[0]
+
+        batch = _WriteBatch()
+        # (file id, seq of the file's first route, routes written so far) per file
+        written: Dict[Tuple[str, str], Tuple[int, int, int]] = {}
+        total = 0
+        position = 0
+        for key, group in groupby(routes, key=lambda route: (route.file or "", route.package or "")):
+            file_routes = list(group)
+            rows = [route_row(route) for route in file_routes]
+            total += len(file_routes)
+            if key in written:
+                # The file came up again: its routes continue where they stopped
+                file_id, base, first = written[key]
+                batch.file_updates.append((None, first + len(file_routes), "", file_id))
+            else:
+                signature = file_signature(rows)
+                known = existing.pop(key, None)
+                file_position = position
+                position += 1
+                base = file_position * FILE_ROUTE_SLOTS
+                first = 0
+                if known is not None and known[2] == signature:
+                    if known[1] != file_position:
+                        batch.file_updates.append((file_position, None, None, known[0]))
+                        batch.moves.append((base, FILE_ROUTE_SLOTS, known[0]))
+                    written[key] = (known[0], base, len(file_routes))
+                    continue
+                if known is not None:
+                    file_id = known[0]
+                    batch.file_deletes.append((file_id,))
+                    batch.file_updates.append((file_position, len(file_routes), signature, file_id))
+                else:
+                    file_id = next_file_id
+                    next_file_id += 1
+                    batch.file_inserts.append((file_id, key[0], key[1], file_position,
+                                               len(file_routes), signature))
+            written[key] = (file_id, base, first + len(file_routes))
+
+            for offset, (route, row) in enumerate(zip(file_routes, rows), base + first):
+                batch.routes.append((next_route_id, file_id, offset) + row)
+                batch.inputs.extend((next_route_id, source, name)
+                                    for source, names in route.inputs for name in names)
+                next_route_id += 1
+            if len(batch.routes) >= CATALOG_BATCH_ROUTES:
+                batch.flush(db)
+
+        # Files that no longer declare routes
+        batch.file_deletes.extend((file_id,) for file_id, _, _ in existing.values())
+        batch.file_removals.extend((file_id,) for file_id, _, _ in existing.values())
+        with db:
+            batch.flush(db, commit=False)
+            db.execute("DELETE FROM scan_stats")
+            db.executemany("INSERT INTO scan_stats (key, value) VALUES (?, ?)",
+                           [(key, json.dumps(value, ensure_ascii=False))
+                            for key, value in (stats or {}).items()])
+            db.execute("DELETE FROM middleware")
+            db.executemany("INSERT INTO middleware (position, file, package, path, object, chain) "
+                           "VALUES (?, ?, ?, ?, ?, ?)",
+                           [(index, entry["file"], entry.get("package") or "", entry["path"],
+                             entry["object"], json.dumps(entry["chain"], ensure_ascii=False))
+                            for index, entry in enumerate(middleware or ())])
+        return total
+
+    def _where(self, method: str = None, path_prefix: str = None, file: str = None,
+               input_name: str = None, package: str = None) -> Tuple[str, List[Any]]:
+        clauses, args = [], []
+        if method:
+            clauses.append("r.method = ?")
+            args.append(method.upper())
+        if path_prefix:
+            # A range rather than LIKE, so the path index is used
+            clauses.append("r.path >= ? AND r.path < ?")
+            args += [path_prefix, _prefix_end(path_prefix)]
+        if file is not None:
+            clauses.append("r.file_id IN (SELECT id FROM files WHERE path = ?)")
+            args.append(file)
+        if package is not None:
+            clauses.append("r.file_id IN (SELECT id FROM files WHERE package = ?)")
+            args.append(package)
+        if input_name:
+            clauses.append("r.id IN (SELECT route_id FROM inputs WHERE name = ?)")
+            args.append(input_name)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def routes(self, method: str = None, path_prefix: str = None, file: str = None,
+               input_name: str = None, package: str = None,
+               limit: Optional[int] = None, offset: int = 0) -> List[Route]:
+        """Routes matching every given filter, in scan order, limit at a time from offset.
+
+        method is matched case-insensitively (ALL only matches routes declared
+        for all methods), path_prefix against the start of the route path,
+        file against the project-relative path and input_name against any
+        expected input.
+        """
+        where, args = self._where(method, path_prefix, file, input_name, package)
+        query = ("SELECT f.path, f.package, r.method, r.path, r.framework, r.inputs "
+                 "FROM routes r JOIN files f ON f.id = r.file_id" + where +
+                 " ORDER BY r.seq")
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            args += [limit, offset]
+        elif offset:
+            query += " LIMIT -1 OFFSET ?"
+            args.append(offset)
+
+        found = []
+        for file_path, package, method_name, path, framework, inputs in self.connection.execute(query, args):
+            route = Route.from_list(file_path or None, [method_name, path, framework, json.loads(inputs)])
+            route.package = package or None
+            found.append(route)
+        return found
+
+    def count(self, method: str = None, path_prefix: str = None, file: str = None,
+              input_name: str = None, package: str = None) -> int:
+        """Number of routes matching the filters (see routes)"""
+        where, args = self._where(method, path_prefix, file, input_name, package)
+        return self.connection.execute("SELECT COUNT(*) FROM routes r" + where, args).fetchone()[0]
+
+    def files(self) -> List[Dict[str, Any]]:
+        """Files declaring routes, in scan order: {"file", "routes"} plus "package" if tagged"""
+        found = []
+        for path, package, route_count in self.connection.execute(
+                "SELECT path, package, route_count FROM files ORDER BY position"):
+            entry = {"file": path, "routes": route_count}
+            if package:
+                entry["package"] = package
+            found.append(entry)
+        return found
+
+    def middleware(self) -> List[Dict[str, Any]]:
+        """Middleware chains stored with the last write"""
+        found = []
+        for file_path, package, path, obj, chain in self.connection.execute(
+                "SELECT file, package, path, object, chain FROM middleware ORDER BY position"):
+            entry = {"file": file_path}
+            if package:
+                entry["package"] = package
+            entry.update({"path": path, "object": obj, "chain": json.loads(chain)})
+            found.append(entry)
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        """Scan statistics stored with the last write"""
+        return {key: json.loads(value)
+                for key, value in self.connection.execute("SELECT key, value FROM scan_stats")}
+
+
+class _WriteBatch:
+    """Row changes collected by RouteCatalog.write until the next transaction"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        # (file id,): routes and inputs to delete before new ones are inserted
+        self.file_deletes: List[Tuple[int]] = []
+        # (file id,): file rows to delete
+        self.file_removals: List[Tuple[int]] = []
+        self.file_inserts: List[Tuple[Any, ...]] = []
+        # (position, route count, signature, file id); None keeps a column
+        self.file_updates: List[Tuple[Any, ...]] = []
+        # (new seq base, FILE_ROUTE_SLOTS, file id) for unchanged files that moved
+        self.moves: List[Tuple[int, int, int]] = []
+        self.routes: List[Tuple[Any, ...]] = []
+        self.inputs: List[Tuple[int, str, str]] = []
+
+    def flush(self, db: sqlite3.Connection, commit: bool = True):
+        """Apply the collected changes, in a transaction of their own unless commit is False"""
+        if commit:
+            with db:
+                self.flush(db, commit=False)
+            return
+
+        db.executemany("DELETE FROM inputs WHERE route_id IN "
+                       "(SELECT id FROM routes WHERE file_id = ?)", self.file_deletes)
+        db.executemany("DELETE FROM routes WHERE file_id = ?", self.file_deletes)
+        db.executemany("DELETE FROM files WHERE id = ?", self.file_removals)
+        db.executemany("INSERT INTO files (id, path, package, position, route_count, signature) "
+                       "VALUES (?, ?, ?, ?, ?, ?)", self.file_inserts)
+        db.executemany("UPDATE files SET position = COALESCE(?, position), "
+                       "route_count = COALESCE(?, route_count), signature = COALESCE(?, signature) "
+                       "WHERE id = ?", self.file_updates)
+        db.executemany("UPDATE routes SET seq = ? + seq % ? WHERE file_id = ?", self.moves)
+        db.executemany("INSERT INTO routes (id, file_id, seq, method, path, framework, inputs) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?)", self.routes)
+        db.executemany("INSERT INTO inputs (route_id, source, name) VALUES (?, ?, ?)", self.inputs)
+        self.clear()
@@ -0,0 +1,305 @@
+import json
+from typing import List, Dict, Any, Optional, Tuple
+
+from .parser.route_extractor import Route
+from .cache import gc_paused
+
+# Segment kinds, in match priority order
+STATIC, PARAM, WILDCARD = 0, 1, 2
+
+# First bytes of every SQLite database file (route catalogs, see route_catalog)
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+
+def split_path(path: str) -> List[str]:
+    """Split a route path or URL into segments, ignoring empty ones and any query string"""
+    path = path.split("?", 1)[0].split("#", 1)[0]
+    return [segment for segment in path.split("/") if segment]
+
+
+def segment_kind(segment: str) -> int:
+    """Classify a route pattern segment"""
+    if segment.startswith(":"):
+        return PARAM
+    if "*" in segment:
+        return WILDCARD
+    return STATIC
+
+
+def normalized_pattern(path: str) -> str:
+    """Pattern with parameter names erased, so /users/:id and /users/:userId compare equal"""
+    parts = []
+    for segment in split_path(path):
+        kind = segment_kind(segment)
+        parts.append(":" if kind == PARAM else "*" if kind == WILDCARD else segment)
+    return "/" + "/".join(parts)
+
+
+class TrieNode:
+    """One path segment position in the route trie"""
+
+    __slots__ = ("static", "param", "wildcard", "routes")
+
+    def __init__(self):
+        self.static: Dict[str, "TrieNode"] = {}
+        self.param: Optional["TrieNode"] = None
+        self.wildcard: Optional["TrieNode"] = None
+        # method -> indexes of the routes ending here
+        self.routes: Dict[str, List[int]] = {}
+
+
+class RouteIndex:
+    """Path trie over scanned routes.
+
+    Static segments, ':param' segments and wildcards ('*' anywhere in a
+    segment, matching the rest of the URL) each get their own branch, so
+    resolving a URL touches one node per segment plus the param/wildcard
+    alternatives. Routes with method ALL match every method.
+    """
+
+    def __init__(self, routes: List[Route] = None):
+        self.routes: List[Route] = []
+        self.methods: Dict[str, int] = {}
+        self.root = TrieNode()
+        with gc_paused():
+            for route in routes or []:
+                self.add(route)
+
+    def add(self, route: Route):
+        """Insert one route"""
+        node = self.root
+        path = route.path
+        if "?" in path or "#" in path:
+            path = path.split("?", 1)[0].split("#", 1)[0]
+
+        # Inlined segment_kind: this loop dominates index build time
+        for segment in path.split("/"):
+            if not segment:
+                continue
+            if segment[0] == ":":
+                child = node.param
+                if child is None:
+                    child = node.param = TrieNode()
+            elif "*" in segment:
+                child = node.wildcard
+                if child is None:
+                    child = node.wildcard = TrieNode()
+                node = child
+                break
+            else:
+                child = node.static.get(segment)
+                if child is None:
+                    child = node.static[segment] = TrieNode()
+            node = child
+
+        method = route.method.upper()
+        indexes = node.routes.get(method)
+        if indexes is None:
+            indexes = node.routes[method] = []
+        indexes.append(len(self.routes))
+        self.methods[method] = self.methods.get(method, 0) + 1
+        self.routes.append(route)
+
+    @classmethod
+    def load(cls, source_path: str) -> "RouteIndex":
+        """Build an index from scan output (JSON document or NDJSON lines)"""
+        with gc_paused():
+            return cls(load_routes(source_path))
+
+    def _candidates(self, node: TrieNode, methods: Tuple[str, ...]) -> List[int]:
+        found = []
+        for method in methods:
+            found.extend(node.routes.get(method, ()))
+        return found
+
+    def match(self, method: str, url: str) -> List[Dict[str, Any]]:
+        """All routes matching a request, most specific first.
+
+        Each match is {"route": ..., "params": {...}}; static segments beat
+        parameters, which beat wildcards, then declaration order decides.
+        """
+        method = method.upper() if method else None
+        methods = tuple(self.methods) if method in (None, "*", "ANY") else (method, "ALL")
+        segments = split_path(url)
+        matches = []
+
+        # Depth-first in priority order: static, then param, then wildcard
+        stack = [(self.root, 0, (), ())]
+        while stack:
+            node, depth, rank, bound = stack.pop()
+            if depth == len(segments):
+                for index in sorted(self._candidates(node, methods)):
+                    matches.append((rank, index, bound))
+                if node.wildcard is not None:
+                    for index in sorted(self._candidates(node.wildcard, methods)):
+                        matches.append((rank + (WILDCARD,), index, bound + (("*", ""),)))
+                continue
+
+            segment = segments[depth]
+            if node.wildcard is not None:
+                rest = "/".join(segments[depth:])
+                for index in sorted(self._candidates(node.wildcard, methods)):
+                    matches.append((rank + (WILDCARD,), index, bound + (("*", rest),)))
+            if node.param is not None:
+                stack.append((node.param, depth + 1, rank + (PARAM,), bound + ((depth, segment),)))
+            child = node.static.get(segment)
+            if child is not None:
+                stack.append((child, depth + 1, rank + (STATIC,), bound))
+
+        matches.sort(key=lambda item: (item[0], item[1]))
+        return [{"route": self.routes[index], "params": self._bind(self.routes[index], bound)}
+                for _, index, bound in matches]
+
+    def resolve(self, request: str) -> Optional[Dict[str, Any]]:
+        """Resolve 'GET /users/42' (or just '/users/42') to the best matching route"""
+        method, url = parse_request(request)
+        matches = self.match(method, url)
+        return matches[0] if matches else None
+
+    @staticmethod
+    def _bind(route: Route, bound: Tuple[Tuple[Any, str], ...]) -> Dict[str, str]:
+        """Name the captured URL segments using the route's own parameter names"""
+        segments = split_path(route.path)
+        params = {}
+        for position, value in bound:
+            if position == "*":
+                params["*"] = value
+            elif position < len(segments):
+                params[segments[position][1:].rstrip("?")] = value
+        return params
+
+    def conflicts(self) -> List[Dict[str, Any]]:
+        """Pairs of routes that can answer the same request.
+
+        kind is "duplicate" when the patterns are identical (parameter names
+        aside) and "overlap" when they differ but share some URLs, e.g.
+        /users/:id and /users/me. For overlaps "general" is the position (0 or
+        1) of the less specific route, the one that shadows the other when it
+        is registered first.
+        """
+        conflicts = []
+        seen = set()
+        for index, route in enumerate(self.routes):
+            for other in self._overlapping(index):
+                pair = (min(index, other), max(index, other))
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                first, second = self.routes[pair[0]], self.routes[pair[1]]
+                same = normalized_pattern(first.path) == normalized_pattern(second.path)
+                entry = {
+                    "kind": "duplicate" if same else "overlap",
+                    "method": first.method if first.method == second.method else
+                              f"{first.method}/{second.method}",
+                    "routes": [first, second],
+                }
+                if not same:
+                    entry["general"] = self._more_general(first, second)
+                conflicts.append(entry)
+        return conflicts
+
+    def _overlapping(self, index: int) -> List[int]:
+        """Indexes of other routes whose patterns share at least one URL with a route"""
+        route = self.routes[index]
+        method = route.method.upper()
+        methods = tuple(self.methods) if method == "ALL" else (method, "ALL")
+        segments = split_path(route.path)
+        found = []
+
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if node.wildcard is not None:
+                found.extend(self._candidates(node.wildcard, methods))
+            if depth == len(segments):
+                found.extend(self._candidates(node, methods))
+                continue
+
+            kind = segment_kind(segments[depth])
+            if kind == WILDCARD:
+                # The route's wildcard swallows everything below this node
+                found.extend(self._subtree(node, methods))
+                continue
+            if node.param is not None:
+                stack.append((node.param, depth + 1))
+            if kind == STATIC:
+                child = node.static.get(segments[depth])
+                if child is not None:
+                    stack.append((child, depth + 1))
+            else:
+                for child in node.static.values():
+                    stack.append((child, depth + 1))
+
+        return [other for other in dict.fromkeys(found) if other != index]
+
+    def _subtree(self, node: TrieNode, methods: Tuple[str, ...]) -> List[int]:
+        found = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            found.extend(self._candidates(current, methods))
+            stack.extend(current.static.values())
+            if current.param is not None:
+                stack.append(current.param)
+            if current.wildcard is not None:
+                stack.append(current.wildcard)
+        return found
+
+    @staticmethod
+    def _more_general(first: Route, second: Route) -> int:
+        """Position of the less specific pattern (wildcards, then params, count against it)"""
+        def weight(route):
+            kinds = [segment_kind(segment) for segment in split_path(route.path)]
+            return (kinds.count(WILDCARD), kinds.count(PARAM), -len(kinds))
+        return 0 if weight(first) >= weight(second) else 1
+
+
+def parse_request(request: str) -> Tuple[Optional[str], str]:
+    """Split 'GET /users/42' into (method, url); a bare URL has no method"""
+    parts = request.strip().split(None, 1)
+    if len(parts) == 2 and not parts[0].startswith("/"):
+        return parts[0].upper(), parts[1]
+    return None, request.strip()
+
+
+def is_catalog_file(path: str) -> bool:
+    """Whether a file is an SQLite database, as written by --format sqlite"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def load_routes(source_path: str) -> List[Route]:
+    """Read routes from scan output: a {"routes": [...]} document, NDJSON lines or a route catalog"""
+    if is_catalog_file(source_path):
+        # Imported here: sqlite3 is only needed for catalogs
+        from .route_catalog import RouteCatalog
+        with RouteCatalog(source_path, readonly=True) as catalog:
+            return catalog.routes()
+
+    with open(source_path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    try:
+        document = json.loads(text)
+    except ValueError:
+        document = None
+
+    if isinstance(document, dict):
+        if "routes" in document:
+            return [Route.from_dict(route) for route in document["routes"]]
+        # NDJSON holding a single record
+        return [Route.from_dict(document)] if "method" in document and "path" in document else []
+    if isinstance(document, list):
+        return [Route.from_dict(route) for route in document]
+
+    routes = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "method" in record and "path" in record:
+            routes.append(Route.from_dict(record))
+    return routes
@@ -1,12 +1,29 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# Onedir by default, and that is the layout that ships:
+# dist/scan-win-onedir/scan-win sits next to its libraries, so it starts
+# without unpacking itself to a temp dir on every launch (the onefile
+# bootloader's fixed cost; on a 1-CPU Linux box a warm launch took about
+# 105 ms onedir against 450 ms onefile). SCAN_ONEFILE=1 builds the single-file
+# dist/scan-win instead; the two names differ so both builds can sit in
+# dist/ side by side. lib/python-runner.js tries the onedir build first.
+ONEFILE = os.environ.get('SCAN_ONEFILE') == '1'
+
+# scan.py imports the `scan` package, which lives in the repository root;
+# from this directory alone `scan` would name scan.py itself
+ROOT_DIR = os.path.dirname(SPECPATH)
+
+# Imported on demand (see cli.py, scan/__init__.py), so not found by analysis
+LAZY_MODULES = ['server', 'watcher', 'incremental', 'module_graph', 'route_index',
+                'route_catalog', 'benchmark', 'profiling']
 
 a = Analysis(
     ['scan.py'],
-    pathex=[],
+    pathex=[ROOT_DIR],
     binaries=[],
-    datas=[('parser/*.py', 'parser')],
-    hiddenimports=[],
+    datas=[],
+    hiddenimports=['scan.' + name for name in LAZY_MODULES],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -19,9 +36,9 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
+    *((a.binaries, a.datas) if ONEFILE else ()),
     [],
+    exclude_binaries=not ONEFILE,
     name='scan-win',
     debug=False,
     bootloader_ignore_signals=False,
@@ -36,3 +53,14 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+if not ONEFILE:
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        name='scan-win-onedir',
+    )
@@ -0,0 +1,748 @@
+import os
+import sys
+import json
+import mmap
+import time
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Union
+
+from .parser.route_extractor import (analyze_source, register_matcher_specs, route_marker_regex,
+                                    ExtractionTimeout, Route, RouteStatistics, ROUTE_MATCHERS,
+                                    INPUT_MEMO, DEFAULT_INPUT_MEMO_SIZE)
+from .cache import (ScanCache, decode_source, content_hash, input_memo_path, load_input_memo,
+                    save_input_memo)
+from .profiling import ScanProfiler
+from .walker import ProjectWalker, WalkOptions, DEFAULT_EXTENSIONS
+from .module_graph import ModuleGraph, graph_cache_path, mount_routes, mount_middleware
+
+# Files handed to a worker process at a time
+PARALLEL_BATCH_SIZE = 64
+
+# Files at least this large are memory-mapped for the route-marker prefilter
+MMAP_THRESHOLD = 256 * 1024
+
+DEFAULT_MAX_FILE_BYTES = 5 * 1024 * 1024
+DEFAULT_FILE_TIMEOUT = 10.0
+
+# Minified/generated file heuristics, applied to the first MINIFIED_SAMPLE_BYTES
+MINIFIED_SAMPLE_BYTES = 64 * 1024
+MINIFIED_MIN_BYTES = 2048
+MINIFIED_AVG_LINE_LENGTH = 300
+MINIFIED_WHITESPACE_RATIO = 0.05
+GENERATED_NAME_MARKERS = (".min.", ".bundle.", "-bundle.", ".chunk.")
+
+
+def is_valid_js_file(file_path: str, extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS) -> bool :
+    """Check if file is a valid JavaScript file to scan."""
+    return file_path.endswith(extensions)
+
+
+def read_file_bytes(file_path: str) -> bytes:
+    """Read raw file contents"""
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+class ScanLimits:
+    """Budgets keeping pathological files from stalling a scan.
+
+    max_file_bytes: larger files are skipped (None or 0: no limit)
+    file_timeout: seconds of route extraction per file; a file running over
+        keeps the routes found so far and is reported as timed out
+    time_budget: seconds for the whole scan; files not parsed in time are
+        skipped, cache hits are still returned
+    skip_minified: skip files that look minified or generated
+
+    Timeouts are checked between routes, so a single match is never cut short.
+    """
+
+    def __init__(self, max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES,
+                 file_timeout: Optional[float] = DEFAULT_FILE_TIMEOUT,
+                 time_budget: Optional[float] = None, skip_minified: bool = True):
+        self.max_file_bytes = max_file_bytes or None
+        self.file_timeout = file_timeout or None
+        self.time_budget = time_budget or None
+        self.skip_minified = skip_minified
+
+
+def generated_name(relative_path: str) -> bool:
+    """Whether a file name marks it as build output (app.min.js, vendor.bundle.js)"""
+    name = os.path.basename(relative_path)
+    return any(marker in name for marker in GENERATED_NAME_MARKERS)
+
+
+def minified_reason(relative_path: str, raw: bytes) -> Optional[str]:
+    """Why a file looks minified or generated, or None if it looks hand-written"""
+    if generated_name(relative_path):
+        return "generated file name"
+    if len(raw) < MINIFIED_MIN_BYTES:
+        return None
+
+    sample = raw[:MINIFIED_SAMPLE_BYTES]
+    lines = sample.count(b"\n") + 1
+    average = len(sample) // lines
+    if average > MINIFIED_AVG_LINE_LENGTH:
+        return f"minified (average line length {average})"
+
+    whitespace = sum(sample.count(char) for char in (b" ", b"\t", b"\n"))
+    if whitespace / len(sample) < MINIFIED_WHITESPACE_RATIO:
+        return f"minified (whitespace ratio {whitespace / len(sample):.3f})"
+    return None
+
+
+class FileResult:
+    """Outcome of parsing one file"""
+
+    def __init__(self, routes: List[Route] = None, digest: str = None,
+                 error: str = None, skipped: bool = False, skip_reason: str = None,
+                 timed_out: bool = False, middleware: List[Dict[str, Any]] = None):
+        self.routes = routes
+        # app.use()/router.use() chains found in the same pass (see analyze_middleware)
+        self.middleware = middleware or []
+        self.digest = digest
+        self.error = error
+        # True when the prefilter found no route marker and the file was not parsed
+        self.skipped = skipped
+        # Set when a ScanLimits rule kept the file from being parsed
+        self.skip_reason = skip_reason
+        # True when extraction ran out of time; routes are the ones found before
+        self.timed_out = timed_out
+        # Filled by parse_file when profiling: seconds, bytes, families
+        self.profile: Optional[Dict[str, Any]] = None
+        # INPUT_MEMO (hits, misses, evictions) while parsing, set by parse_file
+        self.memo_counts: Optional[Tuple[int, int, int]] = None
+        # A worker process's memo lookups while parsing, replayed by the parent
+        # in place of memo_counts (see parse_batch)
+        self.memo_log: Optional[List[Tuple[str, Any]]] = None
+
+
+def read_prefiltered(file_path: str, marker_regex=None,
+                     max_bytes: int = None) -> Tuple[Optional[bytes], Optional[str], int]:
+    """Read a file for parsing, checking the raw bytes for route markers first.
+
+    Large files are memory-mapped so a file without markers is only hashed,
+    never copied into memory. Returns (raw bytes, None, size) for files to
+    parse, (None, content hash, size) for files the prefilter rules out and
+    (None, None, size) for files over max_bytes, which are not read at all.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if max_bytes is not None and size > max_bytes:
+            return None, None, size
+        if marker_regex is not None and size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if not marker_regex.search(mapped):
+                    return None, content_hash(mapped), size
+                return mapped[:], None, size
+
+        raw = f.read()
+
+    if marker_regex is not None and not marker_regex.search(raw):
+        return None, content_hash(raw), len(raw)
+    return raw, None, len(raw)
+
+
+def parse_file(file_path: str, relative_path: str, raw: bytes = None,
+               profile: bool = False, prefilter: bool = True,
+               limits: ScanLimits = None, budget_deadline: float = None) -> FileResult:
+    """Extract routes and middleware chains from a single file, reading it once.
+
+    With prefilter, files whose bytes contain no route marker of any
+    registered matcher are hashed but not decoded or parsed. With profile,
+    the result carries the file's wall time (read included), size and
+    per-pattern-family timings. limits (see ScanLimits) may skip the file or
+    cut extraction short; budget_deadline is the time.time() at which the
+    overall scan budget runs out.
+    """
+    start = time.perf_counter() if profile else 0.0
+    marker_regex = route_marker_regex() if prefilter else None
+    max_bytes = limits.max_file_bytes if limits is not None else None
+
+    if raw is None:
+        raw, digest, size = read_prefiltered(file_path, marker_regex, max_bytes)
+    else:
+        digest, size = None, len(raw)
+        if max_bytes is not None and size > max_bytes:
+            raw = None
+        elif marker_regex is not None and not marker_regex.search(raw):
+            raw, digest = None, content_hash(raw)
+
+    families = {} if profile else None
+    if raw is None and digest is None:
+        result = FileResult(skip_reason=f"larger than {max_bytes} bytes ({size} bytes)")
+    elif raw is None:
+        result = FileResult([], digest, skipped=True)
+    else:
+        reason = None
+        if limits is not None and limits.skip_minified:
+            reason = minified_reason(relative_path, raw)
+        if reason is not None:
+            result = FileResult(skip_reason=reason)
+        else:
+            deadline = budget_deadline
+            if limits is not None and limits.file_timeout is not None:
+                file_deadline = time.time() + limits.file_timeout
+                deadline = file_deadline if deadline is None else min(deadline, file_deadline)
+            memo_before = INPUT_MEMO.counters()
+            try:
+                routes, middleware = analyze_source(decode_source(raw), relative_path,
+                                                    timings=families, deadline=deadline)
+                result = FileResult(routes, content_hash(raw), middleware=middleware)
+            except ExtractionTimeout as e:
+                result = FileResult(e.routes, content_hash(raw), timed_out=True,
+                                    middleware=e.middleware)
+            result.memo_counts = tuple(after - before for after, before
+                                       in zip(INPUT_MEMO.counters(), memo_before))
+
+    if profile:
+        result.profile = {"seconds": time.perf_counter() - start, "bytes": size,
+                          "families": families}
+    return result
+
+
+def parse_candidate(file_path: str, relative_path: str, raw: bytes = None,
+                    profile: bool = False, prefilter: bool = True,
+                    limits: ScanLimits = None, budget_deadline: float = None) -> FileResult:
+    """parse_file, reporting read errors in the result instead of raising.
+
+    Once budget_deadline has passed the file is skipped without being read.
+    """
+    if budget_deadline is not None and time.time() > budget_deadline:
+        return FileResult(skip_reason="scan time budget exhausted")
+    try:
+        return parse_file(file_path, relative_path, raw, profile, prefilter, limits, budget_deadline)
+    except Exception as e:
+        return FileResult(error=f"Error reading {relative_path}: {str(e)}")
+
+
+def parse_batch(batch: List[Tuple[str, str]], profile: bool = False,
+                prefilter: bool = True, limits: ScanLimits = None,
+                budget_deadline: float = None) -> List[FileResult]:
+    """Parse a batch of files in a worker process, returning results in batch order.
+
+    Each result carries the input memo lookups its file made, so the parent
+    process can keep (and persist) what the workers learned and count memo
+    use the same whatever the number of workers.
+    """
+    results = []
+    for file_path, relative_path in batch:
+        result = parse_candidate(file_path, relative_path, profile=profile, prefilter=prefilter,
+                                 limits=limits, budget_deadline=budget_deadline)
+        result.memo_log = INPUT_MEMO.take_log()
+        results.append(result)
+    return results
+
+
+def init_worker(matcher_specs: List[Dict[str, Any]], memo_capacity: int,
+                memo_entries: List[Tuple[str, Any]]):
+    """Worker process set-up: the parent's extra matchers and a copy of its input memo"""
+    register_matcher_specs(matcher_specs)
+    INPUT_MEMO.clear()
+    INPUT_MEMO.resize(memo_capacity)
+    for key, inputs in memo_entries:
+        INPUT_MEMO.put(key, inputs)
+    INPUT_MEMO.log = []
+
+
+def record_memo_use(memo_stats: Dict[str, int], result: FileResult):
+    """Add a parsed file's input memo counters to memo_stats.
+
+    Lookups made in a worker are replayed on INPUT_MEMO and counted there,
+    so the stats describe the parent's memo, not the workers' copies.
+    """
+    counts = result.memo_counts
+    if result.memo_log is not None:
+        before = INPUT_MEMO.counters()
+        INPUT_MEMO.replay(result.memo_log)
+        counts = tuple(after - previous for after, previous in zip(INPUT_MEMO.counters(), before))
+        result.memo_log = None
+    if counts is not None:
+        for name, count in zip(("hits", "misses", "evictions"), counts):
+            memo_stats[name] += count
+
+
+def open_input_memo(cache_path: Optional[str], capacity: int) -> Optional[str]:
+    """Size INPUT_MEMO for a scan and, if it is empty, load the copy saved next to the cache.
+
+    The copy is read on the memo's first miss (see InputMemo.loader), so a
+    scan answered entirely from the scan cache never opens it. Returns the
+    path to save the memo to afterwards (see save_input_memo), or None when
+    the memo is disabled or not persisted.
+    """
+    INPUT_MEMO.resize(capacity)
+    INPUT_MEMO.loader = None
+    if capacity <= 0 or not cache_path:
+        return None
+    memo_path = input_memo_path(cache_path)
+    if not INPUT_MEMO.entries:
+        INPUT_MEMO.loader = partial(load_input_memo, INPUT_MEMO, memo_path)
+    return memo_path
+
+
+def input_memo_stats(memo_stats: Dict[str, int]) -> Dict[str, int]:
+    """stats["input_memo"]: the scan's counters plus the memo's size"""
+    return dict(memo_stats, entries=len(INPUT_MEMO.entries), capacity=INPUT_MEMO.capacity)
+
+
+def default_jobs() -> int:
+    """Default number of worker processes (one per CPU)"""
+    return os.cpu_count() or 1
+
+
+def collect_files(project_path: str, walk_options: WalkOptions = None) -> List[Tuple[str, str]]:
+    """Walk the project and return (absolute path, relative path) for files to scan"""
+    return list(ProjectWalker(project_path, walk_options).walk())
+
+
+def resolve_entry_points(project_path: str, entry_points: List[str]) -> List[str]:
+    """Absolute paths of entry files given relative to the project (or the cwd)"""
+    resolved = []
+    for entry in entry_points:
+        candidates = [os.path.join(project_path, entry), os.path.abspath(entry)]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                resolved.append(os.path.normpath(candidate))
+                break
+        else:
+            raise FileNotFoundError(f"Entry point does not exist: {entry}")
+    return resolved
+
+
+def iter_parsed(candidates: List[Tuple[str, str]], pending: List[int],
+                preread: Dict[int, bytes], jobs: int,
+                matcher_specs: List[Dict[str, Any]] = None,
+                profile: bool = False, prefilter: bool = True,
+                limits: ScanLimits = None, budget_deadline: float = None) -> Iterator[FileResult]:
+    """Yield a FileResult for each pending candidate, in order.
+
+    With jobs > 1 batches are parsed in a process pool; executor.map hands the
+    results back in submission order as soon as each batch is done.
+    """
+    # Parsing a handful of files is cheaper than starting a pool
+    workers = min(jobs, max(1, len(pending) // PARALLEL_BATCH_SIZE))
+
+    if workers <= 1:
+        for index in pending:
+            file_path, relative_path = candidates[index]
+            yield parse_candidate(file_path, relative_path, preread.pop(index, None),
+                                  profile, prefilter, limits, budget_deadline)
+        return
+
+    # Imported here: multiprocessing alone costs more than starting a small serial scan
+    from concurrent.futures import ProcessPoolExecutor
+
+    work = [[candidates[index] for index in pending[i:i + PARALLEL_BATCH_SIZE]]
+            for i in range(0, len(pending), PARALLEL_BATCH_SIZE)]
+    # Workers start from a copy of the memo, so it has to be loaded first
+    INPUT_MEMO.load_pending()
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=init_worker,
+                             initargs=(matcher_specs or [], INPUT_MEMO.capacity,
+                                       list(INPUT_MEMO.entries.items()))) as executor:
+        worker = partial(parse_batch, profile=profile, prefilter=prefilter,
+                         limits=limits, budget_deadline=budget_deadline)
+        results = executor.map(worker, work)
+        try:
+            for batch_result in results:
+                yield from batch_result
+        finally:
+            # A consumer that stops early cancels the batches not started yet
+            results.close()
+
+
+def project_package(root: str) -> str:
+    """Package a project root is tagged with: its package.json name, else the directory name"""
+    try:
+        with open(os.path.join(root, "package.json"), "r", encoding="utf-8") as f:
+            name = json.load(f).get("name")
+        if isinstance(name, str) and name:
+            return name
+    except (OSError, ValueError, AttributeError):
+        pass
+    return os.path.basename(root)
+
+
+def root_cache_paths(cache_path: Union[str, List[str], None], roots: List[str]) -> List[Optional[str]]:
+    """One scan cache path per root.
+
+    A list gives each root its own path; a single path is used as is for one
+    root and, for several, turned into one file per root next to it.
+    """
+    if isinstance(cache_path, list):
+        if len(cache_path) != len(roots):
+            raise ValueError("Expected one cache path per project root")
+        return cache_path
+    if not cache_path or len(roots) == 1:
+        return [cache_path] * len(roots)
+    base, ext = os.path.splitext(cache_path)
+    return [f"{base}-{content_hash(root.encode('utf-8'))[:12]}{ext or '.json'}" for root in roots]
+
+
+def find_duplicates(candidates: List[Tuple[str, str]], pending: List[int],
+                    file_stats: Dict[int, os.stat_result], preread: Dict[int, bytes],
+                    limits: ScanLimits = None, budget_deadline: float = None,
+                    keep_bytes: bool = True) -> Dict[int, int]:
+    """Map each pending candidate whose contents repeat an earlier one to that earlier index.
+
+    Only files sharing their size with another pending file are hashed, and
+    none that limits would keep from being parsed (too large, generated
+    name); hashing stops once budget_deadline has passed. The key also holds
+    what parsing reads from the path: the generated-name check and, when
+    some matcher derives routes from file names, the relative path itself.
+    With keep_bytes, files read here are left in preread for parsing.
+    """
+    max_bytes = limits.max_file_bytes if limits is not None else None
+    skip_generated = limits is not None and limits.skip_minified
+    by_size: Dict[int, List[int]] = {}
+    for index in pending:
+        st = file_stats.get(index)
+        if st is None:
+            try:
+                st = file_stats[index] = os.stat(candidates[index][0])
+            except OSError:
+                # Reported when the file is parsed
+                continue
+        if max_bytes is not None and st.st_size > max_bytes:
+            continue
+        if skip_generated and generated_name(candidates[index][1]):
+            continue
+        by_size.setdefault(st.st_size, []).append(index)
+
+    path_dependent = any(matcher.path_from_file for matcher in ROUTE_MATCHERS)
+    copies: Dict[int, int] = {}
+    for indexes in by_size.values():
+        if len(indexes) < 2:
+            continue
+        if budget_deadline is not None and time.time() > budget_deadline:
+            break
+        first_seen: Dict[Tuple[str, Any], int] = {}
+        for index in indexes:
+            file_path, relative_path = candidates[index]
+            raw = preread.get(index)
+            if raw is None:
+                try:
+                    raw = read_file_bytes(file_path)
+                except OSError:
+                    continue
+            key = (content_hash(raw), relative_path if path_dependent else generated_name(relative_path))
+            primary = first_seen.setdefault(key, index)
+            if primary != index:
+                copies[index] = primary
+                preread.pop(index, None)
+            elif keep_bytes:
+                preread[index] = raw
+    return copies
+
+
+def copy_result(result: FileResult, relative_path: str) -> FileResult:
+    """The result of a file, for another file with the same contents"""
+    routes = result.routes
+    if routes:
+        routes = [route.with_file(relative_path) for route in routes]
+    return FileResult(routes, result.digest, result.error, result.skipped, result.skip_reason,
+                      result.timed_out, result.middleware)
+
+
+def iter_scan(project_path: Union[str, List[str]], stats: Dict[str, Any], verbose: bool = False,
+              cache_path: Union[str, List[str]] = None, jobs: int = 1,
+              matcher_specs: List[Dict[str, Any]] = None,
+              cache: ScanCache = None,
+              profiler: ScanProfiler = None,
+              prefilter: bool = True,
+              walk_options: WalkOptions = None,
+              entry_points: List[str] = None,
+              limits: ScanLimits = None,
+              middleware: List[Dict[str, Any]] = None,
+              input_memo_size: int = DEFAULT_INPUT_MEMO_SIZE) -> Iterator[Tuple[str, List[Route]]]:
+    """Scan a project, yielding (relative path, routes) per file in walk order.
+
+    Files are yielded as soon as they are parsed, so callers can stream output
+    without holding every route. stats is filled in as the scan goes
+    (scanned_files, prefilter_skipped, deduplicated_files, skipped_files,
+    timed_out_files, errors and, with a cache, cache_hits/cache_misses) and
+    is complete once the generator is exhausted; route_statistics (see
+    get_route_statistics) is counted file by file and added at the end, as
+    is input_memo (hits, misses, evictions, entries, capacity).
+    With a profiler, parsed files are timed and its report is added to stats
+    as "profile". With entry_points, stats also gets "reachable_modules".
+    A middleware list receives each file's middleware chains, tagged with
+    the file, as the file is yielded. See scan_project for the other options.
+    """
+    stats["scanned_files"] = 0
+    stats["prefilter_skipped"] = 0
+    stats["deduplicated_files"] = 0
+    stats["skipped_files"] = skipped_files = []
+    stats["timed_out_files"] = timed_out_files = []
+    stats["errors"] = errors = []
+
+    if limits is None:
+        limits = ScanLimits()
+    budget_deadline = time.time() + limits.time_budget if limits.time_budget else None
+
+    roots = []
+    for root in ([project_path] if isinstance(project_path, str) else project_path):
+        if verbose :
+            print(f"Scanning project at: {root}", file=sys.stderr)
+
+        # os.path rather than pathlib: pathlib is slow to import and this is all it was used for
+        root = os.path.realpath(root)
+
+        if not os.path.exists(root):
+            raise FileNotFoundError(f"Project path does not exist: {root}")
+        
+        if not os.path.isdir(root):
+            raise NotADirectoryError(f"Path is not a directory: {root}")
+        roots.append(root)
+
+    if not roots:
+        raise ValueError("No project path given")
+    if cache is not None and len(roots) > 1:
+        raise ValueError("A cache object can only be used to scan a single project")
+
+    if matcher_specs:
+        register_matcher_specs(matcher_specs)
+
+    cache_paths = root_cache_paths(cache_path, roots)
+    if cache is not None:
+        caches = [cache]
+    else:
+        caches = [ScanCache(path).load() if path else None for path in cache_paths]
+    for root_cache in caches:
+        if root_cache is not None:
+            root_cache.begin_scan()
+    memo_path = open_input_memo(caches[0].cache_path if caches[0] is not None else None,
+                                input_memo_size)
+    memo_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    # Routes are tagged with their package only when there is more than one
+    packages = [sys.intern(project_package(root)) for root in roots] if len(roots) > 1 else [None]
+
+    candidates: List[Tuple[str, str]] = []
+    root_of: List[int] = []
+    mounts: Optional[List[List[str]]] = [] if entry_points else None
+    for root_index, root in enumerate(roots):
+        if entry_points:
+            graph_path = cache_paths[root_index]
+            graph = ModuleGraph(root, graph_cache_path(graph_path) if graph_path else None, verbose)
+            root_candidates, prefixes = graph.walk(resolve_entry_points(root, entry_points))
+            stats["reachable_modules"] = stats.get("reachable_modules", 0) + len(root_candidates)
+            errors.extend(graph.errors)
+            mounts.extend(prefixes[relative_path] for _, relative_path in root_candidates)
+        else:
+            root_candidates = collect_files(root, walk_options)
+        candidates.extend(root_candidates)
+        root_of.extend([root_index] * len(root_candidates))
+
+    # Resolve cache hits up front (stat only); everything else is parsed lazily
+    hits: Dict[int, List[Route]] = {}
+    lookup_errors: Dict[int, str] = {}
+    preread: Dict[int, bytes] = {}
+    file_stats = {}
+    pending = []
+
+    for index, (file_path, relative_path) in enumerate(candidates):
+        root_cache = caches[root_of[index]]
+        if root_cache is None:
+            pending.append(index)
+            continue
+        try:
+            st = os.stat(file_path)
+            file_stats[index] = st
+            file_routes, raw = root_cache.lookup(
+                relative_path, st, lambda: read_file_bytes(file_path))
+        except Exception as e:
+            lookup_errors[index] = f"Error reading {relative_path}: {str(e)}"
+            continue
+
+        if file_routes is not None:
+            hits[index] = file_routes
+        else:
+            if raw is not None and jobs <= 1:
+                # Already holding the bytes: no need to read them again
+                preread[index] = raw
+            pending.append(index)
+
+    # Identical files (vendored copies, within or across roots) are parsed once
+    copies = find_duplicates(candidates, pending, file_stats, preread,
+                             limits, budget_deadline, keep_bytes=jobs <= 1)
+    if copies:
+        pending = [index for index in pending if index not in copies]
+    shared: Dict[int, FileResult] = {}
+    primaries = set(copies.values())
+
+    parsed = iter_parsed(candidates, pending, preread, jobs, matcher_specs,
+                         profiler is not None, prefilter, limits, budget_deadline)
+    route_statistics = RouteStatistics()
+
+    for index, (file_path, relative_path) in enumerate(candidates):
+        if verbose:
+            print(f"Reading file: {file_path}", file=sys.stderr)
+
+        root_index = root_of[index]
+        file_middleware = None
+        if index in hits:
+            file_routes, error = hits.pop(index), None
+            if middleware is not None:
+                file_middleware = caches[root_index].middleware(relative_path)
+        elif index in lookup_errors:
+            file_routes, error = None, lookup_errors.pop(index)
+        else:
+            if index in copies:
+                result = copy_result(shared[copies[index]], relative_path)
+                stats["deduplicated_files"] += 1
+            else:
+                result = next(parsed)
+                record_memo_use(memo_stats, result)
+                if index in primaries:
+                    shared[index] = result
+            file_routes, error, file_middleware = result.routes, result.error, result.middleware
+            if result.skip_reason is not None:
+                skipped_files.append({"file": relative_path, "reason": result.skip_reason})
+                if verbose:
+                    print(f"Skipped {relative_path}: {result.skip_reason}", file=sys.stderr)
+                continue
+            if error is None:
+                if result.skipped:
+                    stats["prefilter_skipped"] += 1
+                if result.timed_out:
+                    # Partial routes are returned but never cached
+                    timed_out_files.append(relative_path)
+                    if verbose:
+                        print(f"Timed out: {relative_path} (kept {len(file_routes)} route(s))",
+                              file=sys.stderr)
+                elif caches[root_index] is not None:
+                    caches[root_index].store(relative_path, file_stats[index], result.digest,
+                                             file_routes, file_middleware)
+                if result.profile is not None:
+                    profiler.record(relative_path, result.profile, len(file_routes))
+
+        if error is not None:
+            errors.append(error)
+            if verbose:
+                print(error, file=sys.stderr)
+            continue
+
+        if mounts is not None:
+            file_routes = mount_routes(file_routes, mounts[index])
+
+        package = packages[root_index]
+        if package is not None:
+            for route in file_routes:
+                route.package = package
+
+        if middleware is not None and file_middleware:
+            if mounts is not None:
+                file_middleware = mount_middleware(file_middleware, mounts[index])
+            tag = {"file": relative_path}
+            if package is not None:
+                tag["package"] = package
+            middleware.extend(dict(tag, **entry) for entry in file_middleware)
+        route_statistics.add(file_routes)
+
+        if verbose:
+            print(f"Found {len(file_routes)} route(s) in {file_path}", file=sys.stderr)
+            for route in file_routes:
+                print(f"  -> {route.method} {route.path} ({route.framework})", file=sys.stderr)
+
+        stats["scanned_files"] += 1
+        yield relative_path, file_routes
+
+    stats["route_statistics"] = route_statistics.to_dict()
+    if profiler is not None:
+        stats["profile"] = profiler.to_stats()
+    if input_memo_size > 0:
+        stats["input_memo"] = input_memo_stats(memo_stats)
+        if memo_path is not None and memo_stats["misses"]:
+            try:
+                save_input_memo(INPUT_MEMO, memo_path)
+            except OSError as e:
+                errors.append(f"Error writing input memo {memo_path}: {str(e)}")
+
+    if any(root_cache is not None for root_cache in caches):
+        stats["cache_hits"] = sum(root_cache.hits for root_cache in caches if root_cache is not None)
+        stats["cache_misses"] = sum(root_cache.misses for root_cache in caches if root_cache is not None)
+        for root_cache in caches:
+            if root_cache is None:
+                continue
+            try:
+                root_cache.save()
+            except OSError as e:
+                errors.append(f"Error writing cache {root_cache.cache_path}: {str(e)}")
+
+
+def scan_project(project_path: Union[str, List[str]], verbose: bool = False,
+                 cache_path: Union[str, List[str]] = None, jobs: int = 1,
+                 matcher_specs: List[Dict[str, Any]] = None,
+                 cache: ScanCache = None, profile: bool = False,
+                 profile_top: int = 10, prefilter: bool = True,
+                 walk_options: WalkOptions = None,
+                 entry_points: List[str] = None,
+                 limits: ScanLimits = None,
+                 middleware: List[Dict[str, Any]] = None,
+                 input_memo_size: int = DEFAULT_INPUT_MEMO_SIZE) -> Tuple[List[Route], Dict[str, Any]]:
+    """Scan project for routes and return structured data.
+
+    With jobs > 1 files that miss the cache are parsed in a process pool; results
+    are merged back in walk order so the output matches a serial run.
+    matcher_specs are extra route matchers (see load_matcher_specs) registered
+    here and in every worker process. A long-lived caller can pass its own
+    cache instead of cache_path to keep entries in memory between scans.
+    With profile, per-file and per-pattern-family timings of the parsed files
+    (cache hits are not parsed) go into stats["profile"], including the
+    profile_top slowest files. prefilter skips decoding and parsing files
+    whose raw bytes contain no route marker (counted in prefilter_skipped).
+    walk_options selects extensions, exclude/include globs and .gitignore use.
+    entry_points (files relative to the project) switch from walking the tree
+    to scanning only modules reachable through require/import, with the
+    app.use() mount prefixes composed onto their route paths; the module
+    graph is cached next to the scan cache. limits (default ScanLimits())
+    bounds file sizes and parse time and skips minified files; what it left
+    out is listed in stats["skipped_files"] and stats["timed_out_files"].
+
+    project_path may be a list of roots (e.g. the services of a monorepo),
+    scanned as one: each keeps its own relative paths and scan cache
+    (cache_path is then one path per root, or a single path from which
+    per-root files are derived), and routes are tagged with their root's
+    package (see project_package). Files with identical contents, in any
+    root, are parsed once and their routes reused (stats["deduplicated_files"]).
+
+    Each file is read and analyzed once for routes and, in the same pass, its
+    app.use()/router.use() middleware chains, which are appended to the
+    middleware list when one is passed ({"file", "path", "object", "chain"},
+    plus "package" as for routes). stats["route_statistics"] is aggregated
+    per file as the scan goes rather than from the final route list.
+
+    Expected inputs are memoized by handler source and path params (see
+    InputMemo), so identical or merely reformatted handlers are analyzed
+    once; input_memo_size bounds the memo (0 disables it). With a scan
+    cache the memo is also saved next to it and reused by later scans.
+    Its counters go into stats["input_memo"].
+    """
+    routes = []
+    stats: Dict[str, Any] = {}
+    profiler = ScanProfiler(profile_top) if profile else None
+
+    for _, file_routes in iter_scan(project_path, stats, verbose, cache_path, jobs,
+                                    matcher_specs, cache, profiler, prefilter,
+                                    walk_options, entry_points, limits, middleware,
+                                    input_memo_size):
+        routes.extend(file_routes)
+
+    if verbose:
+        print_scan_summary(stats, len(routes))
+
+    return routes, stats
+
+
+def print_scan_summary(stats: Dict[str, Any], route_count: int):
+    """Verbose end-of-scan report on stderr"""
+    print(f"\nScan complete:", file=sys.stderr)
+    print(f"  Files scanned: {stats['scanned_files']}", file=sys.stderr)
+    print(f"  Routes found: {route_count}", file=sys.stderr)
+    print(f"  Errors: {len(stats['errors'])}", file=sys.stderr)
+    if "cache_hits" in stats:
+        print(f"  Cache hits: {stats['cache_hits']}, misses: {stats['cache_misses']}", file=sys.stderr)
+    if "input_memo" in stats:
+        memo = stats["input_memo"]
+        print(f"  Input memo hits: {memo['hits']}, misses: {memo['misses']}, "
+              f"evictions: {memo['evictions']}", file=sys.stderr)
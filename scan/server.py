@@ -0,0 +1,202 @@
+import sys
+import os
+import json
+from pathlib import Path
+from typing import List, Dict, Any, Optional, TextIO
+
+from .parser.route_extractor import json_default
+from .cache import ScanCache, default_cache_path
+from .scanner import scan_project, ScanLimits
+from .walker import WalkOptions
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SCAN_ERROR = -32000
+
+
+class RpcError(Exception):
+    """Error reported back to the client as a JSON-RPC error object"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class ProjectState:
+    """In-memory scan results and file cache for one project"""
+
+    def __init__(self, project_path: str, cache_path: Optional[str]):
+        self.project_path = project_path
+        self.cache = ScanCache(cache_path).load()
+        self.routes = None
+        self.stats = None
+        self.middleware = None
+
+
+class ScannerServer:
+    """Long-lived scanner answering newline-delimited JSON-RPC requests.
+
+    Each request and response is a single JSON object on its own line.
+    Methods:
+      scan       {project_path?, stats?, middleware?} - incremental scan, only changed files are re-parsed
+      rescan     {project_path?, stats?, middleware?} - drop in-memory results and re-parse every file
+      get_routes {project_path?, stats?, middleware?} - last results without touching the disk
+
+    project_path defaults to the project given on the command line, then to
+    the last project requested.
+      ping / shutdown
+    """
+
+    def __init__(self, default_project: str = None, use_disk_cache: bool = True,
+                 jobs: int = 1, verbose: bool = False,
+                 matcher_specs: List[Dict[str, Any]] = None,
+                 walk_options: WalkOptions = None,
+                 limits: ScanLimits = None):
+        self.default_project = default_project
+        self.walk_options = walk_options
+        self.limits = limits
+        self.matcher_specs = matcher_specs
+        self.use_disk_cache = use_disk_cache
+        self.jobs = jobs
+        self.verbose = verbose
+        self.projects: Dict[str, ProjectState] = {}
+        self.last_project = None
+        self.running = True
+
+    def project(self, params: Dict[str, Any]) -> ProjectState:
+        """Get (or create) the state for the project named in the request"""
+        project_path = params.get("project_path") or self.default_project or self.last_project
+        if not project_path or not isinstance(project_path, str):
+            raise RpcError(INVALID_PARAMS, "project_path is required")
+
+        key = str(Path(project_path).resolve())
+        state = self.projects.get(key)
+        if state is None:
+            if not os.path.isdir(key):
+                raise RpcError(INVALID_PARAMS, f"project_path is not a directory: {project_path}")
+            cache_path = default_cache_path(project_path) if self.use_disk_cache else None
+            state = ProjectState(key, cache_path)
+            self.projects[key] = state
+        self.last_project = key
+        return state
+
+    def run_scan(self, state: ProjectState):
+        """Scan a project, reusing the in-memory file cache"""
+        middleware = []
+        try:
+            state.routes, state.stats = scan_project(state.project_path, self.verbose,
+                                                     jobs=self.jobs,
+                                                     matcher_specs=self.matcher_specs,
+                                                     cache=state.cache,
+                                                     walk_options=self.walk_options,
+                                                     limits=self.limits,
+                                                     middleware=middleware)
+        except (FileNotFoundError, NotADirectoryError) as e:
+            raise RpcError(SCAN_ERROR, str(e))
+        state.middleware = middleware
+
+    def result(self, state: ProjectState, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the response payload in the same shape as the CLI JSON output"""
+        result = {"routes": state.routes}
+        if params.get("middleware"):
+            result["middleware"] = state.middleware
+        if params.get("stats") and state.stats:
+            result["stats"] = state.stats
+        return result
+
+    def rpc_scan(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Incrementally scan a project and return its routes"""
+        state = self.project(params)
+        self.run_scan(state)
+        return self.result(state, params)
+
+    def rpc_rescan(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Forget cached files and re-parse the whole project"""
+        state = self.project(params)
+        state.cache.entries = {}
+        state.cache.dirty = True
+        self.run_scan(state)
+        return self.result(state, params)
+
+    def rpc_get_routes(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the last scan results, scanning only if there are none"""
+        state = self.project(params)
+        if state.routes is None:
+            self.run_scan(state)
+        return self.result(state, params)
+
+    def rpc_ping(self, params: Dict[str, Any]) -> str:
+        """Liveness check"""
+        return "pong"
+
+    def rpc_shutdown(self, params: Dict[str, Any]) -> bool:
+        """Stop serving after this request"""
+        self.running = False
+        return True
+
+    def handle(self, line: str) -> Optional[Dict[str, Any]]:
+        """Handle one request line and return the response (None for notifications)"""
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                raise RpcError(PARSE_ERROR, f"Invalid JSON: {e}")
+
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise RpcError(INVALID_REQUEST, "Request must be an object with a method")
+
+            request_id = request.get("id")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+
+            handler = getattr(self, f"rpc_{request['method']}", None)
+            if handler is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+
+            result = handler(params)
+            if "id" not in request:
+                return None
+            return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+        except RpcError as e:
+            error = {"code": e.code, "message": e.message}
+        except Exception as e:
+            error = {"code": SCAN_ERROR, "message": f"Unexpected error: {e}"}
+
+        return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+    def serve(self, stdin: TextIO = None, stdout: TextIO = None):
+        """Answer requests until shutdown or end of input"""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+
+        if self.default_project:
+            # Warm up so the first request is answered from memory
+            try:
+                self.run_scan(self.project({}))
+            except RpcError as e:
+                print(f"Initial scan failed: {e.message}", file=sys.stderr)
+
+        for line in stdin:
+            if not line.strip():
+                continue
+            response = self.handle(line)
+            if response is not None:
+                stdout.write(json.dumps(response, ensure_ascii=False, separators=(",", ":"),
+                                        default=json_default))
+                stdout.write("\n")
+                stdout.flush()
+            if not self.running:
+                break
+
+        for state in self.projects.values():
+            try:
+                state.cache.save()
+            except OSError as e:
+                print(f"Error writing cache {state.cache.cache_path}: {e}", file=sys.stderr)
@@ -0,0 +1,89 @@
+import sys
+import time
+import builtins
+from typing import List, Dict, Optional
+
+# Installed by the entry point when --startup-profile is on the command line
+_active: Optional["StartupProfiler"] = None
+
+
+class StartupProfiler:
+    """Times first-time imports until the scanner is ready (like -X importtime).
+
+    builtins.__import__ is wrapped, so every module imported for the first
+    time gets its own (self) and cumulative (including nested imports) time.
+    Submodules pulled in through `from package import module` are counted
+    in the importing statement. CPU time used before install() approximates
+    the interpreter's own start-up.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.interpreter_cpu = time.process_time()
+        self.imports: Dict[str, List[float]] = {}
+        self.import_seconds = 0.0
+        self.marks: List[tuple] = []
+        self._stack: List[List[float]] = []
+        self._original = None
+
+    def install(self) -> "StartupProfiler":
+        global _active
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        _active = self
+        return self
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        full_name = name
+        if level and globals:
+            package = globals.get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            full_name = f"{base}.{name}" if name else base
+        if full_name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        self._stack.append([0.0])
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()[0]
+            if self._stack:
+                self._stack[-1][0] += elapsed
+            else:
+                self.import_seconds += elapsed
+            self.imports[full_name] = [elapsed - nested, elapsed]
+
+    def mark(self, label: str):
+        """Record the time since the entry point started"""
+        self.marks.append((label, time.perf_counter() - self.started))
+
+    def report(self, top: int = 15) -> str:
+        """Render the profile as text"""
+        lines = ["Startup profile:",
+                 f"  Interpreter start-up (CPU before entry): {self.interpreter_cpu * 1000:.1f} ms",
+                 f"  Imports: {len(self.imports)} module(s), {self.import_seconds * 1000:.1f} ms"]
+        lines.extend(f"  {label}: {seconds * 1000:.1f} ms after entry" for label, seconds in self.marks)
+        lines.append("  Slowest imports (self / cumulative ms):")
+        slowest = sorted(self.imports.items(), key=lambda item: -item[1][0])[:top]
+        lines.extend(f"    {own * 1000:7.2f} / {cumulative * 1000:7.2f}  {name}"
+                     for name, (own, cumulative) in slowest)
+        return "\n".join(lines)
+
+
+def active() -> Optional[StartupProfiler]:
+    """The profiler installed by the entry point, if any"""
+    return _active
+
+
+def install_if_requested(argv: List[str]) -> Optional[StartupProfiler]:
+    """Start profiling when --startup-profile is among the arguments"""
+    if "--startup-profile" in argv:
+        return StartupProfiler().install()
+    return None
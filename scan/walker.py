@@ -0,0 +1,313 @@
+import os
+import re
+from typing import List, Tuple, Iterator, Optional, Iterable
+
+DEFAULT_EXTENSIONS = (".js",)
+
+# Directories never worth descending into, on top of any .gitignore rules
+IGNORE_DIRS = {
+    'node_modules', '__pycache__', '.git', '.next', 'dist',
+    'build', 'coverage', '.nyc_output', 'logs', 'tmp', 'temp'
+}
+
+
+def should_ignore_directory(dir_name: str) -> bool:
+    """Check if directory should be ignored."""
+    return dir_name in IGNORE_DIRS or dir_name.startswith('.')
+
+
+def glob_to_regex(glob: str) -> str:
+    """Translate a gitignore-style glob body (no leading/trailing '/') to a regex"""
+    parts = []
+    i = 0
+    length = len(glob)
+    while i < length:
+        char = glob[i]
+        if glob.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("/**", i) and i + 3 == length:
+            parts.append("/.*")
+            i += 3
+        elif glob.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = glob.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+                i += 1
+            else:
+                body = glob[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+        elif char == "\\" and i + 1 < length:
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return "".join(parts)
+
+
+def compile_rule(pattern: str, base: str = "") -> Optional[Tuple[str, bool, bool]]:
+    """Compile one gitignore line into (regex on root-relative posix path, negate, dir_only).
+
+    base is the posix directory (relative to the scan root) holding the
+    .gitignore; None is returned for blank lines and comments.
+    """
+    pattern = pattern.rstrip("\n\r")
+    if not pattern.strip() or pattern.startswith("#"):
+        return None
+
+    # Trailing spaces are ignored unless escaped
+    while pattern.endswith(" ") and not pattern.endswith("\\ "):
+        pattern = pattern[:-1]
+
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    elif pattern.startswith("\\!") or pattern.startswith("\\#"):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    # A slash anywhere but at the end anchors the pattern to the .gitignore's directory
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    prefix = re.escape(base + "/") if base else ""
+    body = glob_to_regex(pattern)
+    if anchored or pattern.startswith("**/"):
+        regex = f"{prefix}{body}"
+    else:
+        regex = f"{prefix}(?:.*/)?{body}"
+    return regex, negate, dir_only
+
+
+class PathMatcher:
+    """Ordered gitignore-style rules compiled into combined regexes.
+
+    Without negations a path is checked with a single regex match. With
+    negations, a combined regex still rejects most paths up front and the
+    individual rules are evaluated last-match-wins only for paths it matches.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, bool, bool]] = ()):
+        self.rules = list(rules)
+        self.has_negations = any(negate for _, negate, _ in self.rules)
+
+        file_rules = [regex for regex, _, dir_only in self.rules if not dir_only]
+        all_rules = [regex for regex, _, _ in self.rules]
+        self.file_regex = self._combine(file_rules)
+        self.dir_regex = self._combine(all_rules)
+        self.compiled = [(re.compile(f"(?:{regex})\\Z", re.DOTALL), negate, dir_only)
+                         for regex, negate, dir_only in self.rules] if self.has_negations else []
+
+    @staticmethod
+    def _combine(regexes: List[str]):
+        if not regexes:
+            return None
+        return re.compile("(?:" + "|".join(f"(?:{regex})" for regex in regexes) + r")\Z", re.DOTALL)
+
+    def extend(self, rules: Iterable[Tuple[str, bool, bool]]) -> "PathMatcher":
+        """New matcher with extra rules taking precedence over these"""
+        rules = list(rules)
+        return PathMatcher(self.rules + rules) if rules else self
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        """Check whether a root-relative posix path is matched (ignored)"""
+        regex = self.dir_regex if is_dir else self.file_regex
+        if regex is None or not regex.match(path):
+            return False
+        if not self.has_negations:
+            return True
+
+        for rule, negate, dir_only in reversed(self.compiled):
+            if dir_only and not is_dir:
+                continue
+            if rule.match(path):
+                return not negate
+        return False
+
+
+def read_gitignore(file_path: str, base: str) -> List[Tuple[str, bool, bool]]:
+    """Compile the rules of a .gitignore file located in directory base"""
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    return [rule for rule in (compile_rule(line, base) for line in lines) if rule]
+
+
+def normalize_extensions(extensions: Iterable[str] = None) -> Tuple[str, ...]:
+    """Turn 'js', '.mjs', ... into a tuple usable with str.endswith"""
+    if not extensions:
+        return DEFAULT_EXTENSIONS
+    return tuple(ext if ext.startswith(".") else f".{ext}"
+                 for ext in (ext.strip() for ext in extensions) if ext)
+
+
+class WalkOptions:
+    """What the project walk should consider.
+
+    extensions: file extensions to scan (default: .js)
+    excludes: gitignore-style globs, relative to the root, to skip
+    includes: if given, only files matching one of these globs are scanned
+    use_gitignore: honour .gitignore files found under the root
+    """
+
+    def __init__(self, extensions: Iterable[str] = None, excludes: Iterable[str] = None,
+                 includes: Iterable[str] = None, use_gitignore: bool = True):
+        self.extensions = normalize_extensions(extensions)
+        self.excludes = list(excludes or [])
+        self.includes = list(includes or [])
+        self.use_gitignore = use_gitignore
+
+    def signature(self) -> str:
+        """Stable description of the options (used to key caches)"""
+        return repr((self.extensions, self.excludes, self.includes, self.use_gitignore))
+
+
+class ProjectWalker:
+    """os.scandir-based project walk honouring .gitignore and user globs.
+
+    Directory entries come from scandir's d_type, so no stat call is made per
+    entry. Ignored directories are pruned before they are listed, and files
+    are yielded in the same order as os.walk (a directory's files, then its
+    sub-directories depth first).
+    """
+
+    def __init__(self, root: str, options: WalkOptions = None):
+        self.root = os.path.abspath(root)
+        self.options = options or WalkOptions()
+        self.extensions = self.options.extensions
+        self.exclude_rules = [rule for rule in (compile_rule(glob) for glob in self.options.excludes) if rule]
+        self.include_matcher = None
+        self._included_dirs = {}
+        if self.options.includes:
+            include_rules = [rule for rule in (compile_rule(glob) for glob in self.options.includes) if rule]
+            self.include_matcher = PathMatcher(include_rules)
+        self.root_matcher = PathMatcher(self.exclude_rules)
+
+    def _with_gitignore(self, matcher: PathMatcher, gitignore_path: str, base: str) -> PathMatcher:
+        """Matcher for a directory holding a .gitignore (base is its posix relative path)"""
+        # User excludes keep the last word over any .gitignore
+        return PathMatcher(matcher.rules[:len(matcher.rules) - len(self.exclude_rules)]
+                           + read_gitignore(gitignore_path, base) + self.exclude_rules)
+
+    def accepts(self, relative_path: str) -> bool:
+        """Whether walk() would yield this file, checked without listing any directory"""
+        parts = relative_path.replace(os.sep, "/").split("/")
+        if not parts[-1].endswith(self.extensions) or ".." in parts:
+            return False
+
+        matcher = self.root_matcher
+        absolute_dir = self.root
+        for depth, name in enumerate(parts):
+            if self.options.use_gitignore:
+                gitignore = os.path.join(absolute_dir, ".gitignore")
+                if os.path.isfile(gitignore):
+                    matcher = self._with_gitignore(matcher, gitignore, "/".join(parts[:depth]))
+            path = "/".join(parts[:depth + 1])
+            absolute_path = os.path.join(absolute_dir, name)
+            if depth < len(parts) - 1:
+                if should_ignore_directory(name) or os.path.islink(absolute_path):
+                    return False
+                if matcher.matches(path, True):
+                    return False
+                absolute_dir = absolute_path
+            elif matcher.matches(path, False):
+                return False
+
+        if not self.included("/".join(parts)):
+            return False
+        return os.path.isfile(os.path.join(self.root, relative_path))
+
+    def included(self, path: str) -> bool:
+        """Whether a file passes the include globs, either itself or through a matching ancestor directory"""
+        if self.include_matcher is None or self.include_matcher.matches(path, False):
+            return True
+        return self._directory_included(path.rpartition("/")[0])
+
+    def _directory_included(self, directory: str) -> bool:
+        if not directory:
+            return False
+        included = self._included_dirs.get(directory)
+        if included is None:
+            included = (self.include_matcher.matches(directory, True)
+                        or self._directory_included(directory.rpartition("/")[0]))
+            self._included_dirs[directory] = included
+        return included
+
+    def scan_dir(self, relative_dir: str, matcher: PathMatcher) -> Tuple[List[str], List[str], PathMatcher]:
+        """List one directory: (sub-directories to walk, files to scan, matcher for children).
+
+        relative_dir uses os.sep and is '' for the root.
+        """
+        absolute_dir = os.path.join(self.root, relative_dir) if relative_dir else self.root
+        with os.scandir(absolute_dir) as iterator:
+            entries = list(iterator)
+
+        if self.options.use_gitignore:
+            for entry in entries:
+                if entry.name == ".gitignore":
+                    matcher = self._with_gitignore(matcher, entry.path, relative_dir.replace(os.sep, "/"))
+                    break
+
+        prefix = relative_dir.replace(os.sep, "/") + "/" if relative_dir else ""
+        subdirs = []
+        files = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if is_dir:
+                # Like os.walk, symlinked directories are not followed
+                if should_ignore_directory(name) or entry.is_symlink():
+                    continue
+                if matcher.matches(prefix + name, True):
+                    continue
+                subdirs.append(name)
+            elif name.endswith(self.extensions):
+                path = prefix + name
+                if matcher.matches(path, False):
+                    continue
+                if not self.included(path):
+                    continue
+                files.append(name)
+
+        return subdirs, files, matcher
+
+    def walk(self) -> Iterator[Tuple[str, str]]:
+        """Yield (absolute path, relative path) for every file to scan"""
+        stack = [("", self.root_matcher)]
+        while stack:
+            relative_dir, matcher = stack.pop()
+            try:
+                subdirs, files, child_matcher = self.scan_dir(relative_dir, matcher)
+            except OSError:
+                continue
+
+            absolute_dir = os.path.join(self.root, relative_dir) if relative_dir else self.root
+            for name in files:
+                relative_path = os.path.join(relative_dir, name) if relative_dir else name
+                yield os.path.join(absolute_dir, name), relative_path
+
+            for name in reversed(subdirs):
+                stack.append((os.path.join(relative_dir, name) if relative_dir else name, child_matcher))
@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, TextIO
+
+from .parser.route_extractor import register_matcher_specs, json_default, Route
+from .scanner import parse_file, ScanLimits
+from .walker import ProjectWalker, PathMatcher, WalkOptions
+
+
+def route_key(route: Route) -> Tuple[str, str, str]:
+    """Identity of a route within a file"""
+    return route.method, route.path, route.framework
+
+
+def diff_routes(old_routes: List[Route], new_routes: List[Route]) -> List[Dict[str, Any]]:
+    """Compare the routes of one file before and after an edit.
+
+    Routes are paired by (method, path, framework) in declaration order; a
+    pair whose expected inputs differ is reported as changed.
+    """
+    unmatched: Dict[Tuple[str, str, str], List[Route]] = {}
+    for route in old_routes:
+        unmatched.setdefault(route_key(route), []).append(route)
+
+    events = []
+    for route in new_routes:
+        candidates = unmatched.get(route_key(route))
+        if not candidates:
+            events.append({"event": "added", "route": route})
+            continue
+        previous = candidates.pop(0)
+        if previous != route:
+            events.append({"event": "changed", "route": route, "previous": previous})
+
+    for candidates in unmatched.values():
+        for route in candidates:
+            events.append({"event": "removed", "route": route})
+
+    return events
+
+
+class RouteWatcher:
+    """Keep a per-file route table up to date by polling the project tree.
+
+    Each poll stats the known directories and files only; directories are
+    re-listed when their mtime changes (entries added, removed or renamed) and
+    only files whose mtime or size changed are re-parsed. Edits to a
+    .gitignore take effect once its directory is re-listed.
+    """
+
+    def __init__(self, project_path: str, verbose: bool = False,
+                 walk_options: WalkOptions = None, limits: ScanLimits = None):
+        self.project_path = Path(project_path).resolve()
+        self.verbose = verbose
+        # Per-file limits only: a whole-scan time budget has no meaning while watching
+        self.limits = limits
+
+        if not self.project_path.exists():
+            raise FileNotFoundError(f"Project path does not exist: {self.project_path}")
+        if not self.project_path.is_dir():
+            raise NotADirectoryError(f"Path is not a directory: {self.project_path}")
+
+        self.walker = ProjectWalker(str(self.project_path), walk_options)
+        # relative dir -> (mtime_ns, subdirs, files, matcher for its children)
+        self.directories: Dict[str, Tuple[int, List[str], List[str], PathMatcher]] = {}
+        # relative file -> (mtime_ns, size)
+        self.file_stats: Dict[str, Tuple[int, int]] = {}
+        # relative file -> routes
+        self.routes: Dict[str, List[Route]] = {}
+
+    def absolute(self, relative_path: str) -> str:
+        """Absolute path of a project-relative path"""
+        return os.path.join(self.project_path, relative_path) if relative_path else str(self.project_path)
+
+    def parse(self, relative_path: str) -> List[Route]:
+        """Re-extract the routes of a single file"""
+        try:
+            result = parse_file(self.absolute(relative_path), relative_path, limits=self.limits)
+        except OSError as e:
+            if self.verbose:
+                print(f"Error reading {relative_path}: {str(e)}", file=sys.stderr)
+            return []
+        if result.skip_reason is not None and self.verbose:
+            print(f"Skipped {relative_path}: {result.skip_reason}", file=sys.stderr)
+        return result.routes or []
+
+    def update_file(self, relative_path: str, st: os.stat_result) -> List[Dict[str, Any]]:
+        """Re-parse a new or modified file and return its route events"""
+        self.file_stats[relative_path] = (st.st_mtime_ns, st.st_size)
+        new_routes = self.parse(relative_path)
+        old_routes = self.routes.get(relative_path, [])
+        self.routes[relative_path] = new_routes
+        return diff_routes(old_routes, new_routes)
+
+    def remove_file(self, relative_path: str) -> List[Dict[str, Any]]:
+        """Forget a deleted file and return removal events for its routes"""
+        self.file_stats.pop(relative_path, None)
+        return diff_routes(self.routes.pop(relative_path, []), [])
+
+    def remove_directory(self, relative_dir: str) -> List[Dict[str, Any]]:
+        """Forget a deleted directory and everything below it"""
+        events = []
+        entry = self.directories.pop(relative_dir, None)
+        if entry is None:
+            return events
+        _, subdirs, files, _ = entry
+        for name in files:
+            events.extend(self.remove_file(os.path.join(relative_dir, name)))
+        for name in subdirs:
+            events.extend(self.remove_directory(os.path.join(relative_dir, name)))
+        return events
+
+    def sync_directory(self, relative_dir: str, matcher: PathMatcher) -> List[Dict[str, Any]]:
+        """Stat a directory and its files, descending into changed or new parts.
+
+        matcher holds the ignore rules in effect for the directory's entries.
+        """
+        events = []
+        try:
+            dir_mtime = os.stat(self.absolute(relative_dir)).st_mtime_ns
+        except OSError:
+            return self.remove_directory(relative_dir)
+
+        known = self.directories.get(relative_dir)
+        if known is None or known[0] != dir_mtime:
+            try:
+                subdirs, files, child_matcher = self.walker.scan_dir(relative_dir, matcher)
+            except OSError:
+                return self.remove_directory(relative_dir)
+
+            if known is not None:
+                _, old_subdirs, old_files, _ = known
+                current_files, current_subdirs = set(files), set(subdirs)
+                for name in old_files:
+                    if name not in current_files:
+                        events.extend(self.remove_file(os.path.join(relative_dir, name)))
+                for name in old_subdirs:
+                    if name not in current_subdirs:
+                        events.extend(self.remove_directory(os.path.join(relative_dir, name)))
+            self.directories[relative_dir] = (dir_mtime, subdirs, files, child_matcher)
+        else:
+            _, subdirs, files, child_matcher = known
+
+        for name in files:
+            relative_path = os.path.join(relative_dir, name)
+            try:
+                st = os.stat(self.absolute(relative_path))
+            except OSError:
+                events.extend(self.remove_file(relative_path))
+                continue
+            if self.file_stats.get(relative_path) != (st.st_mtime_ns, st.st_size):
+                events.extend(self.update_file(relative_path, st))
+
+        for name in subdirs:
+            events.extend(self.sync_directory(os.path.join(relative_dir, name), child_matcher))
+
+        return events
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Bring the route table up to date and return the route events"""
+        return self.sync_directory("", self.walker.root_matcher)
+
+    def emit(self, events: List[Dict[str, Any]], stdout: TextIO):
+        """Write events as one JSON object per line"""
+        for event in events:
+            stdout.write(json.dumps(event, ensure_ascii=False, separators=(",", ":"),
+                                    default=json_default))
+            stdout.write("\n")
+        stdout.flush()
+
+    def run(self, interval: float = 1.0, stdout: TextIO = None):
+        """Emit the initial routes, then route deltas as NDJSON until interrupted"""
+        stdout = stdout or sys.stdout
+
+        self.emit(self.poll(), stdout)
+        total_routes = sum(len(routes) for routes in self.routes.values())
+        self.emit([{"event": "ready", "files": len(self.file_stats), "routes": total_routes}], stdout)
+
+        while True:
+            time.sleep(interval)
+            events = self.poll()
+            if events:
+                self.emit(events, stdout)
+
+
+def watch_project(project_path: str, interval: float = 1.0, verbose: bool = False,
+                  matcher_specs: List[Dict[str, Any]] = None,
+                  walk_options: WalkOptions = None, limits: ScanLimits = None):
+    """Watch a project and stream route events to stdout"""
+    if matcher_specs:
+        register_matcher_specs(matcher_specs)
+    RouteWatcher(project_path, verbose, walk_options, limits).run(interval)
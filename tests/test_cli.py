@@ -0,0 +1,32 @@
+import io
+import json
+
+from scan.cli import stream_ndjson
+from scan.parser.route_extractor import Route
+
+
+class RecordingStream(io.StringIO):
+    """Records how many lines had been written at each flush"""
+
+    def __init__(self):
+        super().__init__()
+        self.flushed_at = []
+
+    def flush(self):
+        self.flushed_at.append(self.getvalue().count("\n"))
+        super().flush()
+
+
+def test_stream_ndjson_flushes_after_each_file(monkeypatch):
+    out = RecordingStream()
+    monkeypatch.setattr("sys.stdout", out)
+    files = [("a.js", [Route("GET", "/a", "a.js", "app", ()), Route("POST", "/a", "a.js", "app", ())]),
+             ("empty.js", []),
+             ("b.js", [Route("GET", "/b", "b.js", "app", ())])]
+
+    stream_ndjson(iter(files), include_stats=True, stats={"scanned_files": 3})
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(line["method"], line["path"]) for line in lines[:3]] == [("GET", "/a"), ("POST", "/a"), ("GET", "/b")]
+    assert lines[3] == {"stats": {"scanned_files": 3}}
+    assert out.flushed_at[:3] == [2, 2, 3]
@@ -0,0 +1,126 @@
+import json
+import os
+
+import pytest
+
+from scan.incremental import scan_changed
+from scan.parser.route_extractor import json_default
+from scan import scanner
+from scan.scanner import scan_project
+
+FILES = {
+    "app.js": "app.use(express.json());\napp.get('/health', (req, res) => res.send('ok'));\n",
+    "routes/users.js": ("router.get('/users/:id', (req, res) => res.json(req.params.id));\n"
+                        "router.post('/users', (req, res) => res.json(req.body.name));\n"),
+    "routes/orders.js": "router.get('/orders', (req, res) => res.json(req.query.page));\n",
+}
+
+
+def write(root, relative_path, text):
+    path = os.path.join(root, *relative_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        handle.write(text)
+
+
+def edit(root):
+    """Change one file, delete one and add one; returns the changed paths"""
+    write(root, "routes/users.js", "router.put('/users/:id', (req, res) => res.json(req.body.email));\n")
+    os.remove(os.path.join(root, "routes", "orders.js"))
+    write(root, "routes/items.js", "router.get('/items', (req, res) => res.json(req.headers.token));\n")
+    return ["routes/users.js", "routes/orders.js", "routes/items.js"]
+
+
+def as_set(routes):
+    return sorted(json.dumps(route.to_dict(), sort_keys=True) for route in routes)
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = str(tmp_path / "project")
+    for relative_path, text in FILES.items():
+        write(root, relative_path, text)
+    return root
+
+
+def test_merge_over_cache_matches_full_scan(project, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    scan_project(project, cache_path=cache_path)
+    changed = edit(project)
+
+    stats, middleware = {}, []
+    merged = scan_changed(project, changed, stats, cache_path=cache_path, middleware=middleware)
+    full_middleware = []
+    full, full_stats = scan_project(project, middleware=full_middleware)
+
+    assert as_set(merged) == as_set(full)
+    assert middleware and middleware == full_middleware
+    assert stats["changed_files"] == 3
+    assert stats["scanned_files"] == 2
+    assert stats["route_statistics"] == full_stats["route_statistics"]
+
+
+def test_merge_over_baseline_file_matches_full_scan(project, tmp_path):
+    baseline_path = str(tmp_path / "routes.json")
+    routes, _ = scan_project(project)
+    with open(baseline_path, "w") as handle:
+        json.dump({"routes": routes}, handle, default=json_default)
+    changed = edit(project)
+
+    merged = scan_changed(project, changed, {}, baseline_path=baseline_path)
+    assert as_set(merged) == as_set(scan_project(project)[0])
+    # Baseline file order is kept; files new to it come last
+    assert [route.file for route in merged][-1] == os.path.join("routes", "items.js")
+
+
+def test_unchanged_files_come_from_the_baseline(project, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    scan_project(project, cache_path=cache_path)
+    # Edited without being listed as changed: the merge keeps the baseline routes
+    write(project, "app.js", "app.get('/ready', (req, res) => res.send('ok'));\n")
+    merged = scan_changed(project, [], {}, cache_path=cache_path)
+    assert "/health" in {route.path for route in merged}
+
+
+def test_needs_a_baseline(project, tmp_path):
+    with pytest.raises(ValueError):
+        scan_changed(project, ["app.js"], {})
+    with pytest.raises(ValueError):
+        scan_changed(project, ["app.js"], {}, cache_path=str(tmp_path / "missing.json"))
+
+
+def test_single_record_ndjson_baseline(tmp_path):
+    root = str(tmp_path / "project")
+    write(root, "app.js", "app.get('/health', (req, res) => res.send('ok'));\n")
+    write(root, "routes/users.js", "router.get('/users', (req, res) => res.json(req.query.page));\n")
+    baseline_path = str(tmp_path / "baseline.ndjson")
+    with open(baseline_path, "w") as handle:
+        handle.write(json.dumps({"method": "GET", "path": "/health", "file": "app.js",
+                                 "framework": "app", "expected_inputs": {}}) + "\n")
+
+    stats = {}
+    merged = scan_changed(root, ["routes/users.js"], stats, baseline_path=baseline_path)
+    assert [(route.file, route.path) for route in merged] == [
+        ("app.js", "/health"), (os.path.join("routes", "users.js"), "/users")]
+    assert stats["baseline_files"] == 1
+    assert stats["scanned_files"] == 1
+
+
+def test_input_memo_is_read_only_when_a_file_is_parsed(project, tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "cache.json")
+    scanner.INPUT_MEMO.clear()
+    scan_project(project, cache_path=cache_path)
+    assert os.path.exists(str(tmp_path / "cache.inputs.json"))
+
+    loads = []
+    load_input_memo = scanner.load_input_memo
+    monkeypatch.setattr(scanner, "load_input_memo", lambda *args: loads.append(load_input_memo(*args)))
+    scanner.INPUT_MEMO.clear()
+    # Every file comes from the scan cache: the saved memo is never opened
+    _, stats = scan_project(project, cache_path=cache_path)
+    assert stats["cache_hits"] == 3 and loads == []
+
+    edit(project)
+    _, stats = scan_project(project, cache_path=cache_path)
+    # Loaded once the first changed file is parsed
+    assert len(loads) == 1 and loads[0] > 0
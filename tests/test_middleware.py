@@ -0,0 +1,50 @@
+import os
+
+from scan.parser.route_extractor import analyze_middleware, analyze_source, get_route_statistics
+from scan.scanner import scan_project
+
+
+def test_chains_in_source_order():
+    code = ("app.use(express.json());\n"
+            "app.use(['/a', '/b'], auth, limiter());\n"
+            "router.use('/api', cors({ origin: true }), require('./audit'), (req, res, next) => next());\n")
+    assert analyze_middleware(code) == [
+        {"path": "*", "object": "app", "chain": ["express.json()"]},
+        {"path": "/a", "object": "app", "chain": ["auth", "limiter()"]},
+        {"path": "/b", "object": "app", "chain": ["auth", "limiter()"]},
+        {"path": "/api", "object": "router", "chain": ["cors()", "require('./audit')", "<inline>"]},
+    ]
+
+
+def test_routes_and_middleware_come_from_one_pass():
+    routes, middleware = analyze_source("app.use(auth);\napp.get('/me', (req, res) => res.json(req.query.q));\n",
+                                        "app.js")
+    assert [(route.method, route.path) for route in routes] == [("GET", "/me")]
+    assert middleware == [{"path": "*", "object": "app", "chain": ["auth"]}]
+
+
+def test_scan_reports_middleware_and_statistics(tmp_path):
+    root = str(tmp_path)
+    with open(os.path.join(root, "app.js"), "w") as handle:
+        handle.write("app.use(helmet());\n"
+                     "app.get('/users/:id', (req, res) => res.json(req.params.id));\n"
+                     "app.post('/users', (req, res) => res.json(req.body.name));\n")
+    with open(os.path.join(root, "routes.js"), "w") as handle:
+        handle.write("router.use('/admin', requireAdmin);\n"
+                     "router.get('/search', (req, res) => res.json(req.query.q));\n")
+
+    middleware = []
+    routes, stats = scan_project(root, middleware=middleware)
+    assert middleware == [
+        {"file": "app.js", "path": "*", "object": "app", "chain": ["helmet()"]},
+        {"file": "routes.js", "path": "/admin", "object": "router", "chain": ["requireAdmin"]},
+    ]
+    assert stats["route_statistics"] == get_route_statistics(routes) == {
+        "total_routes": 3,
+        "methods": {"GET": 2, "POST": 1},
+        "frameworks": {"app": 2, "router": 1},
+        "files_with_routes": 2,
+        "routes_with_params": 1,
+        "routes_with_body_inputs": 1,
+        "routes_with_query_inputs": 1,
+    }
@@ -0,0 +1,92 @@
+import os
+
+from scan.module_graph import ModuleGraph, extract_module_edges
+from scan.scanner import scan_project
+
+
+def write_tree(root, files):
+    for relative_path, text in files.items():
+        path = os.path.join(root, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as handle:
+            handle.write(text)
+
+
+def route_paths(root, entry="app.js"):
+    routes, stats = scan_project(root, entry_points=[entry])
+    return sorted(f"{route.method} {route.path}" for route in routes), stats
+
+
+def test_edges_of_require_and_esm_mounts():
+    code = ("import express from 'express';\n"
+            "import users, { helper } from './users.js';\n"
+            "const admin = require('./admin');\n"
+            "app.use('/users', users);\n"
+            "app.use(['/a', '/b'], admin);\n"
+            "app.use('/v1', require('./v1'));\n")
+    edges = extract_module_edges(code)
+    assert edges["imports"] == ["express", "./users.js", "./admin", "./v1"]
+    assert edges["mounts"] == [["/users", "./users.js"], ["/a", "./admin"], ["/b", "./admin"],
+                               ["/v1", "./v1"]]
+
+
+def test_nested_require_mounts_compose_prefixes(tmp_path):
+    root = str(tmp_path)
+    write_tree(root, {
+        "app.js": "app.use('/api', require('./routes'));\n",
+        "routes/index.js": ("const router = express.Router();\n"
+                            "router.use('/users', require('./users'));\n"
+                            "router.get('/', (req, res) => res.end());\n"),
+        "routes/users.js": "router.get('/:id', (req, res) => res.end());\n",
+        "unreachable.js": "app.get('/orphan', (req, res) => res.end());\n",
+    })
+    paths, stats = route_paths(root)
+    assert paths == ["GET /api", "GET /api/users/:id"]
+    assert stats["reachable_modules"] == 3
+
+
+def test_esm_import_router(tmp_path):
+    root = str(tmp_path)
+    write_tree(root, {
+        "app.mjs": ("import express from 'express';\n"
+                    "import items from './items/index.mjs';\n"
+                    "import './side-effect.mjs';\n"
+                    "app.use('/items', items);\n"),
+        "items/index.mjs": "router.post('/', (req, res) => res.end());\nexport default router;\n",
+        "side-effect.mjs": "app.get('/ping', (req, res) => res.end());\n",
+    })
+    paths, _ = route_paths(root, "app.mjs")
+    # Imported without a mount, a module keeps its importer's prefix
+    assert paths == ["GET /ping", "POST /items"]
+
+
+def test_import_cycles_terminate(tmp_path):
+    root = str(tmp_path)
+    write_tree(root, {
+        "app.js": "app.use('/a', require('./a'));\n",
+        "a.js": "router.use('/b', require('./b'));\nrouter.get('/', (req, res) => res.end());\n",
+        "b.js": "const a = require('./a');\nrouter.get('/x', (req, res) => res.end());\n",
+    })
+    paths, stats = route_paths(root)
+    assert paths == ["GET /a", "GET /a/b/x"]
+    assert stats["reachable_modules"] == 3
+
+
+def test_unresolved_specifiers_are_not_followed(tmp_path):
+    root = str(tmp_path / "project")
+    write_tree(str(tmp_path), {
+        "outside.js": "app.get('/outside', (req, res) => res.end());\n",
+        "project/app.js": ("const lodash = require('lodash');\n"
+                           "app.use('/gone', require('./missing'));\n"
+                           "app.use('/out', require('../outside'));\n"
+                           "app.use('/dep', require('./node_modules/dep'));\n"
+                           "app.get('/', (req, res) => res.end());\n"),
+        "project/node_modules/dep/index.js": "app.get('/dep', (req, res) => res.end());\n",
+    })
+    graph = ModuleGraph(root)
+    order, prefixes = graph.walk([os.path.join(root, "app.js")])
+    assert [relative_path for _, relative_path in order] == ["app.js"]
+    assert prefixes == {"app.js": [""]}
+    assert graph.errors == []
+    for specifier in ("lodash", "./missing", "../outside", "./node_modules/dep"):
+        assert graph.resolve(os.path.join(root, "app.js"), specifier) is None
@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+from scan.scanner import root_cache_paths, scan_project
+
+SHARED = "router.get('/health', (req, res) => res.send('ok'));\napp.use('/health', auth);\n"
+
+
+def write(root, relative_path, text):
+    path = os.path.join(root, *relative_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        handle.write(text)
+
+
+def cached_files(cache_path):
+    with open(cache_path) as handle:
+        return sorted(json.load(handle)["files"])
+
+
+@pytest.fixture
+def roots(tmp_path):
+    users = str(tmp_path / "services" / "users")
+    orders = str(tmp_path / "services" / "orders")
+    write(users, "package.json", json.dumps({"name": "@shop/users"}))
+    write(users, "lib/health.js", SHARED)
+    write(users, "users.js", "router.get('/users', (req, res) => res.end());\n")
+    # No package.json: tagged with the directory name
+    write(orders, "common/health.js", SHARED)
+    write(orders, "orders.js", "router.post('/orders', (req, res) => res.end());\n")
+    return [users, orders]
+
+
+def test_shared_file_is_parsed_once_and_tagged_per_root(roots):
+    middleware = []
+    routes, stats = scan_project(roots, middleware=middleware)
+
+    assert stats["deduplicated_files"] == 1
+    assert stats["scanned_files"] == 4
+    assert sorted((route.package, route.file, route.path) for route in routes) == [
+        ("@shop/users", "lib/health.js", "/health"),
+        ("@shop/users", "users.js", "/users"),
+        ("orders", "common/health.js", "/health"),
+        ("orders", "orders.js", "/orders"),
+    ]
+    assert sorted((entry["package"], entry["file"]) for entry in middleware) == [
+        ("@shop/users", "lib/health.js"), ("orders", "common/health.js")]
+
+
+def test_single_root_routes_are_not_tagged(roots):
+    routes, _ = scan_project(roots[0])
+    assert {route.package for route in routes} == {None}
+
+
+def test_each_root_gets_its_own_cache_file(roots, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    paths = root_cache_paths(cache_path, roots)
+    assert len(set(paths)) == 2 and cache_path not in paths
+
+    scan_project(roots, cache_path=cache_path)
+    # The deduplicated copy is cached under its own root as well
+    assert cached_files(paths[0]) == ["lib/health.js", "users.js"]
+    assert cached_files(paths[1]) == ["common/health.js", "orders.js"]
+    assert not os.path.exists(cache_path)
+
+    routes, stats = scan_project(roots, cache_path=cache_path)
+    assert stats["cache_hits"] == 4 and stats["cache_misses"] == 0
+    assert sorted(route.package for route in routes) == ["@shop/users", "@shop/users", "orders", "orders"]
+
+
+def test_explicit_cache_path_per_root(roots, tmp_path):
+    cache_paths = [str(tmp_path / "users.json"), str(tmp_path / "orders.json")]
+    scan_project(roots, cache_path=cache_paths)
+    assert cached_files(cache_paths[0]) == ["lib/health.js", "users.js"]
+    assert cached_files(cache_paths[1]) == ["common/health.js", "orders.js"]
+
+    with pytest.raises(ValueError):
+        scan_project(roots, cache_path=cache_paths[:1])
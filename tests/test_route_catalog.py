@@ -0,0 +1,75 @@
+import pytest
+
+from scan.parser.route_extractor import Route
+from scan.route_catalog import RouteCatalog
+from scan.route_index import is_catalog_file, load_routes
+
+
+def sample_routes():
+    routes = []
+    for index in range(5):
+        file = f"routes/r{index}.js"
+        routes.append(Route("GET", f"/items{index}/:id", file, "router", (("req.params", ("id",)),)))
+        routes.append(Route("POST", f"/items{index}", file, "router", (("req.body", ("name", "price")),)))
+    routes.append(Route("ALL", "/health", "app.js", "app"))
+    return routes
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "routes.db")
+
+
+def test_round_trip(db_path):
+    routes = sample_routes()
+    middleware = [{"file": "app.js", "path": "/", "object": "app", "chain": ["json"]}]
+    with RouteCatalog(db_path) as catalog:
+        assert catalog.write(iter(routes), {"scanned_files": 6}, middleware) == len(routes)
+
+    assert is_catalog_file(db_path)
+    with RouteCatalog(db_path, readonly=True) as catalog:
+        assert catalog.routes() == routes
+        assert catalog.stats() == {"scanned_files": 6}
+        assert catalog.middleware() == middleware
+        assert catalog.files()[-1] == {"file": "app.js", "routes": 1}
+    assert load_routes(db_path) == routes
+
+
+def test_paging_follows_scan_order(db_path):
+    routes = sample_routes()
+    with RouteCatalog(db_path) as catalog:
+        catalog.write(routes)
+        pages = [catalog.routes(limit=4, offset=offset) for offset in range(0, len(routes), 4)]
+        assert [len(page) for page in pages] == [4, 4, 3]
+        assert [route for page in pages for route in page] == routes
+        assert catalog.routes(offset=9) == routes[9:]
+        assert catalog.routes(limit=2, offset=100) == []
+
+
+def test_filters(db_path):
+    routes = sample_routes()
+    with RouteCatalog(db_path) as catalog:
+        catalog.write(routes)
+        assert catalog.count() == len(routes)
+        assert catalog.count(method="post") == 5
+        assert [route.path for route in catalog.routes(path_prefix="/items1")] == ["/items1/:id", "/items1"]
+        assert catalog.routes(file="app.js") == [routes[-1]]
+        assert catalog.count(input_name="price") == 5
+        assert [route.path for route in catalog.routes(method="GET", input_name="id", limit=2, offset=1)] == [
+            "/items1/:id", "/items2/:id"]
+
+
+def test_rewrite_keeps_only_current_routes(db_path):
+    routes = sample_routes()
+    with RouteCatalog(db_path) as catalog:
+        catalog.write(routes, {"scanned_files": 6})
+        # r0 dropped, r1 changed, app.js moved to the front
+        updated = ([routes[-1]] + [Route("DELETE", "/items1/:id", "routes/r1.js", "router")]
+                   + routes[4:-1])
+        assert catalog.write(updated, {"scanned_files": 5}) == len(updated)
+        assert catalog.routes() == updated
+        assert catalog.routes(limit=3, offset=1) == updated[1:4]
+        assert catalog.count(input_name="price") == 3
+        assert [entry["file"] for entry in catalog.files()] == [
+            "app.js", "routes/r1.js", "routes/r2.js", "routes/r3.js", "routes/r4.js"]
+        assert catalog.stats() == {"scanned_files": 5}
@@ -0,0 +1,109 @@
+from scan.parser.route_extractor import (InputMemo, build_bracket_map, extract_routes, normalize_handler,
+                                        scan_expected_inputs)
+
+
+def test_normalize_collapses_code_whitespace():
+    assert normalize_handler("  (req,\n\t res) =>  {\n  res.end()\n}  ") == "(req, res) => { res.end() }"
+
+
+def test_normalize_keeps_literals_and_comments():
+    assert normalize_handler("res.send('a   b',  \"c\\n  d\")") == "res.send('a   b', \"c\\n  d\")"
+    assert normalize_handler("/* a   b */  x") == "/* a   b */ x"
+    assert normalize_handler("a  // note  here\n    b") == "a // note  here\n b"
+
+
+def test_normalize_keeps_template_text_but_not_expressions():
+    assert (normalize_handler("x  = `a   ${ {k:   1}.k }   b`;  y")
+            == "x = `a   ${ {k: 1}.k }   b`; y")
+
+
+def test_layout_only_differences_normalize_alike():
+    first = "(req, res) => {\n    const { id } = req.params;\n    res.json(id);\n}"
+    second = "(req, res) => { const { id } = req.params; res.json(id); }"
+    assert normalize_handler(first) == normalize_handler(second)
+
+
+def test_express_paths_must_start_with_slash_or_star():
+    code = ("app.get('env');\n"
+            "router.get('named', '/koa/:k', handler);\n"
+            "app.get('*', handler);\n"
+            "app.post('/users', (req, res) => res.json(req.body.name));\n")
+    assert [(route.method, route.path) for route in extract_routes(code, "app.js")] == [
+        ("GET", "*"), ("POST", "/users")]
+
+
+def test_replayed_log_counts_like_direct_lookups():
+    lookups = ["a", "b", "a", "c", "d", "b", "a"]
+    direct = InputMemo(capacity=2)
+    worker = InputMemo(capacity=2)
+    worker.log = []
+    for memo in (direct, worker):
+        for key in lookups:
+            if memo.get(key) is None:
+                memo.put(key, (("req.body", (key,)),))
+
+    parent = InputMemo(capacity=2)
+    parent.replay(worker.take_log())
+    assert parent.counters() == direct.counters()
+    assert list(parent.entries) == list(direct.entries)
+
+
+
+def test_loader_runs_once_on_the_first_miss():
+    memo = InputMemo(capacity=4)
+    calls = []
+    memo.loader = lambda: calls.append(memo.put("saved", (("req.query", ("q",)),)))
+    assert memo.get("saved") == (("req.query", ("q",)),)
+    assert memo.get("other") is None
+    assert len(calls) == 1 and memo.loader is None
+    assert memo.counters() == (1, 1, 0)
+
+def test_brackets_in_regex_literals_do_not_leak_inputs():
+    code = ("router.get('/a', (req, res) => { const ok = /[(]/.test(req.query.q); res.end() });\n"
+            "router.post('/b', (req, res) => res.json(req.body.secret));\n")
+    routes = extract_routes(code, "routes.js")
+    assert [(route.path, route.to_dict()["expected_inputs"]) for route in routes] == [
+        ("/a", {"req.query": ["q"]}), ("/b", {"req.body": ["secret"]})]
+    # The first call closes where it should, not at the end of the file
+    assert build_bracket_map(code)[code.index("(")] == code.index("});") + 1
+
+
+def test_regex_literals_only_where_an_operand_can_start():
+    code = "f(a / b, (c) / 2, x => /[)]/.test(x)); g(function () { return /[}]/ })"
+    brackets = build_bracket_map(code)
+    assert brackets[0 + 1] == code.index("); g")
+    assert brackets[code.index("{")] == len(code) - 2
+    assert normalize_handler("s.replace(/a  +b/g,  '')  /  2") == "s.replace(/a  +b/g, '') / 2"
+
+
+def inputs(code):
+    return {source: list(names) for source, names in scan_expected_inputs(code).items() if names}
+
+
+def test_destructuring_nested_renamed_and_defaults():
+    assert inputs("const { user: { name }, tags } = req.body;") == {"req.body": ["user", "tags"]}
+    assert inputs("const { id: userId } = req.params; load(userId);") == {"req.params": ["id"]}
+    assert inputs("const { page = 1, limit: max = 10 } = req.query;") == {"req.query": ["page", "limit"]}
+    assert inputs("const { body: { email }, query: { q } } = req;") == {"req.body": ["email"], "req.query": ["q"]}
+
+
+def test_koa_request_body_is_input_but_ctx_body_is_response():
+    code = "const { a } = ctx.request.body; ctx.body = { ok: ctx.request.query.page }; ctx.body.b;"
+    assert inputs(code) == {"req.body": ["a"], "req.query": ["page"]}
+
+
+def test_aliases_bound_in_the_handler():
+    assert inputs("const data = req.body; save(data.title, data['tags']);") == {"req.body": ["title", "tags"]}
+
+
+def test_optional_chaining():
+    code = "const n = req.body?.name; const p = req?.query?.page; const t = req.headers?.['x-token'];"
+    assert inputs(code) == {"req.body": ["name"], "req.query": ["page"], "req.headers": ["x-token"]}
+    # A member read through ?. is not the input object itself
+    assert inputs("const b = req.body?.data; b.x;") == {"req.body": ["data"]}
+
+
+def test_every_declarator_of_a_declaration():
+    assert inputs("const { a } = req.body, { b } = req.query;") == {"req.body": ["a"], "req.query": ["b"]}
+    assert inputs("let n = 0, q = req.query; q.term;") == {"req.query": ["term"]}
+    assert inputs("f(a, { x: 1 }, c); const t = 1, u = 2;") == {}
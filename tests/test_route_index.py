@@ -0,0 +1,76 @@
+from scan.parser.route_extractor import Route
+from scan.route_index import RouteIndex, load_routes, normalized_pattern, parse_request
+
+
+def route(method, path, file="routes.js"):
+    return Route(method, path, file, "app")
+
+
+def matched(index, method, url):
+    return [(match["route"].method, match["route"].path, match["params"]) for match in index.match(method, url)]
+
+
+def test_static_beats_param_beats_wildcard():
+    index = RouteIndex([route("GET", "/files/*"), route("GET", "/users/:id"),
+                        route("GET", "/users/me"), route("GET", "/*")])
+    assert matched(index, "GET", "/users/me") == [
+        ("GET", "/users/me", {}),
+        ("GET", "/users/:id", {"id": "me"}),
+        ("GET", "/*", {"*": "users/me"}),
+    ]
+    assert matched(index, "GET", "/files/a/b.txt")[0] == ("GET", "/files/*", {"*": "a/b.txt"})
+
+
+def test_method_filtering_and_all():
+    index = RouteIndex([route("POST", "/users"), route("ALL", "/users"), route("GET", "/users")])
+    assert [method for method, _, _ in matched(index, "get", "/users")] == ["ALL", "GET"]
+    assert [method for method, _, _ in matched(index, None, "/users")] == ["POST", "ALL", "GET"]
+    assert matched(index, "DELETE", "/accounts") == []
+
+
+def test_params_are_named_by_each_route():
+    index = RouteIndex([route("GET", "/users/:userId/posts/:postId"), route("GET", "/users/:id/posts/latest")])
+    assert matched(index, "GET", "/users/7/posts/latest") == [
+        ("GET", "/users/:id/posts/latest", {"id": "7"}),
+        ("GET", "/users/:userId/posts/:postId", {"userId": "7", "postId": "latest"}),
+    ]
+
+
+def test_resolve_takes_the_best_match():
+    index = RouteIndex([route("GET", "/users/:id"), route("DELETE", "/users/:id")])
+    assert index.resolve("DELETE /users/3")["route"].method == "DELETE"
+    assert index.resolve("/nowhere") is None
+    assert parse_request("GET /users/3") == ("GET", "/users/3")
+    assert parse_request("/users/3") == (None, "/users/3")
+
+
+def test_conflicts_report_duplicates_and_overlaps():
+    routes = [route("GET", "/users/:id"), route("GET", "/users/:userId", "other.js"),
+              route("GET", "/users/me"), route("POST", "/users/me")]
+    conflicts = RouteIndex(routes).conflicts()
+    kinds = sorted((entry["kind"], entry["routes"][0].path, entry["routes"][1].path) for entry in conflicts)
+    assert kinds == [
+        ("duplicate", "/users/:id", "/users/:userId"),
+        ("overlap", "/users/:id", "/users/me"),
+        ("overlap", "/users/:userId", "/users/me"),
+    ]
+    overlap = next(entry for entry in conflicts if entry["kind"] == "overlap")
+    assert overlap["routes"][overlap["general"]].path.startswith("/users/:")
+    assert normalized_pattern("/users/:id") == normalized_pattern("/users/:userId")
+
+
+def test_all_routes_conflict_across_methods():
+    conflicts = RouteIndex([route("ALL", "/health"), route("GET", "/health")]).conflicts()
+    assert [(entry["kind"], entry["method"]) for entry in conflicts] == [("duplicate", "ALL/GET")]
+
+
+def test_load_routes_reads_single_record_ndjson(tmp_path):
+    single = tmp_path / "one.ndjson"
+    single.write_text('{"method": "GET", "path": "/users/:id", "file": "users.js", "framework": "router"}\n')
+    routes = load_routes(str(single))
+    assert [(route.method, route.path, route.file) for route in routes] == [("GET", "/users/:id", "users.js")]
+    assert RouteIndex(routes).resolve("GET /users/1")["params"] == {"id": "1"}
+
+    empty = tmp_path / "empty.json"
+    empty.write_text('{"routes": []}')
+    assert load_routes(str(empty)) == []
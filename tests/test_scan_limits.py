@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+from scan.scanner import ScanLimits, scan_project
+
+SMALL = "app.get('/small', (req, res) => res.end());\n"
+# Enough routes that extraction cannot finish within a microsecond
+MANY = "".join(f"app.get('/many/{n}', (req, res) => res.json(req.query.q{n}));\n" for n in range(300))
+
+
+def write(root, relative_path, text):
+    path = os.path.join(root, *relative_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        handle.write(text)
+
+
+def cached_files(cache_path):
+    """Files in the saved cache; a scan that stored nothing writes no cache"""
+    if not os.path.exists(cache_path):
+        return []
+    with open(cache_path) as handle:
+        return sorted(json.load(handle)["files"])
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = str(tmp_path / "project")
+    write(root, "small.js", SMALL)
+    write(root, "many.js", MANY)
+    return root
+
+
+def test_files_over_max_bytes_are_skipped_and_not_cached(project, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    limits = ScanLimits(max_file_bytes=len(SMALL), file_timeout=None)
+    routes, stats = scan_project(project, cache_path=cache_path, limits=limits)
+
+    assert [route.path for route in routes] == ["/small"]
+    assert stats["skipped_files"] == [
+        {"file": "many.js", "reason": f"larger than {len(SMALL)} bytes ({len(MANY)} bytes)"}]
+    assert cached_files(cache_path) == ["small.js"]
+
+    # Skipped again on the next run rather than served from the cache
+    _, stats = scan_project(project, cache_path=cache_path, limits=limits)
+    assert stats["cache_hits"] == 1
+    assert [skipped["file"] for skipped in stats["skipped_files"]] == ["many.js"]
+
+
+def test_file_timeout_keeps_partial_routes_uncached(project, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    routes, stats = scan_project(project, cache_path=cache_path,
+                                 limits=ScanLimits(file_timeout=1e-6))
+
+    assert "many.js" in stats["timed_out_files"]
+    assert len([route for route in routes if route.file == "many.js"]) < 300
+    assert "many.js" not in cached_files(cache_path)
+
+    # With room to finish the file is parsed in full, then cached
+    routes, stats = scan_project(project, cache_path=cache_path, limits=ScanLimits())
+    assert stats["timed_out_files"] == []
+    assert len([route for route in routes if route.file == "many.js"]) == 300
+    assert cached_files(cache_path) == ["many.js", "small.js"]
+
+
+def test_time_budget_skips_unparsed_files_but_returns_cache_hits(project, tmp_path):
+    cache_path = str(tmp_path / "cache.json")
+    write(project, "many.js", "")
+    scan_project(project, cache_path=cache_path)
+    write(project, "late.js", "app.get('/late', (req, res) => res.end());\n")
+
+    routes, stats = scan_project(project, cache_path=cache_path,
+                                 limits=ScanLimits(time_budget=1e-6))
+
+    assert [route.path for route in routes] == ["/small"]
+    assert stats["cache_hits"] == 2
+    assert stats["skipped_files"] == [{"file": "late.js", "reason": "scan time budget exhausted"}]
+    assert "late.js" not in cached_files(cache_path)
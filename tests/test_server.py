@@ -0,0 +1,117 @@
+import io
+import json
+import os
+
+import pytest
+
+from scan.server import (INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR, ScannerServer)
+
+FILES = {
+    "app.js": "app.get('/health', (req, res) => res.send('ok'));\n",
+    "routes/users.js": "router.post('/users', (req, res) => res.json(req.body.name));\n",
+}
+
+
+def write(root, relative_path, text):
+    path = os.path.join(root, *relative_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        handle.write(text)
+
+
+def serve(server, *requests):
+    """Feed request lines through serve() and return the parsed responses"""
+    lines = [request if isinstance(request, str) else json.dumps(request) for request in requests]
+    stdout = io.StringIO()
+    server.serve(stdin=io.StringIO("\n".join(lines) + "\n"), stdout=stdout)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def paths(result):
+    return sorted(f"{route['method']} {route['path']}" for route in result["routes"])
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = str(tmp_path / "project")
+    for relative_path, text in FILES.items():
+        write(root, relative_path, text)
+    return root
+
+
+def test_scan_and_rescan_results(project):
+    server = ScannerServer(use_disk_cache=False)
+    scan, rescan = serve(server,
+                         {"jsonrpc": "2.0", "id": 1, "method": "scan",
+                          "params": {"project_path": project, "stats": True}},
+                         {"jsonrpc": "2.0", "id": "r", "method": "rescan", "params": {"stats": True}})
+
+    assert scan["jsonrpc"] == "2.0" and scan["id"] == 1 and "error" not in scan
+    assert paths(scan["result"]) == ["GET /health", "POST /users"]
+    assert scan["result"]["stats"]["scanned_files"] == 2
+    assert "middleware" not in scan["result"]
+
+    # rescan defaults to the last project and re-parses every file
+    assert rescan["id"] == "r"
+    assert paths(rescan["result"]) == paths(scan["result"])
+    assert rescan["result"]["stats"]["cache_hits"] == 0
+    assert rescan["result"]["stats"]["cache_misses"] == 2
+
+
+def test_scan_reuses_unchanged_files_between_calls(project):
+    def requests():
+        yield json.dumps({"id": 1, "method": "scan", "params": {"project_path": project, "stats": True}})
+        # Read by serve() only once the first response has been written
+        write(project, "routes/users.js", "router.put('/users/:id', (req, res) => res.end());\n")
+        yield json.dumps({"id": 2, "method": "scan", "params": {"stats": True}})
+        yield json.dumps({"id": 3, "method": "get_routes"})
+
+    stdout = io.StringIO()
+    ScannerServer(use_disk_cache=False).serve(stdin=requests(), stdout=stdout)
+    first, second, cached = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    assert first["result"]["stats"]["cache_misses"] == 2
+    assert second["result"]["stats"]["cache_hits"] == 1
+    assert second["result"]["stats"]["cache_misses"] == 1
+    assert paths(second["result"]) == ["GET /health", "PUT /users/:id"]
+    assert cached["result"] == {"routes": second["result"]["routes"]}
+
+
+def test_default_project_is_scanned_before_the_first_request(project):
+    first, = serve(ScannerServer(project, use_disk_cache=False),
+                   {"id": 1, "method": "scan", "params": {"stats": True}})
+    assert first["result"]["stats"]["cache_hits"] == 2
+    assert paths(first["result"]) == ["GET /health", "POST /users"]
+
+
+def test_errors(project):
+    server = ScannerServer(use_disk_cache=False)
+    unknown, malformed, missing, not_a_dir, ping = serve(
+        server,
+        {"jsonrpc": "2.0", "id": 1, "method": "frobnicate"},
+        '{"jsonrpc": "2.0", "id": 2, "method": ',
+        {"jsonrpc": "2.0", "id": 3, "method": "scan"},
+        {"jsonrpc": "2.0", "id": 4, "method": "scan",
+         "params": {"project_path": os.path.join(project, "app.js")}},
+        {"jsonrpc": "2.0", "id": 5, "method": "ping"})
+
+    assert unknown == {"jsonrpc": "2.0", "id": 1,
+                       "error": {"code": METHOD_NOT_FOUND, "message": "Unknown method: frobnicate"}}
+    # The id of an unparsable request is unknown
+    assert malformed["id"] is None and malformed["error"]["code"] == PARSE_ERROR
+    assert missing["id"] == 3 and missing["error"] == {"code": INVALID_PARAMS,
+                                                       "message": "project_path is required"}
+    assert not_a_dir["error"]["code"] == INVALID_PARAMS
+    # Errors do not stop the loop
+    assert ping == {"jsonrpc": "2.0", "id": 5, "result": "pong"}
+
+
+def test_notifications_and_shutdown(project):
+    server = ScannerServer(use_disk_cache=False)
+    responses = serve(server,
+                      {"jsonrpc": "2.0", "method": "scan", "params": {"project_path": project}},
+                      {"jsonrpc": "2.0", "id": 1, "method": "shutdown"},
+                      {"jsonrpc": "2.0", "id": 2, "method": "ping"})
+
+    assert responses == [{"jsonrpc": "2.0", "id": 1, "result": True}]
+    assert not server.running
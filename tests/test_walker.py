@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from scan.walker import PathMatcher, ProjectWalker, WalkOptions, compile_rule
+
+
+def matcher(*patterns):
+    return PathMatcher(rule for rule in (compile_rule(pattern) for pattern in patterns) if rule)
+
+
+def write(root, relative_path, text="app.get('/x', (req, res) => res.end())\n"):
+    path = os.path.join(root, *relative_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        handle.write(text)
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = str(tmp_path)
+    for relative_path in ("index.js", "src/app.js", "src/routes/users.js", "src/routes/users.test.js",
+                          "lib/helpers.js", "node_modules/pkg/index.js", "src/notes.txt"):
+        write(root, relative_path)
+    return root
+
+
+def walked(root, **options):
+    return sorted(relative.replace(os.sep, "/") for _, relative in ProjectWalker(root, WalkOptions(**options)).walk())
+
+
+def test_unanchored_rule_matches_at_any_depth():
+    rules = matcher("*.test.js")
+    assert rules.matches("users.test.js", False)
+    assert rules.matches("src/routes/users.test.js", False)
+    assert not rules.matches("src/routes/users.js", False)
+
+
+def test_anchored_and_dir_only_rules():
+    rules = matcher("/build", "logs/")
+    assert rules.matches("build", True)
+    assert not rules.matches("src/build", True)
+    assert rules.matches("src/logs", True)
+    assert not rules.matches("src/logs", False)
+
+
+def test_negation_is_last_match_wins():
+    rules = matcher("*.js", "!keep.js")
+    assert rules.matches("drop.js", False)
+    assert not rules.matches("src/keep.js", False)
+    assert matcher("!keep.js", "*.js").matches("keep.js", False)
+
+
+def test_walk_skips_ignored_dirs_and_other_extensions(project):
+    assert walked(project) == ["index.js", "lib/helpers.js", "src/app.js",
+                               "src/routes/users.js", "src/routes/users.test.js"]
+
+
+def test_excludes(project):
+    assert walked(project, excludes=["*.test.js", "lib/"]) == ["index.js", "src/app.js", "src/routes/users.js"]
+
+
+@pytest.mark.parametrize("include", ["src", "src/", "/src", "src/**", "routes/"])
+def test_include_directory_selects_files_below_it(project, include):
+    expected = ["src/routes/users.js", "src/routes/users.test.js"]
+    if include != "routes/":
+        expected.insert(0, "src/app.js")
+    assert walked(project, includes=[include]) == expected
+
+
+def test_include_file_glob(project):
+    assert walked(project, includes=["users*.js"]) == ["src/routes/users.js", "src/routes/users.test.js"]
+
+
+def test_exclude_wins_over_include(project):
+    assert walked(project, includes=["src/"], excludes=["*.test.js"]) == ["src/app.js", "src/routes/users.js"]
+
+
+def test_accepts_matches_walk(project):
+    walker = ProjectWalker(project, WalkOptions(includes=["src/"], excludes=["*.test.js"]))
+    assert walker.accepts("src/routes/users.js")
+    assert not walker.accepts("src/routes/users.test.js")
+    assert not walker.accepts("lib/helpers.js")
+    assert not walker.accepts("node_modules/pkg/index.js")
+    assert not walker.accepts("src/notes.txt")
+
+
+def test_gitignore_is_honoured(project):
+    write(project, ".gitignore", "lib/\n")
+    write(project, "src/.gitignore", "*.test.js\n")
+    assert walked(project) == ["index.js", "src/app.js", "src/routes/users.js"]
+    assert "lib/helpers.js" in walked(project, use_gitignore=False)